@@ -0,0 +1,196 @@
+# Anel (ring buffer) em memória compartilhada, um produtor e um consumidor
+#
+# Transporte entre dois processos da mesma máquina sem passar pelo kernel:
+# o produtor copia cada registro direto na memória compartilhada
+# (multiprocessing.shared_memory) e o consumidor lê o registro no próprio
+# lugar, por uma memoryview. Não há trava: o produtor é o único que escreve o
+# índice de escrita e o consumidor o único que escreve o índice de leitura.
+# O registro é escrito antes de o índice de escrita avançar, então o
+# consumidor nunca vê um registro pela metade.
+#
+# Ordem de memória: as escritas são stores comuns do numpy, sem barreira.
+# Isso só é seguro em x86/x86-64, onde a ordem total das escritas (TSO)
+# garante que o registro fique visível para o outro processo antes do índice
+# que o publica (e o consumidor não lê o registro antes do índice). Em
+# arquiteturas de ordem fraca (ARM, POWER) seria preciso uma barreira entre
+# as duas escritas, que o Python não oferece; lá o anel se recusa a abrir
+# (ver _ARQUITETURAS_TSO).
+#
+# Só o dono (quem cria) responde pela memória: quem se conecta não fica
+# registrado no resource_tracker, senão o rastreador dele apagaria a
+# memória quando ele saísse.
+#
+# Layout: três contadores uint64 (escrita, leitura, capacidade), cada um em
+# uma linha de cache própria, seguidos da área de dados. Os índices só
+# crescem; a posição no anel é índice % capacidade. Cada registro é
+# 'tamanho (uint32) | dados', alinhado em 8 bytes e nunca quebrado na volta
+# do anel: se não cabe até o fim, o produtor marca PULO e recomeça do início.
+
+import os
+import platform
+import struct
+import sys
+import time
+from multiprocessing import resource_tracker, shared_memory
+
+import numpy as np
+
+CAPACIDADE_PADRAO = 4 * 1024 * 1024
+
+_LINHA_CACHE = 64
+_ESCRITA, _LEITURA, _CAPACIDADE = 0, _LINHA_CACHE // 8, 2 * _LINHA_CACHE // 8   # índices no array uint64
+_TAMANHO_CONTROLE = 3 * _LINHA_CACHE
+_PREFIXO = struct.Struct('<I')
+_PULO = 0xFFFFFFFF
+_ESPERAS_ATIVAS = 200   # tentativas com sleep(0) antes de dormir de verdade
+
+# platform.machine() das arquiteturas com ordem total das escritas (x86/x86-64)
+_ARQUITETURAS_TSO = {'x86_64', 'amd64', 'i386', 'i486', 'i586', 'i686', 'x86'}
+
+
+def _conecta(nome):
+    """
+    Conecta a uma memória compartilhada existente sem registrá-la no
+    resource_tracker deste processo (quem apaga é o dono).
+    """
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name=nome, track=False)
+    memoria = shared_memory.SharedMemory(name=nome)   # antes do 3.13 sempre registra
+    if os.name == 'posix':   # só o POSIX usa o rastreador para memória compartilhada
+        resource_tracker.unregister('/' + memoria.name, "shared_memory")
+    return memoria
+
+
+def _alinha(n):
+    return (n + 7) & ~7
+
+
+def _espera(tentativa, inicio, timeout):
+    """
+    Espera curta entre tentativas. Levanta TimeoutError depois de 'timeout' segundos.
+    """
+    if timeout is not None and time.monotonic() - inicio > timeout:
+        raise TimeoutError(f"Nada mudou no anel em {timeout} s.")
+    time.sleep(0 if tentativa < _ESPERAS_ATIVAS else 0.0005)
+
+
+class AnelCompartilhado:
+    def __init__(self, nome=None, capacidade=CAPACIDADE_PADRAO, criar=True):
+        """
+        criar=True cria a memória (o dono, normalmente o receptor); criar=False
+        se conecta a um anel existente pelo 'nome'. Fora de x86/x86-64 levanta
+        RuntimeError (ver a ordem de memória no começo do módulo).
+        """
+        if platform.machine().lower() not in _ARQUITETURAS_TSO:
+            raise RuntimeError(f"O anel sem travas depende da ordem de escrita do x86 e não é seguro "
+                               f"nesta arquitetura ({platform.machine()}); use o transporte TCP.")
+        if criar:
+            capacidade = _alinha(capacidade)
+            self._memoria = shared_memory.SharedMemory(name=nome, create=True,
+                                                       size=_TAMANHO_CONTROLE + capacidade)
+        else:
+            self._memoria = _conecta(nome)
+        self._dono = criar
+
+        self._indices = np.ndarray(_TAMANHO_CONTROLE // 8, dtype=np.uint64, buffer=self._memoria.buf)
+        if criar:
+            self._indices[:] = 0
+            self._indices[_CAPACIDADE] = capacidade
+        self.capacidade = int(self._indices[_CAPACIDADE])
+        self._dados = self._memoria.buf[_TAMANHO_CONTROLE:_TAMANHO_CONTROLE + self.capacidade]
+        self._fim_pendente = None   # fim do registro entregue por le() e ainda não liberado
+
+    @property
+    def nome(self):
+        return self._memoria.name
+
+    def fechar(self):
+        """
+        Desconecta do anel; o dono também apaga a memória compartilhada.
+        """
+        self._dados.release()
+        del self._indices
+        self._memoria.close()
+        if self._dono:
+            if sys.version_info < (3, 13) and os.name == 'posix':
+                # um processo filho conectado divide o rastreador do dono e, ao
+                # se conectar, desfez o registro: registra de novo (é um
+                # conjunto) para o unlink desfazê-lo sem erro no rastreador
+                resource_tracker.register('/' + self._memoria.name, "shared_memory")
+            self._memoria.unlink()
+
+    # ----------------------------------------------------------
+    # Produtor
+    # ----------------------------------------------------------
+
+    def escreve(self, partes, timeout=None):
+        """
+        Copia as partes (buffers) como um único registro. Espera enquanto o anel
+        está cheio (TimeoutError depois de 'timeout' segundos).
+        """
+        partes = [memoryview(p).cast('B') for p in partes]
+        tamanho = sum(len(p) for p in partes)
+        ocupado = _alinha(_PREFIXO.size + tamanho)
+        if ocupado > self.capacidade:
+            raise ValueError(f"Registro de {tamanho} bytes não cabe no anel de {self.capacidade} bytes.")
+
+        escrita = int(self._indices[_ESCRITA])
+        posicao = escrita % self.capacidade
+        ate_o_fim = self.capacidade - posicao
+        necessario = ocupado if ocupado <= ate_o_fim else ate_o_fim + ocupado
+
+        inicio, tentativa = time.monotonic(), 0
+        while self.capacidade - (escrita - int(self._indices[_LEITURA])) < necessario:
+            _espera(tentativa, inicio, timeout)
+            tentativa += 1
+
+        if ocupado > ate_o_fim:
+            # não cabe até o fim: marca o pulo e escreve no começo do anel
+            _PREFIXO.pack_into(self._dados, posicao, _PULO)
+            escrita += ate_o_fim
+            posicao = 0
+
+        _PREFIXO.pack_into(self._dados, posicao, tamanho)
+        destino = posicao + _PREFIXO.size
+        for parte in partes:
+            self._dados[destino:destino + len(parte)] = parte
+            destino += len(parte)
+
+        # publica o registro só depois de escrito
+        self._indices[_ESCRITA] = escrita + ocupado
+
+    # ----------------------------------------------------------
+    # Consumidor
+    # ----------------------------------------------------------
+
+    def le(self, timeout=None) -> memoryview:
+        """
+        Próximo registro, como uma view da memória compartilhada (sem cópia).
+        A view vale até libera(); espera enquanto o anel está vazio
+        (TimeoutError depois de 'timeout' segundos).
+        """
+        if self._fim_pendente is not None:
+            raise RuntimeError("Libere o registro anterior antes de ler o próximo.")
+        leitura = int(self._indices[_LEITURA])
+        inicio, tentativa = time.monotonic(), 0
+        while True:
+            if int(self._indices[_ESCRITA]) == leitura:
+                _espera(tentativa, inicio, timeout)
+                tentativa += 1
+                continue
+            posicao = leitura % self.capacidade
+            tamanho, = _PREFIXO.unpack_from(self._dados, posicao)
+            if tamanho == _PULO:
+                leitura += self.capacidade - posicao
+                self._indices[_LEITURA] = leitura
+                continue
+            self._fim_pendente = leitura + _alinha(_PREFIXO.size + tamanho)
+            return self._dados[posicao + _PREFIXO.size:posicao + _PREFIXO.size + tamanho]
+
+    def libera(self):
+        """
+        Devolve ao produtor o espaço do registro entregue por le().
+        """
+        if self._fim_pendente is not None:
+            self._indices[_LEITURA] = self._fim_pendente
+            self._fim_pendente = None
@@ -1,26 +1,95 @@
+import struct
+
+import numpy as np
 from bitarray import bitarray
+from bitarray.util import ba2int, int2ba, zeros
 
 # Constantes importantes usadas pelos métodos de enquadramento
 # FLAG é usada para marcar início/fim de quadro
 FLAG_SEQUENCE = [0,1,1,1,1,1,1,0]  # 0x7E
 # ESC é usada no byte stuffing para indicar que o próximo byte faz parte dos dados
 ESCAPE_CHAR   = [0,0,0,1,1,0,1,1]  # 0x1B
+# os mesmos dois bytes, para o byte stuffing feito direto sobre bytes
+FLAG_BYTE   = b'\x7e'
+ESCAPE_BYTE = b'\x1b'
 
 # Polinômio gerador do CRC-32 (na forma binária)
 CRC32_POLY = [1,0,0,0,0,0,1,0,0,1,1,0,0,0,0,0,1,0,0,0,1,1,1,0,1,1,0,1,1,0,1,1,1]
 CRC32_DEGREE = 32
 
+# Checksum de 16 bits (complemento de um, como o da Internet / RFC 1071)
+CHECKSUM_BITS = 16
+
+# Representação dos bits
+#
+# Internamente as camadas trabalham com bitarray (bits empacotados, 1 bit por
+# bit em vez de um objeto int por bit). As funções aceitam listas de bits,
+# arrays numpy ou bitarrays e devolvem o mesmo tipo que receberam: bitarray
+# entra, bitarray sai; listas (e arrays numpy) continuam recebendo listas.
+
+_FLAG_BITS = bitarray(FLAG_SEQUENCE)
+
+
+def para_bitarray(bits) -> bitarray:
+    """
+    Converte a entrada (lista de bits, array numpy ou bitarray) em bitarray.
+    Um bitarray é devolvido como está, sem cópia.
+    """
+    if isinstance(bits, bitarray):
+        return bits
+    if isinstance(bits, np.ndarray):   # ex.: saída dos demoduladores
+        if bits.dtype.kind not in 'biu':
+            bits = bits != 0
+        arr = bitarray()
+        arr.frombytes(np.packbits(bits).tobytes())
+        del arr[len(bits):]
+        return arr
+    return bitarray(bits)
+
+
+def bits_para_uint8(bits) -> np.ndarray:
+    """
+    Um byte (0/1) por bit, para as operações vetorizadas com numpy.
+    """
+    bits = para_bitarray(bits)
+    return np.unpackbits(np.frombuffer(bits, dtype=np.uint8), count=len(bits))
+
+
+def corridas_de_uns(b: np.ndarray):
+    """
+    Separa os bits em corridas de '1's delimitadas pelos zeros.
+    Devolve as posições dos zeros e o comprimento de cada corrida:
+    comprimentos[j] é a corrida que termina logo antes de zeros[j],
+    e o último é a corrida depois do último zero.
+    """
+    zeros = np.flatnonzero(b == 0)
+    fronteiras = np.concatenate(([-1], zeros, [len(b)]))
+    return zeros, np.diff(fronteiras) - 1
+
+
+def mesmo_tipo(resultado: bitarray, entrada):
+    """
+    Devolve o resultado no tipo da entrada (lista para quem não usa bitarray).
+    """
+    return resultado if isinstance(entrada, bitarray) else resultado.tolist()
+
 # Auxiliar: converte texto para sequência de bits
 
-def convert_to_bytes(text: str) -> list[int]:
+def convert_to_bitarray(text: str) -> bitarray:
     """
-    Converte a string de entrada em uma lista de bits.
-    A biblioteca bitarray facilita a conversão para bytes
-    e depois para bits individuais.
+    Converte a string de entrada em um bitarray (bytes UTF-8, MSB primeiro).
     """
     arr = bitarray()
     arr.frombytes(text.encode('utf-8','surrogatepass'))
-    return [int(b) for b in arr]
+    return arr
+
+
+def convert_to_bytes(text: str) -> list[int]:
+    """
+    Converte a string de entrada em uma lista de bits.
+    Mantida para quem usa listas; o caminho principal é convert_to_bitarray.
+    """
+    return convert_to_bitarray(text).tolist()
 
 # ENQUADRAMENTO (TX)   
 
@@ -29,9 +98,28 @@ def character_count(bit_stream: list[int], header_bits=8) -> list[int]:
     Implementa a técnica de contagem de caracteres.
     Insere no início um cabeçalho informando o tamanho do payload em bits.
     """
-    length = len(bit_stream)
-    header = bin(length)[2:].zfill(header_bits)
-    return [int(b) for b in header] + bit_stream
+    bits = para_bitarray(bit_stream)
+    length = len(bits)
+    # como bin().zfill(): o cabeçalho cresce se o tamanho não couber em header_bits
+    header = int2ba(length, length=max(header_bits, length.bit_length(), 1))
+    return mesmo_tipo(header + bits, bit_stream)
+
+
+def escapa_bytes(dados) -> bytes:
+    """
+    Byte stuffing sobre bytes (bytes, bytearray ou memoryview):
+    cada ESC vira ESC ESC e cada FLAG vira ESC FLAG.
+    O ESC é trocado primeiro para que os ESCs inseridos não sejam escapados de novo.
+    """
+    return bytes(dados).replace(ESCAPE_BYTE, ESCAPE_BYTE + ESCAPE_BYTE) \
+                       .replace(FLAG_BYTE, ESCAPE_BYTE + FLAG_BYTE)
+
+
+def enquadra_bytes(dados) -> bytes:
+    """
+    Quadro completo com FLAG + byte stuffing, já em bytes.
+    """
+    return FLAG_BYTE + escapa_bytes(dados) + FLAG_BYTE
 
 
 def byte_insertion(bit_stream: list[int]) -> list[int]:
@@ -40,23 +128,12 @@ def byte_insertion(bit_stream: list[int]) -> list[int]:
     Sempre que um byte igual à FLAG ou ao ESC aparece,
     insere-se primeiro o byte ESC seguido do próprio byte.
     Isso evita que o receptor confunda com marcas de início/fim.
+    Os bits só são convertidos para bytes na entrada e de volta na saída;
+    um último byte incompleto é completado com zeros.
     """
-    stuffed = []
-    for i in range(0, len(bit_stream), 8):
-        byte = bit_stream[i:i+8]
-
-        # completa o byte caso o último tenha menos de 8 bits
-        if len(byte) < 8:
-            byte += [0] * (8 - len(byte))
-
-        # se for FLAG ou ESC, aplica stuffing
-        if byte == FLAG_SEQUENCE or byte == ESCAPE_CHAR:
-            stuffed += ESCAPE_CHAR + byte
-        else:
-            stuffed += byte
-
-    # adiciona FLAG no início e no fim do quadro
-    return FLAG_SEQUENCE + stuffed + FLAG_SEQUENCE
+    quadro = bitarray()
+    quadro.frombytes(enquadra_bytes(para_bitarray(bit_stream).tobytes()))
+    return mesmo_tipo(quadro, bit_stream)
 
 
 def bit_insertion(bit_stream: list[int]) -> list[int]:
@@ -64,23 +141,22 @@ def bit_insertion(bit_stream: list[int]) -> list[int]:
     Enquadramento com FLAG + bit stuffing.
     Sempre que aparecem 5 bits '1' seguidos, insere-se um '0'
     para evitar que o padrão FLAG apareça dentro dos dados.
+    A contagem recomeça depois de cada zero inserido, então numa corrida
+    de uns o zero entra depois do 5º, 10º, 15º... '1'. As posições saem
+    de uma varredura das corridas de uns e os zeros entram todos de uma vez.
     """
-    stuffed = []
-    ones = 0
+    b = bits_para_uint8(bit_stream)
+    zeros, comprimentos = corridas_de_uns(b)
+    inicios = np.concatenate(([0], zeros + 1))
 
-    for bit in bit_stream:
-        stuffed.append(bit)
+    # a corrida que começa em 'inicio' recebe um zero antes de inicio+5, inicio+10, ...
+    quantidades = comprimentos // 5
+    primeira = np.cumsum(quantidades) - quantidades
+    m = np.arange(quantidades.sum()) - np.repeat(primeira, quantidades) + 1
+    posicoes = np.repeat(inicios, quantidades) + 5 * m
+    stuffed = para_bitarray(np.insert(b, posicoes, 0))
 
-        if bit == 1:
-            ones += 1
-            # se atingiu 5 '1's, insere um zero extra
-            if ones == 5:
-                stuffed.append(0)
-                ones = 0
-        else:
-            ones = 0
-
-    return FLAG_SEQUENCE + stuffed + FLAG_SEQUENCE
+    return mesmo_tipo(_FLAG_BITS + stuffed + _FLAG_BITS, bit_stream)
 
 # DETECÇÃO / CORREÇÃO (TX)
 
@@ -89,104 +165,337 @@ def bit_parity(bit_stream: list[int]) -> list[int]:
     Bit de paridade par: adiciona 1 bit no final
     que indica se o total de '1's é par ou ímpar.
     """
-    parity = sum(bit_stream) % 2
-    return bit_stream + [parity]
+    bits = para_bitarray(bit_stream)
+    parity = bits.count(1) % 2
+    return mesmo_tipo(bits + bitarray([parity]), bit_stream)
 
 
 # CRC-32
 
+# O CRC é calculado por tabelas (byte a byte, e 8 bytes por vez com
+# "slicing-by-8"), o que dá o mesmo resultado da divisão bit a bit com
+# CRC32_POLY (MSB primeiro, registrador iniciado em zero, sem XOR final).
+
+_CRC32_MASCARA = (1 << CRC32_DEGREE) - 1
+_CRC32_POLY_INT = int("".join(map(str, CRC32_POLY[1:])), 2)  # 0x04C11DB7
+
+
+def _gera_tabelas_crc32(quantidade=8):
+    """
+    tabelas[0][b]: resto de b * x^32 (tabela clássica, um byte por vez).
+    tabelas[k][b]: o mesmo byte seguido de k bytes zero, usado no slicing-by-8.
+    """
+    tabela = []
+    for byte in range(256):
+        crc = byte << 24
+        for _ in range(8):
+            if crc & 0x80000000:
+                crc = ((crc << 1) ^ _CRC32_POLY_INT) & _CRC32_MASCARA
+            else:
+                crc = (crc << 1) & _CRC32_MASCARA
+        tabela.append(crc)
+
+    tabelas = [tabela]
+    for _ in range(1, quantidade):
+        anterior = tabelas[-1]
+        tabelas.append([((c << 8) & _CRC32_MASCARA) ^ tabela[c >> 24] for c in anterior])
+    return tabelas
+
+_TABELAS_CRC32 = _gera_tabelas_crc32()
+_ESTRUTURA_8_BYTES = struct.Struct('>II')
+
+
+def crc32_bytes(dados, crc: int = 0) -> int:
+    """
+    Atualiza o registrador do CRC-32 com uma sequência de bytes
+    (bytes, bytearray ou memoryview). Devolve o novo registrador,
+    que para crc=0 vale dados * x^32 mod CRC32_POLY.
+    """
+    t0, t1, t2, t3, t4, t5, t6, t7 = _TABELAS_CRC32
+    dados = memoryview(dados).cast('B')
+    fim_blocos = len(dados) - len(dados) % 8
+
+    # slicing-by-8: 8 bytes por iteração
+    for a, b in _ESTRUTURA_8_BYTES.iter_unpack(dados[:fim_blocos]):
+        a ^= crc
+        crc = (t7[a >> 24] ^ t6[(a >> 16) & 0xFF] ^ t5[(a >> 8) & 0xFF] ^ t4[a & 0xFF]
+               ^ t3[b >> 24] ^ t2[(b >> 16) & 0xFF] ^ t1[(b >> 8) & 0xFF] ^ t0[b & 0xFF])
+
+    # bytes que sobraram: um por vez
+    for byte in dados[fim_blocos:]:
+        crc = ((crc << 8) & _CRC32_MASCARA) ^ t0[(crc >> 24) ^ byte]
+    return crc
+
+
 def calculate_crc_remainder(data_with_padding: list[int]) -> list[int]:
     """
     Aplica a divisão binária (XOR) do CRC.
     O polinômio é percorrido sobre os bits, e no final
     os últimos 32 bits são o resto (checksum).
+    Equivale a (todos os bits) mod CRC32_POLY: os bits anteriores aos
+    últimos 32 passam pelas tabelas e o resultado é somado (XOR) aos 32 finais.
     """
-    temp = data_with_padding.copy()
+    bits = para_bitarray(data_with_padding)
+    if len(bits) <= CRC32_DEGREE:
+        return mesmo_tipo(bits.copy(), data_with_padding)
 
-    for i in range(len(temp) - CRC32_DEGREE):
-        if temp[i] == 1:
-            for j in range(len(CRC32_POLY)):
-                temp[i+j] ^= CRC32_POLY[j]
+    inicio = bits[:-CRC32_DEGREE]
+    # zeros à esquerda não mudam o polinômio e alinham o início em bytes
+    alinhado = zeros((-len(inicio)) % 8) + inicio
+    resto = crc32_bytes(alinhado.tobytes()) ^ ba2int(bits[-CRC32_DEGREE:])
+    return mesmo_tipo(int2ba(resto, length=CRC32_DEGREE), data_with_padding)
 
-    return temp[-CRC32_DEGREE:]
+
+class CRC32:
+    """
+    CRC-32 incremental (mesmo polinômio e convenção de calculate_crc_remainder).
+    Os dados podem chegar em pedaços com update(): listas de bits, bitarrays,
+    bytes, bytearrays ou memoryviews, em qualquer combinação e tamanho.
+
+    TX: crc.update(...) enquanto os bits seguem para o modulador; no fim,
+        crc.digest_bits() são os 32 bits a transmitir depois dos dados.
+    RX: crc.update(...) com o quadro inteiro (dados + CRC) à medida que chega;
+        crc.verify() diz se o quadro está íntegro.
+    """
+
+    def __init__(self, dados=None):
+        self.registrador = 0
+        self.pendentes = bitarray()   # bits que ainda não completaram um byte
+        if dados is not None:
+            self.update(dados)
+
+    def update(self, dados):
+        if isinstance(dados, (bytes, bytearray, memoryview)):
+            if not self.pendentes:
+                self.registrador = crc32_bytes(dados, self.registrador)
+                return self
+            bits = bitarray()
+            bits.frombytes(bytes(dados))
+        else:
+            bits = para_bitarray(dados)
+
+        if self.pendentes:
+            bits = self.pendentes + bits
+        inteiro = len(bits) - len(bits) % 8
+        self.registrador = crc32_bytes(bits[:inteiro].tobytes(), self.registrador)
+        self.pendentes = bits[inteiro:]
+        return self
+
+    def _registrador_final(self):
+        # processa os bits que não formaram um byte completo, um a um
+        crc = self.registrador
+        for bit in self.pendentes:
+            topo = (crc >> (CRC32_DEGREE - 1)) ^ bit
+            crc = (crc << 1) & _CRC32_MASCARA
+            if topo:
+                crc ^= _CRC32_POLY_INT
+        return crc
+
+    def digest(self) -> bytes:
+        """
+        CRC dos dados recebidos até agora, em 4 bytes (big-endian).
+        Não encerra o cálculo: update() ainda pode ser chamado depois.
+        """
+        return self._registrador_final().to_bytes(CRC32_DEGREE // 8, 'big')
+
+    def digest_bitarray(self) -> bitarray:
+        return int2ba(self._registrador_final(), length=CRC32_DEGREE)
+
+    def digest_bits(self) -> list[int]:
+        return self.digest_bitarray().tolist()
+
+    def verify(self) -> bool:
+        """
+        True se os dados (quadro + CRC anexado) deixam resto zero.
+        """
+        return self._registrador_final() == 0
 
 
 def prepara_CRC_para_transmissao(bits: list[int]) -> list[int]:
     """
-    Para calcular o CRC corretamente, adiciona-se 32 zeros ao final.
-    Depois, o resto da divisão é colocado no lugar dos zeros.
+    O CRC é o resto de (bits seguidos de 32 zeros) pelo polinômio.
+    O cálculo incremental já considera esses 32 zeros, sem montar a cópia com padding.
     """
-    padded = bits + [0] * CRC32_DEGREE
-    rem = calculate_crc_remainder(padded)
-    return bits + rem
+    dados = para_bitarray(bits)
+    return mesmo_tipo(dados + CRC32(dados).digest_bitarray(), bits)
+
+
+# CHECKSUM
+
+def checksum_bytes(dados) -> int:
+    """
+    Checksum de 16 bits sobre bytes (bytes, bytearray ou memoryview):
+    soma em complemento de um das palavras de 16 bits big-endian (um byte
+    zero completa a última palavra), devolvida complementada.
+    As palavras são somadas de uma vez em 64 bits e os "vai-uns" acima de
+    16 bits são dobrados de volta no final.
+    """
+    dados = memoryview(dados).cast('B')
+    palavras = np.frombuffer(dados[:len(dados) - len(dados) % 2], dtype='>u2')
+    soma = int(palavras.sum(dtype=np.uint64))
+    if len(dados) % 2:
+        soma += dados[-1] << 8
+    while soma >> 16:
+        soma = (soma & 0xFFFF) + (soma >> 16)
+    return ~soma & 0xFFFF
+
+
+def calcula_checksum(bits: list[int]) -> list[int]:
+    """
+    Checksum dos bits (o último byte incompleto é completado com zeros),
+    devolvido como 16 bits no tipo da entrada.
+    """
+    valor = checksum_bytes(para_bitarray(bits).tobytes())
+    return mesmo_tipo(int2ba(valor, length=CHECKSUM_BITS), bits)
+
+
+def prepara_checksum_para_transmissao(bits: list[int]) -> list[int]:
+    """
+    Anexa ao final dos bits o checksum de 16 bits.
+    Detecta menos erros que o CRC-32, mas custa bem menos por bit.
+    """
+    dados = para_bitarray(bits)
+    return mesmo_tipo(dados + calcula_checksum(dados), bits)
 
 
 
 
 # HAMMING DINÂMICO
 
+# Códigos suportados, do maior para o menor: (tamanho_bloco, bits_dados, bits_paridade)
+HAMMING_CONFIGS = [
+    (63, 57, 6),  # Hamming(63,57) - 6 bits de paridade
+    (31, 26, 5),  # Hamming(31,26) - 5 bits de paridade
+    (15, 11, 4),  # Hamming(15,11) - 4 bits de paridade
+    (7, 4, 3),    # Hamming(7,4) - 3 bits de paridade
+]
+
+
+def _gera_codigo_hamming(n, k, p):
+    """
+    Pré-calcula o layout de um código Hamming(n, k) com posições indexadas a partir de 1:
+    paridades nas posições 1, 2, 4, ..., dados nas demais, em ordem crescente.
+      G: matriz geradora (k x n), bloco = dados @ G mod 2
+      H: matriz de verificação (p x n), coluna da posição pos = bits de pos
+      posicoes_dados: índices (base 0) dos bits de dados dentro do bloco
+      tabela_erro: padrão de erro (n bits) a somar para cada síndrome 0..n
+    """
+    posicoes = np.arange(1, n + 1)
+    H = ((posicoes[np.newaxis, :] >> np.arange(p)[:, np.newaxis]) & 1).astype(np.uint8)
+    posicoes_dados = np.flatnonzero(posicoes & (posicoes - 1))   # não é potência de 2
+
+    # cada dado vai para a sua posição e para as paridades que cobrem essa posição
+    G = np.zeros((k, n), dtype=np.uint8)
+    G[np.arange(k), posicoes_dados] = 1
+    G[:, (1 << np.arange(p)) - 1] = H[:, posicoes_dados].T
+
+    # síndrome s != 0 aponta o bit errado na posição s
+    tabela_erro = np.zeros((n + 1, n), dtype=np.uint8)
+    tabela_erro[posicoes, posicoes - 1] = 1
+
+    for matriz in (H, posicoes_dados, G, tabela_erro):
+        matriz.flags.writeable = False
+    return G, H, posicoes_dados, tabela_erro
+
+_CODIGOS_HAMMING = {n: _gera_codigo_hamming(n, k, p) for n, k, p in HAMMING_CONFIGS}
+_PESOS_SINDROME = {n: (1 << np.arange(p)) for n, _, p in HAMMING_CONFIGS}
+
+
+def _produto_mod2(A, B):
+    # produto de matrizes em GF(2); float32 usa BLAS e é exato para somas < 2^24
+    return (A.astype(np.float32) @ B.astype(np.float32)).astype(np.uint8) & 1
+
+
+def _agenda_codificacao(L):
+    """
+    Divide L bits de dados em corridas de blocos do mesmo código, escolhendo
+    sempre o maior k que cabe no que resta (mesma escolha do laço bloco a bloco).
+    Se sobrarem menos de 4 bits, eles vão em um Hamming(7,4) completado com zeros.
+    Devolve [(n, quantidade de blocos)].
+    """
+    agenda = []
+    for n, k, _ in HAMMING_CONFIGS:
+        quantidade, L = divmod(L, k)
+        if quantidade:
+            agenda.append((n, quantidade))
+    if L:
+        agenda.append((7, 1))
+    return agenda
+
+
+def _tamanho_codificado(agenda):
+    return sum(n * quantidade for n, quantidade in agenda)
+
+# Depois dos blocos de 63, o que sobra (menos de 57 bits de dados) vira uma
+# "cauda" de blocos menores. Tamanho codificado da cauda -> agenda da cauda.
+_CAUDAS_HAMMING = {_tamanho_codificado(_agenda_codificacao(r)): _agenda_codificacao(r)
+                   for r in range(57)}
+
+
+def _agenda_decodificacao(N):
+    """
+    Agenda de blocos de um quadro recebido com N bits: a mesma que o codificador
+    usou (N = 63 * q + cauda). Os tamanhos das caudas são distintos módulo 63,
+    então a escolha é única, mas vários diferem de só 1 bit (21/22, 29/30/31,
+    60/61/62...): N precisa ser o tamanho exato gerado por hamming_dinamico,
+    sem o padding dos demoduladores. Levanta ValueError se não for.
+    """
+    for cauda, agenda_cauda in _CAUDAS_HAMMING.items():
+        if cauda <= N and (N - cauda) % 63 == 0:
+            blocos_63 = (N - cauda) // 63
+            return ([(63, blocos_63)] if blocos_63 else []) + agenda_cauda
+    raise ValueError(f"{N} bits não é um tamanho gerado por hamming_dinamico "
+                     f"(corte o padding do demodulador antes de decodificar).")
+
+
 def hamming_dinamico(bit_stream: list[int]) -> list[int]:
     """
     Implementação de Hamming com blocos de tamanho fixo.
     Usa blocos de tamanho padrão: Hamming(7,4), (15,11), (31,26), (63,57)
     Formato: (n, k) onde n = tamanho total, k = bits de dados
+    Blocos consecutivos do mesmo código são codificados juntos (dados @ G mod 2).
+    """
+    dados = bits_para_uint8(bit_stream)
+    agenda = _agenda_codificacao(len(dados))
+
+    # completa com zeros o último Hamming(7,4), se ele não estiver cheio
+    faltam = sum(_CODIGOS_HAMMING[n][0].shape[0] * q for n, q in agenda) - len(dados)
+    if faltam:
+        dados = np.concatenate([dados, np.zeros(faltam, dtype=np.uint8)])
+
+    blocos = []
+    inicio = 0
+    for n, quantidade in agenda:
+        G = _CODIGOS_HAMMING[n][0]
+        k = G.shape[0]
+        corrida = dados[inicio : inicio + quantidade * k].reshape(quantidade, k)
+        blocos.append(_produto_mod2(corrida, G).ravel())
+        inicio += quantidade * k
+
+    encoded = para_bitarray(np.concatenate(blocos)) if blocos else bitarray()
+    return mesmo_tipo(encoded, bit_stream)
+
+
+def corrige_hamming(bit_stream: list[int]) -> list[int]:
+    """
+    Decodifica e corrige blocos Hamming gerados por hamming_dinamico.
+    A síndrome (bloco @ Hᵀ) de cada bloco indexa a tabela de erros, e os bits
+    de dados são lidos das posições pré-calculadas.
+    Os blocos são separados com a mesma agenda do codificador (ver
+    _agenda_decodificacao), o que exige o tamanho exato do quadro codificado.
     """
-    encoded = []
-    idx = 0
-    L = len(bit_stream)
-
-    # Configurações padrão: (tamanho_bloco, bits_dados, bits_paridade)
-    hamming_configs = [
-        (63, 57, 6),  # Hamming(63,57) - 6 bits de paridade
-        (31, 26, 5),  # Hamming(31,26) - 5 bits de paridade  
-        (15, 11, 4),  # Hamming(15,11) - 4 bits de paridade
-        (7, 4, 3),    # Hamming(7,4) - 3 bits de paridade
-    ]
-
-    while idx < L:
-        # Escolhe o maior bloco que cabe nos bits restantes
-        bits_restantes = L - idx
-        n, k, p = None, None, None
-        
-        for config in hamming_configs:
-            if config[1] <= bits_restantes:
-                n, k, p = config
-                break
-        
-        # Se nenhum bloco padrão cabe, usa o menor
-        if n is None:
-            n, k, p = 7, 4, 3
-        
-        # Extrai k bits de dados (com padding se necessário)
-        data_bits = bit_stream[idx : idx + k]
-        if len(data_bits) < k:
-            data_bits = data_bits + [0] * (k - len(data_bits))
-        idx += len(bit_stream[idx : idx + k])  # avança apenas pelos bits reais
-        
-        # Cria bloco Hamming indexado a partir de 1
-        block = [None] * (n + 1)
-        
-        # Posições de paridade: 1, 2, 4, 8, 16, 32
-        parity_positions = [2 ** i for i in range(p)]
-        
-        # Preenche bits de dados nas posições não-paridade
-        data_idx = 0
-        for pos in range(1, n + 1):
-            if pos not in parity_positions:
-                block[pos] = data_bits[data_idx] if data_idx < len(data_bits) else 0
-                data_idx += 1
-        
-        # Calcula bits de paridade
-        for parity_pos in parity_positions:
-            xor_sum = 0
-            for pos in range(1, n + 1):
-                # Se a posição tem o bit de paridade ativo
-                if pos & parity_pos:
-                    if block[pos] is not None:
-                        xor_sum ^= block[pos]
-            block[parity_pos] = xor_sum
-        
-        # Adiciona bloco ao resultado (ignorando índice 0)
-        encoded.extend(block[1:])
-
-    return encoded
+    bits = bits_para_uint8(bit_stream)
+    agenda = _agenda_decodificacao(len(bits))
+
+    saida = []
+    inicio = 0
+    for n, quantidade in agenda:
+        _, H, posicoes_dados, tabela_erro = _CODIGOS_HAMMING[n]
+        corrida = bits[inicio : inicio + quantidade * n].reshape(quantidade, n)
+        sindromes = _produto_mod2(corrida, H.T) @ _PESOS_SINDROME[n]
+        corrigidos = corrida ^ tabela_erro[sindromes]
+        saida.append(corrigidos[:, posicoes_dados].ravel())
+        inicio += quantidade * n
+
+    out = para_bitarray(np.concatenate(saida)) if saida else bitarray()
+    return mesmo_tipo(out, bit_stream)
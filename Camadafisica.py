@@ -1,3 +1,7 @@
+import math
+from dataclasses import dataclass
+from functools import lru_cache
+
 import numpy as np
 import matplotlib.pyplot as plt
 
@@ -5,135 +9,282 @@ V_POSITIVO = 1.0
 V_NEGATIVO = -1.0 
 V_ZERO = 0.0      
 
+#---- Configuração do modem -----
+def _inteiro(x):
+    # tolera o arredondamento de divisões como 50000 / 1000.0
+    return abs(x - round(x)) < 1e-9
+
+@dataclass(frozen=True)
+class ModemConfig:
+    """
+    Parâmetros da camada física, compartilhados por moduladores e demoduladores.
+    É imutável e hashable: serve de chave para os caches de templates, bancos de
+    símbolos e limiares, que são calculados uma única vez por configuração.
+    Ex.: ModemConfig(frequencia_portadora=2000, taxa_amostragem=8000, desvio_fsk=1000)
+    para testes de vazão com 8 amostras/bit.
+    Limites (ValueError se não forem respeitados):
+      - todos os campos finitos e positivos;
+      - número inteiro e par de amostras por bit (os eixos de tempo do
+        modulador e do demodulador só coincidem com um número inteiro, e o
+        Manchester divide cada bit ao meio);
+      - as duas frequências do FSK (portadora ± desvio) positivas, abaixo de
+        taxa_amostragem/2 (Nyquist) e com um número inteiro de ciclos por bit,
+        senão os templates do receptor não separam os dois tons.
+    """
+    bit_rate: float = 1000
+    frequencia_portadora: float = 5000  #era 10.000
+    taxa_amostragem: float = 10 * 5000
+    desvio_fsk: float = 2000 #era 5.000
+
+    def __post_init__(self):
+        for campo in ('bit_rate', 'frequencia_portadora', 'taxa_amostragem', 'desvio_fsk'):
+            valor = getattr(self, campo)
+            if not (math.isfinite(valor) and valor > 0):
+                raise ValueError(f"{campo} precisa ser finito e positivo (recebido {valor})")
+        amostras_por_bit = self.taxa_amostragem / self.bit_rate
+        if not _inteiro(amostras_por_bit):
+            raise ValueError(f"taxa_amostragem precisa ser múltiplo inteiro de bit_rate "
+                             f"(taxa_amostragem={self.taxa_amostragem}, bit_rate={self.bit_rate})")
+        if self.amostras_por_bit < 2:
+            raise ValueError(f"A configuração precisa de pelo menos 2 amostras por bit "
+                             f"(taxa_amostragem={self.taxa_amostragem}, bit_rate={self.bit_rate})")
+        if self.amostras_por_bit % 2:
+            raise ValueError(f"O número de amostras por bit precisa ser par para o Manchester "
+                             f"(amostras_por_bit={self.amostras_por_bit})")
+        if self.desvio_fsk >= self.frequencia_portadora:
+            raise ValueError(f"O desvio FSK ({self.desvio_fsk} Hz) precisa ser menor que a "
+                             f"portadora ({self.frequencia_portadora} Hz)")
+        if self.frequencia_portadora + self.desvio_fsk >= self.taxa_amostragem / 2:
+            raise ValueError(f"Portadora + desvio FSK ({self.frequencia_portadora + self.desvio_fsk} Hz) "
+                             f"precisa ficar abaixo de taxa_amostragem/2 ({self.taxa_amostragem / 2} Hz)")
+        for frequencia in (self.frequencia_portadora - self.desvio_fsk,
+                           self.frequencia_portadora + self.desvio_fsk):
+            if not _inteiro(frequencia / self.bit_rate):
+                raise ValueError(f"Os tons do FSK precisam ter um número inteiro de ciclos por bit "
+                                 f"({frequencia} Hz a {self.bit_rate} bits/s)")
+
+    @property
+    def tempo_bit(self):
+        return 1/self.bit_rate
+
+    @property
+    def amostras_por_bit(self):
+        return int(round(self.taxa_amostragem / self.bit_rate))
+
+CONFIG_PADRAO = ModemConfig()
+
+def _config(config):
+    # Sem configuração explícita usa a padrão
+    return CONFIG_PADRAO if config is None else config
+
 
 #---- Ruido Gaussiano -----
-def add_ruido(bits, sigma):
-    ruido = np.random.normal(0, sigma, bits.shape)
+def add_ruido(bits, sigma, rng=None):
+    # rng: gerador próprio (np.random.Generator); sem ele usa o estado global
+    gerador = np.random if rng is None else rng
+    ruido = gerador.normal(0, sigma, bits.shape)
     sinal = bits + ruido
     return sinal
 
+#---- Quantização (ADC) -----
+# Tipos inteiros aceitos pela quantização, por número de bits
+TIPOS_QUANTIZACAO = {8: np.dtype('<i1'), 16: np.dtype('<i2')}
+
+def quantiza(sinal, bits=8):
+    """
+    Emula um ADC: quantiza o sinal em inteiros de 'bits' bits (8 ou 16) com uma
+    escala por quadro (o maior valor absoluto vira o maior inteiro positivo).
+    Devolve (inteiros, escala); amostra = inteiro * escala.
+    """
+    if bits not in TIPOS_QUANTIZACAO:
+        raise ValueError(f"Quantização desconhecida: {bits} bits. Opções: {', '.join(map(str, TIPOS_QUANTIZACAO))}")
+    sinal = np.asarray(sinal, dtype=np.float64)
+    maximo = float(np.max(np.abs(sinal))) if sinal.size else 0.0
+    escala = maximo / (2 ** (bits - 1) - 1) if maximo > 0 else 1.0
+    inteiros = np.rint(sinal / escala).astype(TIPOS_QUANTIZACAO[bits])
+    return inteiros, escala
+
+def desquantiza(inteiros, escala):
+    """
+    Operação inversa de quantiza (a menos do erro de quantização).
+    """
+    return np.multiply(inteiros, escala, dtype=np.float64)
+
+#---- Auxiliar: normaliza a entrada de bits -----
+def bits_para_array(bits):
+    """
+    Converte a entrada (lista de bits, bitarray ou array numpy)
+    em um array uint8 com um bit por posição, sem laço em Python.
+    """
+    if hasattr(bits, 'unpack'):   # bitarray: 1 byte (0/1) por bit
+        return np.frombuffer(bits.unpack(), dtype=np.uint8)
+    return np.asarray(bits).astype(np.uint8, copy=False)
+
 #---- NRZ-POLAR -----
-def code_nrz_polar(bits):
-    sinal = []
-    # Cria os pulsos com duração de N amostras
-    pulso_positivo = np.ones(AMOSTRAS_POR_BIT) * V_POSITIVO
-    pulso_negativo = np.ones(AMOSTRAS_POR_BIT) * V_NEGATIVO
-    
-    for b in bits:
-        if b == 1:
-            sinal.extend(pulso_positivo)
-        else:
-            sinal.extend(pulso_negativo)
-    return np.array(sinal)
+def code_nrz_polar(bits, config=None):
+    config = _config(config)
+    b = bits_para_array(bits)
+    # Mapeia cada bit para o seu nível e repete N amostras por bit
+    niveis = np.where(b == 1, V_POSITIVO, V_NEGATIVO)
+    return np.repeat(niveis, config.amostras_por_bit, axis=-1)
 
 # ---- MANCHESTER (Atualizado) ----
-def code_manchester(bits):
-    sinal = []
-    meio = AMOSTRAS_POR_BIT // 2
+def code_manchester(bits, config=None):
+    config = _config(config)
+    b = bits_para_array(bits)
+    meio = config.amostras_por_bit // 2
     
     # Define as metades do pulso
     # Bit 1: Baixo -> Alto (-V, +V)
     # Bit 0: Alto -> Baixo (+V, -V)
-    p_alto = np.ones(meio) * V_POSITIVO
-    p_baixo = np.ones(meio) * V_NEGATIVO
-    
-    for b in bits:
-        if b == 1:
-            sinal.extend(p_baixo) # Começa negativo
-            sinal.extend(p_alto)  # Termina positivo
-        else:
-            sinal.extend(p_alto)  # Começa positivo
-            sinal.extend(p_baixo) # Termina negativo
-    return np.array(sinal)
+    primeira = np.where(b == 1, V_NEGATIVO, V_POSITIVO)
+    niveis = np.stack([primeira, -primeira], axis=-1)
+    return np.repeat(niveis.reshape(*b.shape[:-1], -1), meio, axis=-1)
 
 # ---- BIPOLAR / AMI (Atualizado) ----
-def code_bipolar(bits):
-    sinal = []
-    counter = V_NEGATIVO
+def _bipolar_bloco(b, config, uns_anteriores=0):
+    """
+    Codifica um bloco de bits AMI. 'uns_anteriores' é quantos '1's já foram
+    transmitidos antes do bloco (só a paridade importa). Devolve (sinal, total de '1's).
+    """
+    uns = (b == 1)
     
-    pulso_zero = np.zeros(AMOSTRAS_POR_BIT)
-    
-    for b in bits:
-        if b == 1:
-            if counter == V_NEGATIVO:
-                sinal.extend(np.ones(AMOSTRAS_POR_BIT) * V_POSITIVO)
-                counter = V_POSITIVO
-            else:
-                sinal.extend(np.ones(AMOSTRAS_POR_BIT) * V_NEGATIVO)
-                counter = V_NEGATIVO
-        else:
-            sinal.extend(pulso_zero)
-    return np.array(sinal)
+    # AMI: os '1's alternam de polaridade, começando em +V.
+    # A contagem acumulada dos '1's diz se o pulso é o 1º, 2º, 3º...
+    contagem = np.cumsum(uns, axis=-1) + uns_anteriores
+    impar = (contagem % 2) == 1
+    niveis = np.where(uns, np.where(impar, V_POSITIVO, V_NEGATIVO), V_ZERO)
+    total = contagem[..., -1] if contagem.shape[-1] else uns_anteriores
+    return np.repeat(niveis, config.amostras_por_bit, axis=-1), total
+
+def code_bipolar(bits, config=None):
+    config = _config(config)
+    sinal, _ = _bipolar_bloco(bits_para_array(bits), config)
+    return sinal
 #----- MODULACAO POR PORTADORA -----
 
-BIT_RATE = 1000 
-TEMPO_BIT = 1/BIT_RATE
-FREEQUENCIA_PORTADORA = 5000  #era 10.000
-TAXA_DE_AMOSTRAGEM = 10 * FREEQUENCIA_PORTADORA 
-AMOSTRAS_POR_BIT = int(TAXA_DE_AMOSTRAGEM / BIT_RATE)
+# Constantes da configuração padrão (mantidas para quem ainda as importa)
+BIT_RATE = CONFIG_PADRAO.bit_rate
+TEMPO_BIT = CONFIG_PADRAO.tempo_bit
+FREEQUENCIA_PORTADORA = CONFIG_PADRAO.frequencia_portadora
+TAXA_DE_AMOSTRAGEM = CONFIG_PADRAO.taxa_amostragem
+AMOSTRAS_POR_BIT = CONFIG_PADRAO.amostras_por_bit
+FREQUENCIA_DESVIO_FSK = CONFIG_PADRAO.desvio_fsk
 
-def ask_modulate(bits):
-    sinal = []
+@lru_cache(maxsize=None)
+def _incremento_fase(frequencia, taxa_amostragem):
+    """
+    Incremento de fase por amostra (2*pi*f*dt) de uma portadora.
+    Fica em cache para que chamadas repetidas reaproveitem o valor.
+    """
+    dt = 1 / taxa_amostragem
+    return 2 * np.pi * frequencia * dt
 
-    dt = 1 / TAXA_DE_AMOSTRAGEM
-    fase = 0.0  # fase acumulada da portadora
+def _fase_acumulada(incrementos, fase_inicial=0.0):
+    """
+    Soma acumulada dos incrementos de fase, amostra a amostra, partindo de 'fase_inicial'.
+    Equivale a fazer 'fase += incremento' dentro de um laço (altera 'incrementos').
+    Em um lote (2-D), cada linha acumula a sua própria fase.
+    """
+    if incrementos.shape[-1]:
+        incrementos[..., 0] += fase_inicial
+    return np.cumsum(incrementos, axis=-1)
 
-    for b in bits:
-        for _ in range(AMOSTRAS_POR_BIT):
+def _fase_final(fase, fase_inicial):
+    return fase[..., -1] if fase.shape[-1] else fase_inicial
 
-            # avança a fase da portadora
-            fase += 2 * np.pi * FREEQUENCIA_PORTADORA * dt
+def _ask_bloco(b, config, fase_inicial=0.0):
+    """
+    Modula um bloco de bits ASK a partir de 'fase_inicial'. Devolve (sinal, fase final).
+    """
+    n_amostras = b.shape[-1] * config.amostras_por_bit
 
-            if b == 1:
-                sinal.append(np.sin(fase))   # bit '1' = portadora
-            else:
-                sinal.append(0.0)            # bit '0' = ausência de portadora
+    # a fase da portadora avança em todas as amostras, inclusive nos '0's
+    incremento = _incremento_fase(config.frequencia_portadora, config.taxa_amostragem)
+    fase = _fase_acumulada(np.full(b.shape[:-1] + (n_amostras,), incremento), fase_inicial)
 
-    return np.array(sinal)
+    # bit '1' = portadora / bit '0' = ausência de portadora
+    portadora_ligada = np.repeat(b == 1, config.amostras_por_bit, axis=-1)
+    return np.where(portadora_ligada, np.sin(fase), 0.0), _fase_final(fase, fase_inicial)
 
-def fsk_modulate(bits):
-    sinal = []
-    frequencia_desvio = 2000 #era 5.000
+def ask_modulate(bits, config=None):
+    config = _config(config)
+    sinal, _ = _ask_bloco(bits_para_array(bits), config)
+    return sinal
 
-    dt = 1 / TAXA_DE_AMOSTRAGEM
-    fase = 0.0  # fase acumulada
+def _fsk_bloco(b, config, fase_inicial=0.0):
+    """
+    Modula um bloco de bits FSK a partir de 'fase_inicial'. Devolve (sinal, fase final).
+    """
+    frequencia_desvio = config.desvio_fsk
 
-    for b in bits:
-        # Escolhe frequência do símbolo
-        if b == 1:   #era b == 0
-            f = FREEQUENCIA_PORTADORA + frequencia_desvio
-        else:
-            f = FREEQUENCIA_PORTADORA - frequencia_desvio
+    # Escolhe o incremento de fase de cada símbolo
+    incremento_1 = _incremento_fase(config.frequencia_portadora + frequencia_desvio, config.taxa_amostragem)
+    incremento_0 = _incremento_fase(config.frequencia_portadora - frequencia_desvio, config.taxa_amostragem)
+    incrementos = np.where(b == 1, incremento_1, incremento_0)  #era b == 0
 
-        # Gera AMOSTRAS_PORBIT amostras contínuas
-        for _ in range(AMOSTRAS_POR_BIT):
-            fase += 2 * np.pi * f * dt
-            sinal.append(np.sin(fase))
+    # Gera 'amostras_por_bit' amostras contínuas por símbolo
+    fase = _fase_acumulada(np.repeat(incrementos, config.amostras_por_bit, axis=-1), fase_inicial)
+    return np.sin(fase), _fase_final(fase, fase_inicial)
 
-    return np.array(sinal)
+def fsk_modulate(bits, config=None):
+    config = _config(config)
+    sinal, _ = _fsk_bloco(bits_para_array(bits), config)
+    return sinal
 
-def psk_modulate(bits):
-    sinal = []
-    tempo_simbolo = 2 * TEMPO_BIT
-    t = np.linspace(0, tempo_simbolo, 2 * AMOSTRAS_POR_BIT)
-    fases = {'00': 0 , '01': 90 , '11': 180 , '10': 270}
-    
-    # Adiciona padding se o número de bits for ímpar
-    if len(bits) % 2 != 0:
-        bits = list(bits) + [0]
+def bits_para_simbolos(b, bits_por_simbolo):
+    """
+    Agrupa os bits em símbolos de 'bits_por_simbolo' bits e devolve
+    o índice inteiro de cada símbolo (primeiro bit = mais significativo).
+    Completa com zeros se o número de bits não for múltiplo.
+    Em um lote (2-D) os bits de cada linha viram uma linha de índices.
+    """
+    resto = b.shape[-1] % bits_por_simbolo
+    if resto != 0:
+        b = np.concatenate([b, np.zeros(b.shape[:-1] + (bits_por_simbolo - resto,), dtype=np.uint8)], axis=-1)
+    pesos = 1 << np.arange(bits_por_simbolo - 1, -1, -1)
+    return b.reshape(*b.shape[:-1], -1, bits_por_simbolo) @ pesos
+
+def _modula_por_banco(indices, banco):
+    """
+    Monta o sinal copiando, para cada símbolo, a linha correspondente do banco.
+    """
+    return banco[indices].reshape(*indices.shape[:-1], -1)
+
+# --- PSK (QPSK) ---
+
+FASES_PSK = {'00': 0 , '01': 90 , '11': 180 , '10': 270}
 
-    for i in range(0, len(bits), 2):
-        bit1 = str(bits[i])
-        bit2 = str(bits[i+1])
-        bit_concat = bit1 + bit2
+@lru_cache(maxsize=None)
+def _banco_psk(frequencia, taxa_amostragem, amostras_por_simbolo):
+    """
+    Banco de formas de onda do QPSK: matriz (4, amostras_por_simbolo)
+    com uma linha por símbolo (índice = valor dos 2 bits).
+    Fica em cache, então o custo das funções trigonométricas é pago uma vez.
+    """
+    tempo_simbolo = amostras_por_simbolo / taxa_amostragem
+    t = np.linspace(0, tempo_simbolo, amostras_por_simbolo)
+    fases = np.zeros(len(FASES_PSK))
+    for chave, fase in FASES_PSK.items():
+        fases[int(chave, 2)] = fase
+    fases_rad = np.deg2rad(fases)
 
-        fase = fases[bit_concat]
-        fase_rad = np.deg2rad(fase)
+    banco = 1.0 * np.sin(2*np.pi*frequencia*t + fases_rad[:, np.newaxis])
+    banco.flags.writeable = False
+    return banco
 
-        sinal_bit = 1.0 * np.sin(2*np.pi*FREEQUENCIA_PORTADORA*t + fase_rad)
-        sinal.extend(sinal_bit)
+def banco_psk(config=None):
+    config = _config(config)
+    return _banco_psk(config.frequencia_portadora, config.taxa_amostragem, 2 * config.amostras_por_bit)
 
-    return np.array(sinal)
+def psk_modulate(bits, config=None):
+    config = _config(config)
+    b = bits_para_array(bits)
+    banco = banco_psk(config)
+
+    # Adiciona padding se o número de bits for ímpar
+    indices = bits_para_simbolos(b, 2)
+    return _modula_por_banco(indices, banco)
 
 # --- 16-QAM NORMALIZADO ---
 
@@ -142,37 +293,201 @@ def psk_modulate(bits):
 # Fator de escala = sqrt(10)
 NORM_QAM = np.sqrt(10) 
 
-def qam_16(bits):
-    sinal = []
-    tempo_simbolo = 4 * TEMPO_BIT
-    t = np.linspace(0, tempo_simbolo, 4 * AMOSTRAS_POR_BIT)
-    
-    QAM_16_MAP = {
-    '0000': (-3, -3), '0001': (-3, -1), '0011': (-3,  1), '0010': (-3,  3),
-    '0100': (-1, -3), '0101': (-1, -1), '0111': (-1,  1), '0110': (-1,  3),
-    '1100': ( 1, -3), '1101': ( 1, -1), '1111': ( 1,  1), '1110': ( 1,  3),
-    '1000': ( 3, -3), '1001': ( 3, -1), '1011': ( 3,  1), '1010': ( 3,  3),
-    }
-    
+QAM_16_MAP = {
+'0000': (-3, -3), '0001': (-3, -1), '0011': (-3,  1), '0010': (-3,  3),
+'0100': (-1, -3), '0101': (-1, -1), '0111': (-1,  1), '0110': (-1,  3),
+'1100': ( 1, -3), '1101': ( 1, -1), '1111': ( 1,  1), '1110': ( 1,  3),
+'1000': ( 3, -3), '1001': ( 3, -1), '1011': ( 3,  1), '1010': ( 3,  3),
+}
+
+@lru_cache(maxsize=None)
+def _banco_qam_16(frequencia, taxa_amostragem, amostras_por_simbolo):
+    """
+    Banco de formas de onda do 16-QAM: matriz (16, amostras_por_simbolo)
+    com uma linha por símbolo (índice = valor dos 4 bits).
+    """
+    tempo_simbolo = amostras_por_simbolo / taxa_amostragem
+    t = np.linspace(0, tempo_simbolo, amostras_por_simbolo)
+    a = np.zeros(len(QAM_16_MAP))
+    b = np.zeros(len(QAM_16_MAP))
+    for chave, (nivel_I, nivel_Q) in QAM_16_MAP.items():
+        a[int(chave, 2)] = nivel_I
+        b[int(chave, 2)] = nivel_Q
+
+    # --- NORMALIZAÇÃO AQUI ---
+    # Dividi-se por sqrt(10) para que a energia média seja igual à do QPSK
+    # Implementação inicial estava com valores de amplitude até 3,o que nao condiz com os outros modelos
+    # Normalização resolve isso sem alterar implementação
+    onda_I = (a[:, np.newaxis] / NORM_QAM) * np.cos(2 * np.pi * frequencia * t)
+    onda_Q = (b[:, np.newaxis] / NORM_QAM) * np.sin(2 * np.pi * frequencia * t)
+
+    banco = onda_I - onda_Q
+    banco.flags.writeable = False
+    return banco
+
+def banco_qam_16(config=None):
+    config = _config(config)
+    return _banco_qam_16(config.frequencia_portadora, config.taxa_amostragem, 4 * config.amostras_por_bit)
+
+def qam_16(bits, config=None):
+    config = _config(config)
+    b = bits_para_array(bits)
+    banco = banco_qam_16(config)
+
     # Adiciona padding se não for múltiplo de 4
-    if len(bits) % 4 != 0:
-        bits = list(bits) + [0] * (4 - len(bits) % 4)
-
-    for i in range(0, len(bits), 4):
-        bit_concat = "".join(map(str, bits[i:i+4]))
-        
-        a = QAM_16_MAP[bit_concat][0]
-        b = QAM_16_MAP[bit_concat][1]
-        
-        # --- NORMALIZAÇÃO AQUI ---
-        # Dividi-se por sqrt(10) para que a energia média seja igual à do QPSK
-        # Implementação inicial estava com valores de amplitude até 3,o que nao condiz com os outros modelos
-        # Normalização resolve isso sem alterar implementação
-        onda_I = (a / NORM_QAM) * np.cos(2 * np.pi * FREEQUENCIA_PORTADORA * t)
-        onda_Q = (b / NORM_QAM) * np.sin(2 * np.pi * FREEQUENCIA_PORTADORA * t)
-        
-        onda_simbolo = onda_I - onda_Q
-        sinal.extend(onda_simbolo)
-
-    return np.array(sinal)
+    indices = bits_para_simbolos(b, 4)
+    return _modula_por_banco(indices, banco)
+
+
+# ==========================================================
+# MODULAÇÃO EM FLUXO (STREAMING)
+# Versões geradoras dos moduladores: recebem os bits em blocos de
+# qualquer tamanho e produzem o sinal bloco a bloco, carregando entre
+# blocos a fase da portadora, a polaridade do AMI e os bits de um símbolo
+# incompleto. Concatenar a saída dá exatamente o sinal da versão de uma vez,
+# e a memória fica limitada ao tamanho do bloco.
+# ==========================================================
+
+def reagrupar_blocos(blocos, multiplo, descartar_resto=False):
+    """
+    Reagrupa uma sequência de arrays em blocos cujo tamanho é múltiplo de 'multiplo',
+    guardando a sobra para o próximo bloco. No fim, a sobra é entregue sozinha
+    (ou descartada, se 'descartar_resto').
+    """
+    resto = None
+    for bloco in blocos:
+        if resto is not None and len(resto):
+            bloco = np.concatenate([resto, bloco])
+        inteiro = len(bloco) - len(bloco) % multiplo
+        resto = bloco[inteiro:]
+        if inteiro:
+            yield bloco[:inteiro]
+    if resto is not None and len(resto) and not descartar_resto:
+        yield resto
+
+def _stream_por_simbolo(modulador, blocos, bits_por_simbolo, config):
+    # Moduladores sem estado entre símbolos: basta não quebrar um símbolo ao meio
+    # (o último símbolo incompleto recebe o padding normal do modulador)
+    for grupo in reagrupar_blocos(map(bits_para_array, blocos), bits_por_simbolo):
+        yield modulador(grupo, config)
+
+def code_nrz_polar_stream(blocos, config=None):
+    return _stream_por_simbolo(code_nrz_polar, blocos, 1, config)
+
+def code_manchester_stream(blocos, config=None):
+    return _stream_por_simbolo(code_manchester, blocos, 1, config)
+
+def psk_modulate_stream(blocos, config=None):
+    return _stream_por_simbolo(psk_modulate, blocos, 2, config)
+
+def qam_16_stream(blocos, config=None):
+    return _stream_por_simbolo(qam_16, blocos, 4, config)
+
+def code_bipolar_stream(blocos, config=None):
+    config = _config(config)
+    uns = 0   # '1's já transmitidos (define a polaridade do próximo)
+    for bloco in blocos:
+        sinal, uns = _bipolar_bloco(bits_para_array(bloco), config, uns)
+        yield sinal
+
+def ask_modulate_stream(blocos, config=None):
+    config = _config(config)
+    fase = 0.0
+    for bloco in blocos:
+        sinal, fase = _ask_bloco(bits_para_array(bloco), config, fase)
+        yield sinal
+
+def fsk_modulate_stream(blocos, config=None):
+    config = _config(config)
+    fase = 0.0
+    for bloco in blocos:
+        sinal, fase = _fsk_bloco(bits_para_array(bloco), config, fase)
+        yield sinal
+
+
+# ==========================================================
+# MODULAÇÃO EM LOTE (BATCH)
+# Várias mensagens de uma vez: os bits chegam como uma matriz
+# (n_mensagens, n_bits), uma mensagem por linha, e o sinal sai como uma
+# matriz (n_mensagens, n_amostras). Os moduladores acima já trabalham ao
+# longo do último eixo, então o lote inteiro passa por uma única sequência
+# de chamadas numpy. Cada linha do resultado é igual à modulação da
+# mensagem sozinha.
+# Mensagens de tamanhos diferentes: empilha_bits completa com zeros e
+# devolve os comprimentos; as amostras depois do fim de cada mensagem
+# (símbolo incompleto incluído, com o padding normal) ficam em zero.
+# ==========================================================
+
+def empilha_bits(mensagens):
+    """
+    Empilha mensagens de bits (listas, bitarrays ou arrays) em uma matriz uint8
+    (n_mensagens, maior tamanho), completando com zeros.
+    Devolve (matriz, comprimentos).
+    """
+    linhas = [bits_para_array(m) for m in mensagens]
+    comprimentos = np.array([len(l) for l in linhas], dtype=np.intp)
+    matriz = np.zeros((len(linhas), comprimentos.max(initial=0)), dtype=np.uint8)
+    for i, linha in enumerate(linhas):
+        matriz[i, :len(linha)] = linha
+    return matriz, comprimentos
+
+def desempilha_bits(matriz, comprimentos=None):
+    """
+    Operação inversa de empilha_bits: lista com os bits de cada linha,
+    cortados no comprimento da mensagem.
+    """
+    if comprimentos is None:
+        return list(matriz)
+    return [linha[:n] for linha, n in zip(matriz, comprimentos)]
+
+def _matriz_de_bits(bits):
+    b = bits_para_array(bits)
+    if b.ndim != 2:
+        raise ValueError(f"O lote precisa ser uma matriz (n_mensagens, n_bits); recebido shape {b.shape}.")
+    return b
+
+def mascara_depois_do_fim(comprimentos, n_mensagens, tamanho):
+    """
+    Matriz booleana (n_mensagens, tamanho): True nas posições depois do fim de cada linha.
+    """
+    comprimentos = np.asarray(comprimentos, dtype=np.intp)
+    if comprimentos.shape != (n_mensagens,):
+        raise ValueError(f"São esperados {n_mensagens} comprimentos; recebido shape {comprimentos.shape}.")
+    return np.arange(tamanho) >= comprimentos[:, np.newaxis]
+
+def _lote(modulador, bits, bits_por_simbolo, comprimentos, config):
+    b = _matriz_de_bits(bits)
+    if comprimentos is None:
+        return modulador(b, config)
+
+    # bits depois do fim viram o padding do último símbolo (zeros)
+    b = np.where(mascara_depois_do_fim(comprimentos, *b.shape), 0, b).astype(np.uint8)
+    sinal = modulador(b, config)
+
+    n_simbolos = -(-b.shape[1] // bits_por_simbolo)
+    if n_simbolos:
+        amostras_por_simbolo = sinal.shape[1] // n_simbolos
+        simbolos_usados = -(-np.asarray(comprimentos) // bits_por_simbolo)
+        sinal[mascara_depois_do_fim(simbolos_usados * amostras_por_simbolo, *sinal.shape)] = 0.0
+    return sinal
+
+def code_nrz_polar_lote(bits, comprimentos=None, config=None):
+    return _lote(code_nrz_polar, bits, 1, comprimentos, config)
+
+def code_manchester_lote(bits, comprimentos=None, config=None):
+    return _lote(code_manchester, bits, 1, comprimentos, config)
+
+def code_bipolar_lote(bits, comprimentos=None, config=None):
+    return _lote(code_bipolar, bits, 1, comprimentos, config)
+
+def ask_modulate_lote(bits, comprimentos=None, config=None):
+    return _lote(ask_modulate, bits, 1, comprimentos, config)
+
+def fsk_modulate_lote(bits, comprimentos=None, config=None):
+    return _lote(fsk_modulate, bits, 1, comprimentos, config)
+
+def psk_modulate_lote(bits, comprimentos=None, config=None):
+    return _lote(psk_modulate, bits, 2, comprimentos, config)
 
+def qam_16_lote(bits, comprimentos=None, config=None):
+    return _lote(qam_16, bits, 4, comprimentos, config)
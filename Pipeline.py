@@ -0,0 +1,299 @@
+# Pipeline da simulação: enquadramento -> detecção/correção -> camada física
+# (modulação, canal, demodulação) -> verificação/correção -> desenquadramento
+#
+# Cada estágio é escolhido pelo nome (os mesmos da GUI) nos registros abaixo,
+# uma única vez, quando o Pipeline é montado a partir de uma
+# ConfiguracaoPipeline. Depois disso o mesmo objeto é executado quantas vezes
+# for preciso, sem comparar strings a cada mensagem; tabelas e templates
+# (CRC, Hamming, bancos de PSK/QAM, templates dos receptores) já ficam
+# calculados na montagem.
+#
+# A GUI, a linha de comando abaixo e o motor de BER (SimulacaoBER) usam este
+# mesmo objeto.
+#
+# Uso: python3 ./Pipeline.py "Olá" --enquadramento "FLAG + Inserção de bits" --deteccao CRC-32 --modulacao FSK --sigma 0.5
+
+import argparse
+from dataclasses import dataclass
+from functools import lru_cache, partial
+
+import numpy as np
+from bitarray import bitarray
+
+import Camadafisica as fisica
+import decode_Camadafisica as d_fisica
+import CamadaEnlace as enlace
+import decode_CamadaEnlace as d_enlace
+import SimulacaoSimbolos as simbolos
+from Camadafisica import ModemConfig, CONFIG_PADRAO
+
+# ==========================================================
+# Registros de estágios
+# ==========================================================
+
+def _conta_caracteres(bits, cabecalho):
+    # o receptor lê exatamente 'cabecalho' bits de tamanho: payload maior
+    # que isso estenderia o cabeçalho e seria desenquadrado errado
+    if len(bits) >= 2 ** cabecalho:
+        raise ValueError(f"Payload de {len(bits)} bits não cabe no cabeçalho de {cabecalho} bits "
+                         f"da contagem de caracteres (máximo {2 ** cabecalho - 1}).")
+    return enlace.character_count(bits, cabecalho)
+
+
+# nome -> (enquadrar(bits, cabeçalho), novo_desenquadrador(cabeçalho) ou None,
+#          remover(bits, cabeçalho)), bits -> bits
+# O desenquadrador em fluxo (decode_CamadaEnlace) ignora bits que sobram
+# depois do fim do quadro (padding do Hamming, por exemplo); a remoção simples
+# (remove_*) fica para quando ele não acha um quadro completo.
+# Usado também por Segmentacao.
+ENQUADRAMENTOS = {
+    "Nenhum": (lambda bits, cabecalho: bits, None, lambda bits, cabecalho: bits),
+    "Contagem de caracteres": (
+        _conta_caracteres,
+        d_enlace.DesenquadradorContagem,
+        d_enlace.remove_charactere_count),
+    "FLAG + Inserção de bytes": (
+        lambda bits, cabecalho: enlace.byte_insertion(bits),
+        lambda cabecalho: d_enlace.DesenquadradorBytes(),
+        lambda bits, cabecalho: d_enlace.remove_byte_insertion(bits)),
+    "FLAG + Inserção de bits": (
+        lambda bits, cabecalho: enlace.bit_insertion(bits),
+        lambda cabecalho: d_enlace.DesenquadradorBits(),
+        lambda bits, cabecalho: d_enlace.remove_bit_insertion(bits)),
+}
+
+
+def _desenquadrador(novo_desenquadrador, remove, cabecalho):
+    """
+    desenquadrar(bits) de um quadro recebido: o desenquadrador em fluxo, ou a
+    remoção simples se ele não achar um quadro completo.
+    """
+    if novo_desenquadrador is None:
+        return partial(remove, cabecalho=cabecalho)
+
+    def desenquadrar(bits):
+        payloads = novo_desenquadrador(cabecalho).feed(bits)
+        return payloads[0] if payloads else remove(bits, cabecalho)
+    return desenquadrar
+
+# nome -> (codificar(bits), verificar(bits) devolvendo (relatório, bits))
+DETECCOES = {
+    "Nenhum": (lambda bits: bits, lambda bits: ("Não verificado", bits)),
+    "Bit de paridade": (enlace.bit_parity, d_enlace.verifica_bit_parity),
+    "CRC-32": (enlace.prepara_CRC_para_transmissao, d_enlace.verifica_crc),
+    "Checksum": (enlace.prepara_checksum_para_transmissao, d_enlace.verifica_checksum),
+    "Hamming": (enlace.hamming_dinamico,
+                lambda bits: ("Hamming aplicado", d_enlace.corr_hamming_dinamico(bits))),
+}
+
+# nome -> codificador de linha (usado para o gráfico do sinal digital)
+CODIFICACOES_LINHA = {
+    "Nenhum": None,
+    "NRZ-Polar": fisica.code_nrz_polar,
+    "Manchester": fisica.code_manchester,
+    "Bipolar": fisica.code_bipolar,
+}
+
+# nome -> (modulador, demodulador, bits por símbolo), todos com (entrada, config)
+MODULACOES = {
+    "NRZ-Polar": (fisica.code_nrz_polar, d_fisica.decode_nrz_polar, 1),
+    "Manchester": (fisica.code_manchester, d_fisica.decode_manchester, 1),
+    "Bipolar": (fisica.code_bipolar, d_fisica.decode_bipolar, 1),
+    "ASK": (fisica.ask_modulate, d_fisica.decode_ask_modulate, 1),
+    "FSK": (fisica.fsk_modulate, d_fisica.decode_fsk_modulate, 1),
+    "PSK (QPSK)": (fisica.psk_modulate, d_fisica.demodulate_psk_modulate, 2),
+    "16-QAM": (fisica.qam_16, d_fisica.demodulate_qam_16, 4),
+}
+
+
+def _escolhe(registro, nome, tipo):
+    if nome not in registro:
+        raise ValueError(f"{tipo} desconhecido(a): {nome!r}. Opções: {', '.join(registro)}")
+    return registro[nome]
+
+
+@dataclass(frozen=True)
+class ConfiguracaoPipeline:
+    """
+    Escolha dos estágios (pelos nomes dos registros) e parâmetros do canal.
+    modulacao = "Nenhum" dá um canal ideal (os bits enviados chegam intactos).
+    aplicar_canal = False ainda gera o sinal (para os gráficos), mas entrega
+    ao receptor os bits enviados, como a GUI com "Ativação dos erros" desmarcada.
+    rapido = True troca a forma de onda pela simulação no domínio dos símbolos.
+    bits_cabecalho é o tamanho fixo do cabeçalho da contagem de caracteres:
+    payloads com 2 ** bits_cabecalho bits ou mais são recusados (ValueError).
+    """
+    enquadramento: str = "Nenhum"
+    deteccao: str = "Nenhum"
+    codificacao_linha: str = "Nenhum"
+    modulacao: str = "Nenhum"
+    sigma: float = 0.0
+    aplicar_canal: bool = True
+    rapido: bool = False
+    bits_cabecalho: int = 8
+    modem: ModemConfig = CONFIG_PADRAO
+
+    def __post_init__(self):
+        _escolhe(ENQUADRAMENTOS, self.enquadramento, "Enquadramento")
+        _escolhe(DETECCOES, self.deteccao, "Detecção")
+        _escolhe(CODIFICACOES_LINHA, self.codificacao_linha, "Codificação de linha")
+        if self.modulacao != "Nenhum":
+            _escolhe(MODULACOES, self.modulacao, "Modulação")
+        if self.rapido and self.modulacao not in simbolos.ESQUEMAS:
+            raise ValueError(f"A simulação rápida só existe para: {', '.join(simbolos.ESQUEMAS)}")
+        if self.sigma < 0:
+            raise ValueError("sigma não pode ser negativo.")
+
+
+@dataclass
+class ResultadoPipeline:
+    """
+    Tudo o que passou por cada estágio em uma execução.
+    """
+    bits: bitarray
+    quadro: object = None            # depois do enquadramento
+    enviado: object = None           # depois da detecção/correção (vai para o meio)
+    sinal: np.ndarray = None         # sinal modulado (None sem forma de onda)
+    sinal_recebido: np.ndarray = None
+    recebidos: object = None         # bits entregues pela camada física
+    relatorio: str = "Não verificado"
+    corrigidos: object = None
+    payload: object = None
+    texto: str = ""
+
+
+class Pipeline:
+    """
+    Cadeia de estágios montada uma vez a partir de uma ConfiguracaoPipeline.
+    """
+
+    def __init__(self, config=None):
+        self.config = ConfiguracaoPipeline() if config is None else config
+        c = self.config
+
+        enquadrar, novo_desenquadrador, remover = ENQUADRAMENTOS[c.enquadramento]
+        self.enquadrar = partial(enquadrar, cabecalho=c.bits_cabecalho)
+        self.desenquadrar = _desenquadrador(novo_desenquadrador, remover, c.bits_cabecalho)
+        self.codificar, self.verificar = DETECCOES[c.deteccao]
+
+        codificador_linha = CODIFICACOES_LINHA[c.codificacao_linha]
+        self.codificar_linha = None if codificador_linha is None else partial(codificador_linha, config=c.modem)
+
+        self.modular = self.demodular = None
+        self.bits_por_simbolo = 1
+        if c.modulacao != "Nenhum":
+            modulador, demodulador, self.bits_por_simbolo = MODULACOES[c.modulacao]
+            self.modular = partial(modulador, config=c.modem)
+            self.demodular = partial(demodulador, config=c.modem)
+            # uma execução curta já deixa bancos e templates no cache
+            self.demodular(self.modular(np.zeros(self.bits_por_simbolo, dtype=np.uint8)))
+
+    # ----------------------------------------------------------
+    # Estágios
+    # ----------------------------------------------------------
+
+    def transmite(self, bits):
+        """
+        Enquadramento e detecção/correção. Devolve (quadro, bits enviados ao meio).
+        """
+        quadro = self.enquadrar(bits)
+        return quadro, self.codificar(quadro)
+
+    def camada_fisica(self, bits, rng=None):
+        """
+        Modulação, canal AWGN e demodulação.
+        Devolve (sinal modulado, sinal recebido, bits recebidos); os bits
+        recebidos são cortados no tamanho enviado (sem o padding do último símbolo).
+        """
+        c = self.config
+        if self.modular is None:
+            return None, None, bits
+        if c.rapido:
+            if not c.aplicar_canal:
+                return None, None, bits
+            recebidos = simbolos.simular_simbolos(bits, c.modulacao, c.sigma, rng, c.modem)
+            return None, None, recebidos[:len(bits)]
+
+        sinal = self.modular(bits)
+        sinal_recebido = fisica.add_ruido(sinal, c.sigma, rng) if c.sigma > 0 else sinal
+        if not c.aplicar_canal:
+            return sinal, sinal_recebido, bits
+        return sinal, sinal_recebido, self.demodular(sinal_recebido)[:len(bits)]
+
+    def recebe(self, bits):
+        """
+        Verificação/correção e desenquadramento.
+        Devolve (relatório, bits corrigidos, payload).
+        """
+        relatorio, corrigidos = self.verificar(enlace.para_bitarray(bits))
+        return relatorio, corrigidos, self.desenquadrar(corrigidos)
+
+    def executa(self, mensagem, rng=None) -> ResultadoPipeline:
+        """
+        Passa a mensagem (texto ou bits) por todos os estágios.
+        """
+        if isinstance(mensagem, str):
+            bits = enlace.convert_to_bitarray(mensagem)
+        else:
+            bits = enlace.para_bitarray(mensagem)
+
+        r = ResultadoPipeline(bits)
+        r.quadro, r.enviado = self.transmite(bits)
+        r.sinal, r.sinal_recebido, r.recebidos = self.camada_fisica(r.enviado, rng)
+        r.relatorio, r.corrigidos, r.payload = self.recebe(r.recebidos)
+        r.texto = d_enlace.bit_list_to_text(r.payload)
+        return r
+
+
+PIPELINES_EM_CACHE = 32   # a chave inclui o sigma: cada valor novo da GUI/BER é outra entrada
+
+
+@lru_cache(maxsize=PIPELINES_EM_CACHE)
+def obter_pipeline(config: ConfiguracaoPipeline) -> Pipeline:
+    """
+    Pipeline já montado para a configuração (montado só na primeira vez).
+    Os menos usados recentemente saem do cache; os caches de bancos e
+    templates da camada física continuam valendo para eles.
+    """
+    return Pipeline(config)
+
+
+# ==========================================================
+# Linha de comando
+# ==========================================================
+
+def bits_para_log(bits):
+    # bitarray aparece no log como a sequência de 0/1, sem o "bitarray('...')"
+    return bits.to01() if isinstance(bits, bitarray) else bits
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Executa a cadeia de transmissão para uma mensagem.")
+    parser.add_argument("mensagem")
+    parser.add_argument("--enquadramento", choices=list(ENQUADRAMENTOS), default="Nenhum")
+    parser.add_argument("--deteccao", choices=list(DETECCOES), default="Nenhum")
+    parser.add_argument("--modulacao", choices=["Nenhum"] + list(MODULACOES), default="Nenhum")
+    parser.add_argument("--sigma", type=float, default=0.0)
+    parser.add_argument("--rapido", action="store_true",
+                        help="usa a simulação no domínio dos símbolos (só ASK/FSK/PSK/16-QAM)")
+    parser.add_argument("--semente", type=int, default=None)
+    args = parser.parse_args()
+
+    pipeline = obter_pipeline(ConfiguracaoPipeline(
+        enquadramento=args.enquadramento, deteccao=args.deteccao, modulacao=args.modulacao,
+        sigma=args.sigma, rapido=args.rapido))
+    r = pipeline.executa(args.mensagem, np.random.default_rng(args.semente))
+
+    print(f"Sequência binária original (len = {len(r.bits)}): {bits_para_log(r.bits)}")
+    print(f"Sequência com enquadramento (len = {len(r.quadro)}): {bits_para_log(r.quadro)}")
+    print(f"Sequência enviada ao meio (len = {len(r.enviado)}): {bits_para_log(r.enviado)}")
+    if r.sinal is not None:
+        print(f"Sinal modulado ({args.modulacao}): {len(r.sinal)} amostras")
+    recebidos = enlace.para_bitarray(r.recebidos)
+    print(f"Sequência recebida (len = {len(recebidos)}): {bits_para_log(recebidos)}")
+    print(f"Relatório de erro: {r.relatorio}")
+    print(f"Mensagem decodificada: {r.texto}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,188 @@
+# Protocolo de mensagens entre Transmissor e Receptor
+#
+# Cada mensagem vai no fio como um cabeçalho de tamanho fixo seguido do corpo:
+#
+#     tipo (1 byte) | tamanho do corpo em bytes (4 bytes, big-endian) | corpo
+#
+# Com o tamanho na frente, o receptor sabe exatamente quantos bytes esperar,
+# então várias mensagens podem seguir uma atrás da outra na mesma conexão
+# e mensagens de qualquer tamanho chegam inteiras.
+#
+# Corpo de uma mensagem de bits (TIPO_BITS): 1 byte com o número de bits de
+# padding do último byte, seguido dos bytes do bitarray.
+#
+# Corpo de uma mensagem de forma de onda (TIPO_AMOSTRAS): o sinal modulado
+# quantizado (Camadafisica.quantiza), para o receptor demodular do outro lado:
+#
+#     bits da quantização (1 byte) | escala (float64) | bits transmitidos (4 bytes)
+#     | ModemConfig: bit_rate, portadora, taxa de amostragem, desvio FSK (4 x float64)
+#     | tamanho do nome (1 byte) | nome da modulação (UTF-8) | amostras (inteiros little-endian)
+#
+# Com a ModemConfig no cabeçalho o receptor demodula com os mesmos parâmetros
+# do transmissor, qualquer que seja a configuração de cada lado.
+#
+# Corpo de uma forma de onda sem quantização (TIPO_AMOSTRAS_BRUTAS): as
+# amostras float32/float64 como estão, sem perda, para o transporte em
+# memória compartilhada (onde o tamanho não pesa):
+#
+#     bits por amostra (1 byte: 32 ou 64) | bits transmitidos (4 bytes)
+#     | ModemConfig (4 x float64) | tamanho do nome (1 byte) | nome da modulação
+#     | amostras (float little-endian)
+
+import math
+import struct
+
+import numpy as np
+from bitarray import bitarray
+
+import CamadaEnlace as enlace
+from Camadafisica import TIPOS_QUANTIZACAO, ModemConfig, CONFIG_PADRAO, quantiza, desquantiza
+
+CABECALHO = struct.Struct('!BI')   # tipo, tamanho do corpo
+TAMANHO_MAXIMO = 64 * 1024 * 1024  # corpo maior que isso indica fluxo corrompido
+
+TIPO_BITS = 0
+TIPO_AMOSTRAS = 1
+TIPO_AMOSTRAS_BRUTAS = 2
+
+CABECALHO_AMOSTRAS = struct.Struct('!BdI4dB')   # bits da quantização, escala, bits transmitidos, ModemConfig, tamanho do nome
+CABECALHO_AMOSTRAS_BRUTAS = struct.Struct('!BI4dB')   # bits por amostra, bits transmitidos, ModemConfig, tamanho do nome
+TIPOS_AMOSTRA_BRUTA = {32: '<f4', 64: '<f8'}   # bits por amostra -> dtype
+
+
+def cabecalho(tipo, tamanho) -> bytes:
+    if not 0 <= tamanho <= TAMANHO_MAXIMO:
+        raise ValueError(f"Tamanho de corpo inválido: {tamanho} (máximo {TAMANHO_MAXIMO}).")
+    return CABECALHO.pack(tipo, tamanho)
+
+
+def le_cabecalho(dados):
+    """
+    Lê (tipo, tamanho) de um cabeçalho recebido (bytes, bytearray ou memoryview).
+    """
+    tipo, tamanho = CABECALHO.unpack(dados)
+    if tamanho > TAMANHO_MAXIMO:
+        raise ValueError(f"Tamanho de corpo inválido: {tamanho} (máximo {TAMANHO_MAXIMO}).")
+    return tipo, tamanho
+
+
+def partes_bits(bits):
+    """
+    Partes do corpo de uma mensagem de bits, sem copiar o buffer do bitarray:
+    [byte de padding, bytes dos bits]. Aceita também lista ou array numpy
+    de bits (saída dos demoduladores). Devolve (tipo, partes).
+    """
+    bits = enlace.para_bitarray(bits)
+    return TIPO_BITS, [bytes([bits.padbits]), memoryview(bits)]
+
+
+def bits_do_corpo(corpo) -> bitarray:
+    """
+    Operação inversa de partes_bits: reconstrói o bitarray com o tamanho original.
+    """
+    corpo = memoryview(corpo)
+    if len(corpo) == 0:
+        raise ValueError("Corpo vazio: falta o byte de padding.")
+    padding = corpo[0]
+    bits = bitarray()
+    bits.frombytes(corpo[1:])
+    if padding:
+        del bits[-padding:]
+    return bits
+
+
+def partes_amostras(sinal, modulacao, n_bits, bits_quantizacao=8, config=None):
+    """
+    Partes do corpo de uma mensagem de forma de onda: o sinal é quantizado
+    e o buffer dos inteiros vai direto para o envio, sem outra cópia.
+    'n_bits' é quantos bits o sinal carrega (o resto é padding do último símbolo)
+    e 'config' a ModemConfig usada na modulação (padrão: CONFIG_PADRAO).
+    Devolve (tipo, partes).
+    """
+    config = CONFIG_PADRAO if config is None else config
+    inteiros, escala = quantiza(sinal, bits_quantizacao)
+    nome = modulacao.encode('utf-8')
+    sub_cabecalho = CABECALHO_AMOSTRAS.pack(bits_quantizacao, escala, n_bits,
+                                            config.bit_rate, config.frequencia_portadora,
+                                            config.taxa_amostragem, config.desvio_fsk, len(nome)) + nome
+    return TIPO_AMOSTRAS, [sub_cabecalho, memoryview(inteiros).cast('B')]
+
+
+def _le_sub_cabecalho(corpo, estrutura):
+    if len(corpo) < estrutura.size:
+        raise ValueError(f"Corpo de forma de onda com {len(corpo)} bytes, menor que o cabeçalho "
+                         f"({estrutura.size} bytes).")
+    return estrutura.unpack(corpo[:estrutura.size])
+
+
+def _le_nome(corpo, inicio, tamanho_nome):
+    """
+    Nome da modulação e posição onde as amostras começam.
+    """
+    fim = inicio + tamanho_nome
+    if fim > len(corpo):
+        raise ValueError(f"Nome da modulação ({tamanho_nome} bytes) passa do fim do corpo.")
+    return bytes(corpo[inicio:fim]).decode('utf-8'), fim
+
+
+def amostras_do_corpo(corpo):
+    """
+    Operação inversa de partes_amostras. Os inteiros são lidos como uma view
+    (np.frombuffer) do corpo recebido e desquantizados direto em float64.
+    Devolve (modulação, n_bits, ModemConfig, sinal). O cabeçalho vem do fio:
+    qualquer campo inválido (corpo curto, escala ou ModemConfig impossíveis,
+    nome que não é UTF-8) levanta ValueError, e o quadro é descartado.
+    """
+    corpo = memoryview(corpo)
+    bits_quantizacao, escala, n_bits, bit_rate, portadora, taxa_amostragem, desvio_fsk, tamanho_nome = \
+        _le_sub_cabecalho(corpo, CABECALHO_AMOSTRAS)
+    if bits_quantizacao not in TIPOS_QUANTIZACAO:
+        raise ValueError(f"Quantização desconhecida: {bits_quantizacao} bits.")
+    if not (math.isfinite(escala) and escala > 0):
+        raise ValueError(f"Escala de quantização inválida: {escala}.")
+    config = ModemConfig(bit_rate, portadora, taxa_amostragem, desvio_fsk)
+    modulacao, inicio = _le_nome(corpo, CABECALHO_AMOSTRAS.size, tamanho_nome)
+    inteiros = np.frombuffer(corpo, dtype=TIPOS_QUANTIZACAO[bits_quantizacao], offset=inicio)
+    return modulacao, n_bits, config, desquantiza(inteiros, escala)
+
+
+def partes_amostras_brutas(sinal, modulacao, n_bits, config=None):
+    """
+    Como partes_amostras, mas sem quantização: as amostras vão exatas, como
+    float32 (se o sinal já for float32) ou float64, e o buffer do array vai
+    direto para o envio. Ocupa 4 a 8 vezes mais bytes que a versão quantizada.
+    Devolve (tipo, partes).
+    """
+    config = CONFIG_PADRAO if config is None else config
+    sinal = np.asarray(sinal)
+    sinal = np.ascontiguousarray(sinal, dtype='<f4' if sinal.dtype == np.float32 else '<f8')
+    nome = modulacao.encode('utf-8')
+    sub_cabecalho = CABECALHO_AMOSTRAS_BRUTAS.pack(8 * sinal.itemsize, n_bits,
+                                                   config.bit_rate, config.frequencia_portadora,
+                                                   config.taxa_amostragem, config.desvio_fsk, len(nome)) + nome
+    return TIPO_AMOSTRAS_BRUTAS, [sub_cabecalho, memoryview(sinal).cast('B')]
+
+
+def amostras_brutas_do_corpo(corpo):
+    """
+    Operação inversa de partes_amostras_brutas. O sinal é uma view
+    (np.frombuffer) do corpo, sem cópia: vale enquanto o corpo valer.
+    Devolve (modulação, n_bits, ModemConfig, sinal); campos inválidos
+    levantam ValueError, como em amostras_do_corpo.
+    """
+    corpo = memoryview(corpo)
+    bits_amostra, n_bits, bit_rate, portadora, taxa_amostragem, desvio_fsk, tamanho_nome = \
+        _le_sub_cabecalho(corpo, CABECALHO_AMOSTRAS_BRUTAS)
+    if bits_amostra not in TIPOS_AMOSTRA_BRUTA:
+        raise ValueError(f"Amostras de {bits_amostra} bits não suportadas. "
+                         f"Opções: {', '.join(map(str, TIPOS_AMOSTRA_BRUTA))}")
+    config = ModemConfig(bit_rate, portadora, taxa_amostragem, desvio_fsk)
+    modulacao, inicio = _le_nome(corpo, CABECALHO_AMOSTRAS_BRUTAS.size, tamanho_nome)
+    return modulacao, n_bits, config, np.frombuffer(corpo, dtype=TIPOS_AMOSTRA_BRUTA[bits_amostra], offset=inicio)
+
+
+def mensagem(tipo, partes) -> list:
+    """
+    Mensagem completa (cabeçalho + partes do corpo), pronta para sendall/sendmsg.
+    """
+    return [cabecalho(tipo, sum(memoryview(p).nbytes for p in partes))] + list(partes)
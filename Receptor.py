@@ -1,17 +1,100 @@
+import asyncio
+import queue
 import socket
 import threading
-from bitarray import bitarray
 import random
+from concurrent.futures import ThreadPoolExecutor
+
+import CamadaEnlace as enlace
+import Protocolo as protocolo
+from AnelCompartilhado import AnelCompartilhado, CAPACIDADE_PADRAO
+from Pipeline import MODULACOES
+
+TAMANHO_BUFFER_INICIAL = 64 * 1024   # cresce se chegar um quadro maior
+INTERVALO_VERIFICACAO = 0.2          # segundos entre verificações do pedido de parada
+LOTE_DECODIFICACAO = 64              # quadros da fila decodificados por ida ao executor...
+BYTES_LOTE_DECODIFICACAO = 64 * 1024  # ...até somar esse tamanho (formas de onda vão uma a uma)
+
+
+def _demodula(modulacao, n_bits, config, sinal):
+    # forma de onda: o receptor demodula deste lado
+    # com a ModemConfig que veio no cabeçalho, a mesma do transmissor
+    if modulacao not in MODULACOES:
+        raise ValueError(f"Modulação desconhecida: {modulacao!r}. Opções: {', '.join(MODULACOES)}")
+    _, demodulador, _ = MODULACOES[modulacao]
+    return enlace.para_bitarray(demodulador(sinal, config)[:n_bits])
+
+
+def _demodula_amostras(corpo):
+    return _demodula(*protocolo.amostras_do_corpo(corpo))
+
+
+def _demodula_amostras_brutas(corpo):
+    # o sinal é uma view do corpo (no ReceiverMemoria, da memória compartilhada)
+    return _demodula(*protocolo.amostras_brutas_do_corpo(corpo))
+
+
+# tipo do quadro -> decodificador(corpo) devolvendo os bits (bitarray)
+DECODIFICADORES = {
+    protocolo.TIPO_BITS: protocolo.bits_do_corpo,
+    protocolo.TIPO_AMOSTRAS: _demodula_amostras,
+    protocolo.TIPO_AMOSTRAS_BRUTAS: _demodula_amostras_brutas,
+}
+
+
+def decodifica_quadro(tipo, corpo):
+    if tipo not in DECODIFICADORES:
+        raise ValueError(f"Tipo de quadro desconhecido: {tipo}. Opções: {', '.join(map(str, DECODIFICADORES))}")
+    return DECODIFICADORES[tipo](corpo)
+
+
+def _decodifica_lote(quadros):
+    """
+    Decodifica vários quadros (endereço, tipo, corpo, cota) de uma vez, fora do loop
+    de eventos. Devolve [(bits, erro)] na mesma ordem; o erro de um quadro não
+    atrapalha os outros.
+    """
+    resultados = []
+    for _, tipo, corpo, _ in quadros:
+        try:
+            resultados.append((decodifica_quadro(tipo, corpo), None))
+        except Exception as e:
+            resultados.append((None, e))
+    return resultados
+
+
+class ConexaoEncerrada(Exception):
+    """
+    O transmissor fechou a conexão no meio de um quadro.
+    """
+
 
 class Receiver:
-    def __init__(self):
+    def __init__(self, tamanho_fila=64):
         self.received_data = None
         self.data_ready = threading.Event()
         self.sent_data = None
         self.changed_bit_position = None
         self.server_running = False   # evita iniciar o servidor duas vezes
+        self.parar = threading.Event()   # pede o encerramento do servidor
+
+        # quadros completos (tipo, corpo) esperando decodificação; se a fila enche,
+        # o servidor para de ler do socket e o TCP segura o transmissor
+        self.quadros = queue.Queue(maxsize=tamanho_fila)
+        self._buffer = bytearray(TAMANHO_BUFFER_INICIAL)
+
+    def encerrar(self):
+        """
+        Pede o encerramento do servidor; ele termina em até INTERVALO_VERIFICACAO segundos.
+        """
+        self.parar.set()
 
     def TCPServer(self, host='127.0.0.1', port=12345):
+        """
+        Servidor de longa duração: aceita uma conexão por vez e, em cada uma,
+        recebe quantos quadros (cabeçalho + corpo, ver Protocolo) o transmissor
+        mandar. Cada quadro completo vai para a fila 'quadros'. Roda até encerrar().
+        """
 
         # --- proteção para evitar múltiplos servidores ---
         if self.server_running:
@@ -28,31 +111,309 @@ class Receiver:
                 s.bind((host, port))
             except OSError as e:
                 print(f"Erro ao tentar fazer bind na porta {port}: {e}")
+                self.parar.clear()
                 self.server_running = False
                 return
 
             s.listen()
+            # accept com timeout para verificar o pedido de parada
+            s.settimeout(INTERVALO_VERIFICACAO)
             print(f"Servidor aguardando conexão em {host}:{port}...")
 
-            try:
-                conn, addr = s.accept()
-            except Exception as e:
-                print("Erro ao aceitar conexão:", e)
-                self.server_running = False
+            while not self.parar.is_set():
+                try:
+                    conn, addr = s.accept()
+                except socket.timeout:
+                    continue
+                except OSError as e:
+                    print("Erro ao aceitar conexão:", e)
+                    break
+
+                with conn:
+                    print(f"Conexão estabelecida com {addr}")
+                    conn.settimeout(INTERVALO_VERIFICACAO)
+                    try:
+                        self._atende_conexao(conn)
+                    except (ConexaoEncerrada, ValueError, OSError) as e:
+                        print(f"Conexão com {addr} descartada: {e}")
+
+        # --- servidor finalizado ---
+        # o pedido de parada só é apagado aqui, para valer mesmo se veio antes
+        # de o servidor começar; depois disso o servidor pode ser iniciado de novo
+        self.parar.clear()
+        self.server_running = False
+
+    # ----------------------------------------------------------
+    # Recepção dos quadros
+    # ----------------------------------------------------------
+
+    def _atende_conexao(self, conn):
+        """
+        Recebe quadros até o transmissor fechar a conexão ou o servidor ser encerrado.
+        """
+        cabecalho = memoryview(bytearray(protocolo.CABECALHO.size))
+        while not self.parar.is_set():
+            if not self._recebe_exato(conn, cabecalho, fim_permitido=True):
+                return   # conexão fechada entre dois quadros: fim normal
+            tipo, tamanho = protocolo.le_cabecalho(cabecalho)
+
+            if tamanho > len(self._buffer):
+                self._buffer = bytearray(max(tamanho, 2 * len(self._buffer)))
+            corpo = memoryview(self._buffer)[:tamanho]
+            if not self._recebe_exato(conn, corpo):
                 return
 
-            with conn:
-                print(f"Conexão estabelecida com {addr}")
-                self.received_data = conn.recv(1024)
-                print(f"Dados recebidos: {self.received_data}")
+            # o buffer é reaproveitado no próximo quadro: a fila recebe uma cópia
+            if not self._enfileira((tipo, bytes(corpo))):
+                return
 
-                # converte bytes → trem de bits (bitarray)
-                byte_to_bit = bitarray()
-                byte_to_bit.frombytes(self.received_data)
-                self.sent_data = byte_to_bit.tolist()
+    def _recebe_exato(self, conn, visao, fim_permitido=False):
+        """
+        Preenche 'visao' inteira com recv_into, sem buffers intermediários.
+        Devolve False se o servidor foi encerrado (ou se a conexão fechou antes
+        do primeiro byte e 'fim_permitido'); fechar no meio levanta ConexaoEncerrada.
+        """
+        lidos = 0
+        while lidos < len(visao):
+            if self.parar.is_set():
+                return False
+            try:
+                n = conn.recv_into(visao[lidos:])
+            except socket.timeout:
+                continue
+            if n == 0:
+                if lidos == 0 and fim_permitido:
+                    return False
+                raise ConexaoEncerrada(f"faltaram {len(visao) - lidos} bytes do quadro")
+            lidos += n
+        return True
 
-                # sinaliza que os dados estão prontos para a GUI
-                self.data_ready.set()
+    def _enfileira(self, quadro):
+        while not self.parar.is_set():
+            try:
+                self.quadros.put(quadro, timeout=INTERVALO_VERIFICACAO)
+            except queue.Full:
+                continue
+            self.data_ready.set()
+            return True
+        return False
 
-        # --- servidor finalizado ---
-        self.server_running = False
+    # ----------------------------------------------------------
+    # Decodificação (consumidor da fila)
+    # ----------------------------------------------------------
+
+    def recebe(self, timeout=None):
+        """
+        Retira o próximo quadro da fila e devolve os bits (bitarray); formas de
+        onda são demoduladas aqui. Levanta queue.Empty se nada chegar dentro
+        de 'timeout' segundos.
+        """
+        tipo, corpo = self.quadros.get(timeout=timeout)
+        # limpa antes de olhar a fila: um quadro que chegue no meio volta a marcar o evento
+        self.data_ready.clear()
+        if not self.quadros.empty():
+            self.data_ready.set()
+
+        self.received_data = corpo
+        self.sent_data = decodifica_quadro(tipo, corpo)
+        return self.sent_data
+
+
+# ==========================================================
+# SERVIDOR ASSÍNCRONO (vários transmissores ao mesmo tempo)
+# Uma corrotina por conexão remonta os quadros (mesmo Protocolo do
+# servidor com threads) e os coloca em uma fila compartilhada, consumida
+# pelo estágio de decodificação. Cada conexão tem uma cota de quadros
+# ainda não decodificados (quadros_por_conexao): quando um transmissor
+# esgota a sua, a corrotina dele fica parada, deixa de ler o socket e o
+# controle de fluxo do TCP segura só aquele transmissor. A fila
+# compartilhada também é limitada (tamanho_fila), como teto de memória:
+# se muitas conexões a enchem juntas, todas esperam.
+# ==========================================================
+
+class ReceiverAsync:
+    def __init__(self, tratar=None, tamanho_fila=1024, decodificadores=1, backlog=4096,
+                 quadros_por_conexao=32):
+        """
+        'tratar(endereco, bits)' é chamado para cada quadro decodificado
+        (sem ele, os bits ficam na lista 'recebidos'), sempre no loop de eventos.
+        A decodificação (e a demodulação das formas de onda) roda fora do loop,
+        em 'decodificadores' threads: o numpy libera o GIL nas contas pesadas,
+        então mais de um decodificador trabalha em paralelo. Com um só
+        decodificador os quadros são tratados na ordem de chegada; com mais
+        de um, lotes diferentes podem terminar fora de ordem.
+        """
+        self.tratar = tratar
+        self.tamanho_fila = tamanho_fila
+        self.decodificadores = decodificadores
+        self.backlog = backlog
+        self.quadros_por_conexao = quadros_por_conexao
+        self.recebidos = []
+        self.quadros_recebidos = 0
+        self._conexoes = set()   # tarefas das conexões abertas
+        self.pronto = threading.Event()   # o servidor já está escutando (ou falhou: ver 'erro')
+        self.erro = None                  # exceção que impediu o servidor de iniciar
+        self._loop = None
+        self._parar = None
+
+    def encerrar(self):
+        """
+        Pede o encerramento do servidor (pode ser chamado de outra thread).
+        """
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._parar.set)
+
+    @property
+    def conexoes_ativas(self):
+        return len(self._conexoes)
+
+    def TCPServer(self, host='127.0.0.1', port=12345):
+        """
+        Roda o servidor em um loop de eventos próprio até encerrar(),
+        como Receiver.TCPServer (por exemplo, em uma thread).
+        """
+        asyncio.run(self.servir(host, port))
+
+    async def servir(self, host='127.0.0.1', port=12345):
+        self._loop = asyncio.get_running_loop()
+        self._parar = asyncio.Event()
+        fila = asyncio.Queue(maxsize=self.tamanho_fila)
+        self.erro = None
+
+        try:
+            servidor = await asyncio.start_server(lambda r, w: self._atende_conexao(r, w, fila),
+                                                  host, port, backlog=self.backlog, reuse_address=True)
+        except OSError as e:
+            self.erro = e
+            raise
+        finally:
+            # quem espera por 'pronto' acorda também quando o servidor não sobe
+            self.pronto.set()
+        print(f"Servidor assíncrono aguardando conexões em {host}:{port}...")
+
+        executor = ThreadPoolExecutor(max_workers=self.decodificadores, thread_name_prefix="decodificador")
+        consumidores = [asyncio.create_task(self._decodifica(fila, executor))
+                        for _ in range(self.decodificadores)]
+        try:
+            await self._parar.wait()
+        finally:
+            servidor.close()
+            # conexões ainda abertas são cortadas (o quadro em andamento é perdido)
+            abertas = list(self._conexoes)
+            for tarefa in abertas:
+                tarefa.cancel()
+            await asyncio.gather(*abertas, return_exceptions=True)
+            await servidor.wait_closed()
+            # quadros que já estavam na fila ainda são decodificados
+            await fila.join()
+            for consumidor in consumidores:
+                consumidor.cancel()
+            executor.shutdown()
+            self.pronto.clear()
+
+    async def _atende_conexao(self, reader, writer, fila):
+        endereco = writer.get_extra_info('peername')
+        self._conexoes.add(asyncio.current_task())
+        cota = asyncio.Semaphore(self.quadros_por_conexao)
+        try:
+            while True:
+                try:
+                    cabecalho = await reader.readexactly(protocolo.CABECALHO.size)
+                except asyncio.IncompleteReadError as e:
+                    if e.partial:
+                        print(f"Conexão com {endereco} fechada no meio de um cabeçalho.")
+                    return   # sem bytes pendentes: fim normal
+                tipo, tamanho = protocolo.le_cabecalho(cabecalho)
+                corpo = await reader.readexactly(tamanho)
+                # a vaga da cota volta quando o quadro for decodificado
+                await cota.acquire()
+                await fila.put((endereco, tipo, corpo, cota))
+        except (asyncio.IncompleteReadError, ValueError, OSError) as e:
+            print(f"Conexão com {endereco} descartada: {e}")
+        except asyncio.CancelledError:
+            pass   # encerramento do servidor: termina a tarefa sem erro
+        finally:
+            self._conexoes.discard(asyncio.current_task())
+            writer.close()
+
+    async def _decodifica(self, fila, executor):
+        while True:
+            # quadros pequenos que já estão na fila vão juntos para o executor,
+            # para a troca de thread não pesar; quadros grandes vão sozinhos e
+            # se espalham pelos decodificadores
+            lote = [await fila.get()]
+            tamanho = len(lote[0][2])
+            while (len(lote) < LOTE_DECODIFICACAO and tamanho < BYTES_LOTE_DECODIFICACAO
+                   and not fila.empty()):
+                lote.append(fila.get_nowait())
+                tamanho += len(lote[-1][2])
+            # qualquer erro fica no quadro: o consumidor não pode morrer, senão
+            # a fila para de andar e o encerramento espera por ela para sempre
+            try:
+                resultados = await self._loop.run_in_executor(executor, _decodifica_lote, lote)
+                for (endereco, _, _, _), (bits, erro) in zip(lote, resultados):
+                    if erro is not None:
+                        print(f"Quadro de {endereco} descartado: {erro!r}")
+                        continue
+                    self.quadros_recebidos += 1
+                    try:
+                        if self.tratar is None:
+                            self.recebidos.append(bits)
+                        else:
+                            self.tratar(endereco, bits)
+                    except Exception as e:
+                        print(f"Erro ao tratar quadro de {endereco}: {e!r}")
+            finally:
+                for _, _, _, cota in lote:
+                    cota.release()
+                    fila.task_done()
+
+
+# ==========================================================
+# RECEPTOR POR MEMÓRIA COMPARTILHADA
+# Para transmissor e receptor na mesma máquina: cria o anel compartilhado
+# (AnelCompartilhado) e lê cada quadro no próprio lugar, decodificando direto
+# da memória compartilhada antes de liberar o espaço para o transmissor
+# (Transmissor.TransmitterMemoria). recebe() funciona como no Receiver.
+# ==========================================================
+
+class ReceiverMemoria:
+    def __init__(self, nome=None, capacidade=CAPACIDADE_PADRAO):
+        self.anel = AnelCompartilhado(nome, capacidade, criar=True)
+        self.sent_data = None
+
+    @property
+    def nome(self):
+        return self.anel.nome
+
+    def encerrar(self):
+        """
+        Fecha e apaga o anel compartilhado.
+        """
+        self.anel.fechar()
+
+    def recebe(self, timeout=None):
+        """
+        Próximo quadro, decodificado em bits (bitarray); formas de onda são
+        demoduladas aqui. Levanta queue.Empty se nada chegar dentro de 'timeout' segundos.
+        """
+        try:
+            registro = self.anel.le(timeout)
+        except TimeoutError:
+            raise queue.Empty from None
+        try:
+            tipo, tamanho = protocolo.le_cabecalho(registro[:protocolo.CABECALHO.size])
+            with registro[protocolo.CABECALHO.size:protocolo.CABECALHO.size + tamanho] as corpo:
+                self.sent_data = decodifica_quadro(tipo, corpo)
+        finally:
+            # nenhuma view pode sobrar apontando para o anel
+            registro.release()
+            self.anel.libera()
+        return self.sent_data
+
+
+# nome -> classe do receptor (todas com recebe(timeout) e encerrar())
+TRANSPORTES = {
+    "TCP": Receiver,
+    "Memória compartilhada": ReceiverMemoria,
+}
@@ -0,0 +1,150 @@
+# Segmentação de mensagens grandes em vários quadros
+#
+# A mensagem é dividida em segmentos de 'tamanho_quadro' bits, e cada segmento
+# recebe o enquadramento e a detecção/correção de erros escolhidos (as mesmas
+# funções de CamadaEnlace, na mesma ordem da GUI: enquadramento, depois EDC).
+# Um erro passa a custar só o quadro em que ocorreu. No receptor, cada quadro
+# é verificado/corrigido e desenquadrado com decode_CamadaEnlace, e os
+# payloads são juntados de volta na ordem.
+#
+# Os quadros são independentes, então são codificados e decodificados em
+# paralelo em um pool de processos.
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+from bitarray import bitarray
+
+import CamadaEnlace as enlace
+import decode_CamadaEnlace as d_enlace
+from Pipeline import DETECCOES, ENQUADRAMENTOS
+
+TAMANHO_QUADRO_PADRAO = 1024   # bits de payload por quadro
+
+
+def bits_cabecalho(tamanho_quadro):
+    """
+    Bits do cabeçalho da contagem de caracteres: o suficiente para o maior
+    payload do quadro (8 bits, como em character_count, ou mais se precisar).
+    """
+    return max(8, tamanho_quadro.bit_length())
+
+
+# enquadramento e detecção/correção vêm dos mesmos registros do Pipeline
+# (ENQUADRAMENTOS e DETECCOES, importados de lá)
+
+
+def _valida(enquadramento, deteccao, tamanho_quadro):
+    if enquadramento not in ENQUADRAMENTOS:
+        raise ValueError(f"Enquadramento desconhecido: {enquadramento!r}. Opções: {', '.join(ENQUADRAMENTOS)}")
+    if deteccao not in DETECCOES:
+        raise ValueError(f"Detecção desconhecida: {deteccao!r}. Opções: {', '.join(DETECCOES)}")
+    # a inserção de bytes completa cada segmento até um byte inteiro, e o
+    # receptor não tem como saber quantos bits de enchimento tirar
+    if enquadramento == "FLAG + Inserção de bytes" and tamanho_quadro % 8:
+        raise ValueError(f"Com inserção de bytes o tamanho_quadro precisa ser múltiplo de 8 "
+                         f"(recebido {tamanho_quadro}).")
+
+
+def segmenta(bits, tamanho_quadro=TAMANHO_QUADRO_PADRAO) -> list[bitarray]:
+    """
+    Divide os bits em segmentos de até 'tamanho_quadro' bits (o último pode ser menor).
+    """
+    if tamanho_quadro <= 0:
+        raise ValueError("tamanho_quadro precisa ser positivo.")
+    bits = enlace.para_bitarray(bits)
+    return [bits[i:i + tamanho_quadro] for i in range(0, len(bits), tamanho_quadro)]
+
+
+def codifica_quadro(segmento, enquadramento, deteccao, cabecalho=8) -> bitarray:
+    """
+    Um segmento -> quadro pronto para o meio (enquadramento + EDC).
+    """
+    enquadra, _, _ = ENQUADRAMENTOS[enquadramento]
+    codifica, _ = DETECCOES[deteccao]
+    return codifica(enquadra(enlace.para_bitarray(segmento), cabecalho))
+
+
+def decodifica_quadro(quadro, enquadramento, deteccao, cabecalho=8, tamanho_quadro=None):
+    """
+    Um quadro recebido -> (relatório, payload).
+    O quadro precisa ter o tamanho transmitido: o padding do último símbolo
+    dos demoduladores deve ser cortado antes (como fazem Pipeline e Receptor),
+    porque o Hamming separa os blocos pelo tamanho do quadro. O desenquadrador
+    em fluxo ignora os bits de dados que sobram depois do fim do quadro (o
+    padding do último bloco Hamming). Se o quadro não puder ser verificado
+    ou desenquadrado, o relatório diz isso e o payload vem vazio.
+    Sem enquadramento não há como saber onde o payload termina: ele é
+    apenas cortado em 'tamanho_quadro' bits.
+    """
+    _, novo_desenquadrador, _ = ENQUADRAMENTOS[enquadramento]
+    _, verifica = DETECCOES[deteccao]
+
+    try:
+        relatorio, bits = verifica(enlace.para_bitarray(quadro))
+    except ValueError as e:
+        return f"Quadro inválido: {e}", bitarray()
+    bits = enlace.para_bitarray(bits)
+    if novo_desenquadrador is None:
+        return relatorio, bits[:tamanho_quadro]
+
+    payloads = novo_desenquadrador(cabecalho).feed(bits)
+    if len(payloads) != 1:
+        return f"{relatorio} / Quadro inválido", bitarray()
+    return relatorio, payloads[0]
+
+
+def _map(funcao, itens, processos):
+    """
+    map em um pool de processos; sem pool quando não compensa (1 processo ou 1 item).
+    """
+    processos = os.cpu_count() if processos is None else processos
+    if processos <= 1 or len(itens) <= 1:
+        return list(map(funcao, itens))
+    lote = max(1, len(itens) // (4 * processos))
+    with ProcessPoolExecutor(max_workers=processos) as pool:
+        return list(pool.map(funcao, itens, chunksize=lote))
+
+
+def codifica_quadros(bits, enquadramento, deteccao, tamanho_quadro=TAMANHO_QUADRO_PADRAO,
+                     processos=None) -> list[bitarray]:
+    """
+    TX: segmenta os bits e codifica cada segmento em um quadro, em paralelo.
+    """
+    _valida(enquadramento, deteccao, tamanho_quadro)
+    funcao = partial(codifica_quadro, enquadramento=enquadramento, deteccao=deteccao,
+                     cabecalho=bits_cabecalho(tamanho_quadro))
+    return _map(funcao, segmenta(bits, tamanho_quadro), processos)
+
+
+def decodifica_quadros(quadros, enquadramento, deteccao, tamanho_quadro=TAMANHO_QUADRO_PADRAO,
+                       processos=None):
+    """
+    RX: verifica e desenquadra cada quadro em paralelo e junta os payloads na ordem.
+    Devolve (bits da mensagem, lista de relatórios por quadro).
+    """
+    _valida(enquadramento, deteccao, tamanho_quadro)
+    funcao = partial(decodifica_quadro, enquadramento=enquadramento, deteccao=deteccao,
+                     cabecalho=bits_cabecalho(tamanho_quadro), tamanho_quadro=tamanho_quadro)
+    resultados = _map(funcao, list(quadros), processos)
+
+    mensagem = bitarray()
+    for _, payload in resultados:
+        mensagem += payload
+    return mensagem, [relatorio for relatorio, _ in resultados]
+
+
+def codifica_texto(texto, enquadramento, deteccao, **opcoes) -> list[bitarray]:
+    return codifica_quadros(enlace.convert_to_bitarray(texto), enquadramento, deteccao, **opcoes)
+
+
+def decodifica_texto(quadros, enquadramento, deteccao, **opcoes):
+    """
+    Devolve (texto, relatórios por quadro).
+    O texto é feito de bytes inteiros: bits de padding que sobrem no último
+    quadro sem enquadramento são descartados.
+    """
+    mensagem, relatorios = decodifica_quadros(quadros, enquadramento, deteccao, **opcoes)
+    del mensagem[len(mensagem) - len(mensagem) % 8:]
+    return d_enlace.bit_list_to_text(mensagem), relatorios
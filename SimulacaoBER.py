@@ -0,0 +1,199 @@
+# Motor de Monte Carlo para curvas de BER/SER
+#
+# Varre uma lista de valores de sigma (ou de Eb/N0) para um par
+# modulador/demodulador de Camadafisica/decode_Camadafisica. Cada ponto roda
+# em um processo do pool, com um gerador aleatório próprio e independente,
+# e para assim que atinge o número alvo de erros ou o orçamento de bits.
+#
+# Uso: python3 ./SimulacaoBER.py FSK --ebn0 0 2 4 6 8 --csv fsk.csv
+
+import argparse
+import csv
+import json
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from Camadafisica import CONFIG_PADRAO
+from Pipeline import MODULACOES, ConfiguracaoPipeline, obter_pipeline
+
+# nome -> (modulador, demodulador, bits por símbolo): o registro de modulações do Pipeline
+PARES = MODULACOES
+
+Z_95 = 1.959963984540054   # quantil da normal para 95% de confiança
+
+
+def intervalo_wilson(erros, total, z=Z_95):
+    """
+    Intervalo de confiança de Wilson para uma proporção (erros / total).
+    Continua válido quando há poucos ou nenhum erro, ao contrário do intervalo normal.
+    """
+    if total == 0:
+        return (0.0, 1.0)
+    p = erros / total
+    denominador = 1 + z**2 / total
+    centro = (p + z**2 / (2 * total)) / denominador
+    margem = z * math.sqrt(p * (1 - p) / total + z**2 / (4 * total**2)) / denominador
+    return (max(0.0, centro - margem), min(1.0, centro + margem))
+
+
+def energia_por_bit(par, n_bits=4000, semente=0, config=None):
+    """
+    Energia média por bit do sinal transmitido (soma das amostras ao quadrado / bits),
+    estimada com bits aleatórios. Usada para converter Eb/N0 em sigma.
+    """
+    modulador, _, bits_por_simbolo = PARES[par]
+    n_bits -= n_bits % bits_por_simbolo
+    bits = np.random.default_rng(semente).integers(0, 2, n_bits, dtype=np.uint8)
+    return float(np.sum(modulador(bits, config) ** 2) / n_bits)
+
+
+def sigma_para_ebn0(par, ebn0_db, config=None):
+    """
+    Sigma do ruído por amostra para um Eb/N0 (dB), com N0 = 2 * sigma².
+    """
+    ebn0 = 10 ** (np.asarray(ebn0_db, dtype=float) / 10)
+    return np.sqrt(energia_por_bit(par, config=config) / (2 * ebn0))
+
+
+def simular_ponto(par, sigma, semente, alvo_erros=100, orcamento_bits=10**6,
+                  bits_por_lote=20000, rapido=False, config=None):
+    """
+    Simula um único ponto da curva. Roda lotes de bits aleatórios até acumular
+    'alvo_erros' erros de bit ou gastar 'orcamento_bits' bits.
+    'semente' pode ser um inteiro ou um np.random.SeedSequence.
+    'config' é a ModemConfig usada por modulador e demodulador (None = padrão).
+    """
+    _, _, bits_por_simbolo = PARES[par]
+    pipeline = obter_pipeline(ConfiguracaoPipeline(
+        modulacao=par, sigma=float(sigma), rapido=rapido,
+        modem=CONFIG_PADRAO if config is None else config))
+    rng = np.random.default_rng(semente)
+    bits_por_lote -= bits_por_lote % bits_por_simbolo
+
+    bits_total = erros_bit = erros_simbolo = 0
+    while erros_bit < alvo_erros and bits_total < orcamento_bits:
+        n = min(bits_por_lote, orcamento_bits - bits_total)
+        n -= n % bits_por_simbolo
+        if n == 0:
+            break
+        bits = rng.integers(0, 2, n, dtype=np.uint8)
+        _, _, recebidos = pipeline.camada_fisica(bits, rng)
+
+        diferentes = recebidos != bits
+        erros_bit += int(np.count_nonzero(diferentes))
+        erros_simbolo += int(np.count_nonzero(diferentes.reshape(-1, bits_por_simbolo).any(axis=1)))
+        bits_total += n
+
+    simbolos_total = bits_total // bits_por_simbolo
+    return {
+        "par": par,
+        "rapido": rapido,
+        "sigma": float(sigma),
+        "bits": bits_total,
+        "erros_bit": erros_bit,
+        "ber": erros_bit / bits_total if bits_total else float('nan'),
+        "ber_ic95": intervalo_wilson(erros_bit, bits_total),
+        "simbolos": simbolos_total,
+        "erros_simbolo": erros_simbolo,
+        "ser": erros_simbolo / simbolos_total if simbolos_total else float('nan'),
+        "ser_ic95": intervalo_wilson(erros_simbolo, simbolos_total),
+    }
+
+
+def _simular_ponto_tupla(argumentos):
+    # ProcessPoolExecutor.map passa um único argumento
+    par, sigma, semente, opcoes = argumentos
+    return simular_ponto(par, sigma, semente, **opcoes)
+
+
+def varrer(par, sigmas=None, ebn0_db=None, semente=None, processos=None, **opcoes):
+    """
+    Varre os pontos de sigma (ou Eb/N0 em dB) em paralelo, um ponto por tarefa.
+    Cada ponto recebe um fluxo aleatório independente derivado de 'semente'
+    (SeedSequence.spawn), então o resultado é reprodutível para uma mesma semente.
+    Opções extras (alvo_erros, orcamento_bits, bits_por_lote, rapido, config) vão para simular_ponto.
+    """
+    if par not in PARES:
+        raise ValueError(f"Par desconhecido: {par!r}. Opções: {', '.join(PARES)}")
+    if (sigmas is None) == (ebn0_db is None):
+        raise ValueError("Informe 'sigmas' ou 'ebn0_db' (apenas um dos dois).")
+
+    if ebn0_db is not None:
+        ebn0_db = [float(v) for v in ebn0_db]
+        sigmas = sigma_para_ebn0(par, ebn0_db, opcoes.get("config")).tolist()
+    sigmas = [float(s) for s in sigmas]
+
+    sementes = np.random.SeedSequence(semente).spawn(len(sigmas))
+    tarefas = [(par, s, semente_ponto, opcoes) for s, semente_ponto in zip(sigmas, sementes)]
+
+    with ProcessPoolExecutor(max_workers=processos) as pool:
+        resultados = list(pool.map(_simular_ponto_tupla, tarefas))
+
+    if ebn0_db is not None:
+        for resultado, valor in zip(resultados, ebn0_db):
+            resultado["ebn0_db"] = valor
+    return resultados
+
+
+# ==========================================================
+# Saída dos resultados
+# ==========================================================
+
+def _linha_plana(resultado):
+    linha = dict(resultado)
+    linha["ber_ic95_inf"], linha["ber_ic95_sup"] = linha.pop("ber_ic95")
+    linha["ser_ic95_inf"], linha["ser_ic95_sup"] = linha.pop("ser_ic95")
+    return linha
+
+
+def salvar_csv(resultados, caminho):
+    linhas = [_linha_plana(r) for r in resultados]
+    colunas = list(dict.fromkeys(c for linha in linhas for c in linha))
+    with open(caminho, 'w', newline='') as arquivo:
+        escritor = csv.DictWriter(arquivo, fieldnames=colunas)
+        escritor.writeheader()
+        escritor.writerows(linhas)
+
+
+def salvar_json(resultados, caminho):
+    with open(caminho, 'w') as arquivo:
+        json.dump(resultados, arquivo, indent=2)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Curvas de BER/SER por Monte Carlo.")
+    parser.add_argument("par", choices=list(PARES), help="modulação (par modulador/demodulador)")
+    grupo = parser.add_mutually_exclusive_group(required=True)
+    grupo.add_argument("--sigma", type=float, nargs="+", help="valores de sigma do ruído")
+    grupo.add_argument("--ebn0", type=float, nargs="+", help="valores de Eb/N0 em dB")
+    parser.add_argument("--alvo-erros", type=int, default=100)
+    parser.add_argument("--orcamento-bits", type=int, default=10**6)
+    parser.add_argument("--semente", type=int, default=None)
+    parser.add_argument("--processos", type=int, default=os.cpu_count())
+    parser.add_argument("--rapido", action="store_true",
+                        help="usa a simulação no domínio dos símbolos (só ASK/FSK/PSK/16-QAM)")
+    parser.add_argument("--csv", help="arquivo CSV de saída")
+    parser.add_argument("--json", help="arquivo JSON de saída")
+    args = parser.parse_args()
+
+    resultados = varrer(args.par, sigmas=args.sigma, ebn0_db=args.ebn0, semente=args.semente,
+                        processos=args.processos, alvo_erros=args.alvo_erros,
+                        orcamento_bits=args.orcamento_bits, rapido=args.rapido)
+
+    for r in resultados:
+        ponto = f"Eb/N0 = {r['ebn0_db']:6.2f} dB" if "ebn0_db" in r else f"sigma = {r['sigma']:.4f}"
+        inf, sup = r["ber_ic95"]
+        print(f"{ponto}  BER = {r['ber']:.3e} [{inf:.2e}, {sup:.2e}]  SER = {r['ser']:.3e}"
+              f"  ({r['erros_bit']} erros / {r['bits']} bits)")
+
+    if args.csv:
+        salvar_csv(resultados, args.csv)
+    if args.json:
+        salvar_json(resultados, args.json)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,189 @@
+# Simulação rápida no domínio dos símbolos (equivalente em banda base)
+#
+# Em vez de gerar as 50-200 amostras por símbolo da portadora, cada símbolo é
+# representado diretamente pela saída do filtro casado do receptor (um ponto
+# complexo I + jQ). O ruído é somado já filtrado, com a mesma covariância que
+# add_ruido(sigma) teria depois da correlação com os templates, e a decisão é
+# feita pelas mesmas regras de decode_Camadafisica. As estatísticas de erro
+# são as mesmas do caminho com forma de onda, tocando uma amostra por símbolo.
+#
+# O caminho com forma de onda (Camadafisica / decode_Camadafisica) continua
+# sendo o usado para os gráficos.
+
+from functools import lru_cache
+
+import numpy as np
+
+import Camadafisica as fisica
+import decode_Camadafisica as d_fisica
+
+ESQUEMAS = ("ASK", "FSK", "PSK (QPSK)", "16-QAM")
+
+
+def _gerador(rng):
+    # Sem gerador explícito usa o estado global, como add_ruido
+    return np.random if rng is None else rng
+
+
+def _config(config):
+    return fisica.CONFIG_PADRAO if config is None else config
+
+
+def _angulos_portadora(frequencia, config):
+    """
+    Fase de cada amostra dentro de um bit (a partir da fase inicial do bit),
+    igual à acumulada por ask_modulate/fsk_modulate.
+    """
+    incremento = 2 * np.pi * frequencia / config.taxa_amostragem
+    return incremento * np.arange(1, config.amostras_por_bit + 1)
+
+
+def _para_complexo(valores):
+    return valores[:, 0] + 1j * valores[:, 1]
+
+
+def _para_real(simbolos):
+    return np.stack([simbolos.real, simbolos.imag], axis=-1)
+
+
+def _ruido_filtrado(n_simbolos, sigma, templates, rng):
+    """
+    Ruído na saída dos correlatores: se cada amostra tem ruído N(0, sigma²),
+    o vetor de correlações tem covariância sigma² * T Tᵀ (T = templates).
+    """
+    fator = np.linalg.cholesky(templates @ templates.T)
+    ruido = _gerador(rng).standard_normal((n_simbolos, len(templates))) @ fator.T
+    return _para_complexo(sigma * ruido)
+
+
+# ----------------------------------------------------------
+# ASK: o receptor é de energia (não coerente), então o "símbolo" é a
+# energia do bit. Com ruído, a energia segue uma qui-quadrado não central
+# com amostras_por_bit graus de liberdade, sorteada com um número por bit.
+# ----------------------------------------------------------
+
+def _modular_ask(b, config):
+    angulos = _angulos_portadora(config.frequencia_portadora, config)
+    fase_inicial = angulos[-1] * np.arange(len(b))
+
+    # sin²(x) = (1 - cos 2x) / 2, somado sobre as amostras do bit
+    soma_cos = np.sum(np.cos(2 * angulos))
+    soma_sin = np.sum(np.sin(2 * angulos))
+    energia_1 = (len(angulos) - (np.cos(2 * fase_inicial) * soma_cos
+                                 - np.sin(2 * fase_inicial) * soma_sin)) / 2
+    return np.where(b == 1, energia_1, 0.0)
+
+
+def _ruido_ask(energias, sigma, rng, config):
+    graus_de_liberdade = config.amostras_por_bit
+    return sigma**2 * _gerador(rng).noncentral_chisquare(graus_de_liberdade, energias / sigma**2)
+
+
+# ----------------------------------------------------------
+# FSK: a fase é contínua entre bits, então a correlação de cada bit depende
+# da fase acumulada no início dele (uma soma acumulada por símbolo).
+# ----------------------------------------------------------
+
+@lru_cache(maxsize=None)
+def _projecoes_fsk(config):
+    """
+    Para cada bit (0/1), projeções de cos/sin da portadora nos templates:
+    correlação = sin(fase_inicial) * A[b] + cos(fase_inicial) * B[b].
+    """
+    templates = d_fisica.templates_fsk(config)
+    frequencias = (config.frequencia_portadora - config.desvio_fsk,
+                   config.frequencia_portadora + config.desvio_fsk)
+    angulos = np.stack([_angulos_portadora(f, config) for f in frequencias])
+    return np.cos(angulos) @ templates.T, np.sin(angulos) @ templates.T, angulos[:, -1]
+
+
+def _modular_fsk(b, config):
+    A, B, avanco_por_bit = _projecoes_fsk(config)
+    avancos = avanco_por_bit[b]
+    fase_inicial = np.cumsum(avancos) - avancos
+    correlacoes = (np.sin(fase_inicial)[:, np.newaxis] * A[b]
+                   + np.cos(fase_inicial)[:, np.newaxis] * B[b])
+    return _para_complexo(correlacoes)
+
+
+# ----------------------------------------------------------
+# PSK / 16-QAM: o banco de formas de onda correlacionado com os templates
+# dá diretamente a constelação (um ponto por linha do banco).
+# ----------------------------------------------------------
+
+@lru_cache(maxsize=None)
+def _constelacao(esquema, config):
+    banco, templates = _BANCOS[esquema](config)
+    constelacao = _para_complexo(banco @ templates.T)
+    constelacao.flags.writeable = False
+    return constelacao
+
+
+def _modular_por_constelacao(esquema, bits_por_simbolo):
+    def modular(b, config):
+        indices = fisica.bits_para_simbolos(b, bits_por_simbolo)
+        return _constelacao(esquema, config)[indices]
+    return modular
+
+
+_BANCOS = {
+    "PSK (QPSK)": lambda config: (fisica.banco_psk(config), d_fisica.templates_psk(config)),
+    "16-QAM": lambda config: (fisica.banco_qam_16(config), d_fisica.templates_qam_16(config)),
+}
+
+# esquema -> (modulação, templates do receptor, decisão)
+_ESQUEMAS = {
+    "ASK": (_modular_ask, None, d_fisica.decisao_ask),
+    "FSK": (_modular_fsk, d_fisica.templates_fsk, d_fisica.decisao_fsk),
+    "PSK (QPSK)": (_modular_por_constelacao("PSK (QPSK)", 2), d_fisica.templates_psk, d_fisica.decisao_psk),
+    "16-QAM": (_modular_por_constelacao("16-QAM", 4), d_fisica.templates_qam_16, d_fisica.decisao_qam_16),
+}
+
+
+def _esquema(esquema):
+    if esquema not in _ESQUEMAS:
+        raise ValueError(f"Esquema desconhecido: {esquema!r}. Opções: {', '.join(ESQUEMAS)}")
+    return _ESQUEMAS[esquema]
+
+
+def modular_simbolos(bits, esquema, config=None):
+    """
+    Mapeia os bits direto para as saídas sem ruído do filtro casado:
+    pontos complexos I + jQ (FSK, PSK, 16-QAM) ou energias por bit (ASK).
+    """
+    modular, _, _ = _esquema(esquema)
+    return modular(fisica.bits_para_array(bits), _config(config))
+
+
+def adicionar_ruido_simbolos(simbolos, sigma, esquema, rng=None, config=None):
+    """
+    Equivalente, no domínio dos símbolos, a add_ruido(sinal, sigma)
+    seguido da correlação feita pelo receptor.
+    """
+    _, templates, _ = _esquema(esquema)
+    config = _config(config)
+    if sigma <= 0:
+        return simbolos
+    if templates is None:
+        return _ruido_ask(simbolos, sigma, rng, config)
+    return simbolos + _ruido_filtrado(len(simbolos), sigma, templates(config), rng)
+
+
+def demodular_simbolos(observacoes, esquema, config=None):
+    """
+    Aplica a mesma regra de decisão do demodulador com forma de onda.
+    """
+    _, templates, decisao = _esquema(esquema)
+    if templates is None:
+        return decisao(observacoes, config)
+    return decisao(_para_real(observacoes), config)
+
+
+def simular_simbolos(bits, esquema, sigma, rng=None, config=None):
+    """
+    Modulação + canal AWGN + demodulação, um valor por símbolo.
+    Devolve os bits decididos (com o mesmo padding dos demoduladores).
+    """
+    simbolos = modular_simbolos(bits, esquema, config)
+    observacoes = adicionar_ruido_simbolos(simbolos, sigma, esquema, rng, config)
+    return demodular_simbolos(observacoes, esquema, config)
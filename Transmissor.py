@@ -1,17 +1,23 @@
+import itertools
+import threading
 import time
-from bitarray import bitarray
 import socket
 
+import Protocolo as protocolo
+from AnelCompartilhado import AnelCompartilhado
+
+
 def startServer(message, host='127.0.0.1', port=12345, maximo_de_tentativas=3):
     """
-    Envia uma sequência de bits para um servidor TCP.
+    Envia uma sequência de bits (bitarray ou lista de bits) para um servidor TCP.
     Realiza múltiplas tentativas caso o servidor não esteja disponível.
     """
 
-    bit_data = bitarray() #Transforma array de bits em dados
-    bit_data.extend(message)
-    byte_array = bit_data.tobytes()
-    
+    # bitarray já está empacotado: envia o buffer direto, sem cópia bit a bit,
+    # precedido do cabeçalho com o tamanho (ver Protocolo)
+    tipo, partes = protocolo.partes_bits(message)
+    byte_array = b"".join(protocolo.mensagem(tipo, partes))
+
     # Loop de tentativas de conexão
     for tentativa in range(maximo_de_tentativas):
         try: # Cria o socket dentro do bloco 'with' para fechar automaticamente
@@ -24,4 +30,233 @@ def startServer(message, host='127.0.0.1', port=12345, maximo_de_tentativas=3):
             print(f"Tentativa {tentativa + 1}/{maximo_de_tentativas} - Servidor com ero...")
             time.sleep(1)
     print("Não foi possível estabelecer conexão após todas as tentativas.")
-    return False
\ No newline at end of file
+    return False
+
+# ==========================================================
+# TRANSMISSOR COM CONEXÕES PERSISTENTES
+# Em vez de abrir uma conexão por mensagem, mantém um pequeno conjunto de
+# conexões abertas e manda as mensagens (com o cabeçalho de tamanho do
+# Protocolo) uma atrás da outra. Cabeçalho e corpo, e várias mensagens
+# pequenas, saem juntos em um único sendmsg (scatter-gather), sem juntar
+# os buffers em Python. Se a conexão cai, reconecta com espera exponencial
+# limitada e reenvia só as mensagens que não foram escritas por inteiro.
+#
+# Entrega: cada thread fica presa a uma conexão, então as mensagens de uma
+# mesma thread chegam na ordem em que foram enviadas (threads diferentes
+# não têm ordem entre si). Nada é enviado duas vezes; como o TCP não
+# confirma para a aplicação, uma mensagem já escrita inteira no socket
+# pode se perder se a conexão cair antes de ela chegar.
+# Com mais de uma conexão o receptor precisa atender conexões simultâneas
+# (Receptor.ReceiverAsync); o Receiver com threads atende uma por vez.
+# ==========================================================
+
+IOV_MAXIMO = 1024   # máximo de buffers por sendmsg (IOV_MAX do Linux)
+
+
+def _envia_tudo(sock, partes):
+    """
+    Envia todas as partes com sendmsg, repetindo até o último byte
+    (sendmsg pode enviar só uma parte dos dados).
+    Devolve (bytes enviados, erro): 'erro' é o OSError que interrompeu o
+    envio, ou None se tudo foi enviado.
+    """
+    pendentes = [memoryview(p).cast('B') for p in partes]
+    total = 0
+    try:
+        if not hasattr(sock, 'sendmsg'):   # Windows: sem scatter-gather
+            for parte in pendentes:
+                sock.sendall(parte)
+                total += len(parte)
+            return total, None
+        inicio = 0
+        while inicio < len(pendentes):
+            enviados = sock.sendmsg(pendentes[inicio:inicio + IOV_MAXIMO])
+            total += enviados
+            # avança pelos buffers já enviados por inteiro e corta o parcial
+            while inicio < len(pendentes) and enviados >= len(pendentes[inicio]):
+                enviados -= len(pendentes[inicio])
+                inicio += 1
+            if enviados:
+                pendentes[inicio] = pendentes[inicio][enviados:]
+    except OSError as e:
+        return total, e
+    return total, None
+
+
+def _mensagens_completas(mensagens, enviados):
+    """
+    Quantas mensagens (listas de partes) cabem inteiras nos primeiros 'enviados' bytes.
+    """
+    completas = 0
+    for partes in mensagens:
+        tamanho = sum(memoryview(p).nbytes for p in partes)
+        if tamanho > enviados:
+            break
+        enviados -= tamanho
+        completas += 1
+    return completas
+
+
+class _Conexao:
+    def __init__(self):
+        self.sock = None
+        self.trava = threading.Lock()
+
+
+class _InterfaceEnvio:
+    """
+    Envio comum a todos os transportes: as subclasses só implementam
+    envia_quadros(quadros) e fechar().
+    """
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *excecao):
+        self.fechar()
+
+    def envia(self, message):
+        """
+        Envia uma sequência de bits (bitarray ou lista de bits).
+        """
+        self.envia_quadros([protocolo.partes_bits(message)])
+
+    def envia_varios(self, mensagens):
+        """
+        Envia várias sequências de bits de uma vez, em uma única escrita.
+        """
+        self.envia_quadros([protocolo.partes_bits(m) for m in mensagens])
+
+    def envia_amostras(self, sinal, modulacao, n_bits, bits_quantizacao=8, config=None):
+        """
+        Envia a forma de onda modulada (quantizada em 8 ou 16 bits) para o
+        receptor demodular do outro lado. 'n_bits' é quantos bits o sinal carrega
+        e 'config' a ModemConfig da modulação (vai junto, no cabeçalho).
+        """
+        self.envia_quadros([protocolo.partes_amostras(sinal, modulacao, n_bits, bits_quantizacao, config)])
+
+    def envia_amostras_brutas(self, sinal, modulacao, n_bits, config=None):
+        """
+        Envia a forma de onda sem quantização (float32/float64 exatos). Feito
+        para a memória compartilhada, onde as amostras são copiadas uma vez
+        para o anel e o receptor demodula direto de lá.
+        """
+        self.envia_quadros([protocolo.partes_amostras_brutas(sinal, modulacao, n_bits, config)])
+
+
+class Transmitter(_InterfaceEnvio):
+    def __init__(self, host='127.0.0.1', port=12345, conexoes=1, maximo_de_tentativas=6,
+                 espera_inicial=0.05, espera_maxima=2.0):
+        """
+        'conexoes' conexões ficam abertas e são repartidas entre as threads que
+        enviam (uma thread sempre usa a mesma).
+        """
+        self.host = host
+        self.port = port
+        self.maximo_de_tentativas = maximo_de_tentativas
+        self.espera_inicial = espera_inicial
+        self.espera_maxima = espera_maxima
+        self._conexoes = [_Conexao() for _ in range(conexoes)]
+        self._proxima = itertools.cycle(self._conexoes)
+        self._local = threading.local()   # conexão de cada thread
+
+    def fechar(self):
+        for conexao in self._conexoes:
+            with conexao.trava:
+                if conexao.sock is not None:
+                    conexao.sock.close()
+                    conexao.sock = None
+
+    def envia_quadros(self, quadros):
+        """
+        Envia quadros (tipo, partes do corpo) em sequência pela conexão da
+        thread que chama. Se a conexão cai, reenvia a partir do primeiro quadro
+        que não foi escrito por inteiro. Levanta ConnectionError se não
+        conseguir depois de 'maximo_de_tentativas' tentativas.
+        """
+        mensagens = [protocolo.mensagem(tipo, corpo) for tipo, corpo in quadros]
+        conexao = self._conexao_da_thread()
+        with conexao.trava:
+            for tentativa in range(self.maximo_de_tentativas):
+                try:
+                    if conexao.sock is None:
+                        conexao.sock = self._conecta()
+                except OSError as e:
+                    erro = e
+                else:
+                    enviados, erro = _envia_tudo(conexao.sock, [p for partes in mensagens for p in partes])
+                    if erro is None:
+                        return
+                    # o quadro interrompido chegou pela metade e o receptor o descarta
+                    mensagens = mensagens[_mensagens_completas(mensagens, enviados):]
+                if conexao.sock is not None:
+                    conexao.sock.close()
+                    conexao.sock = None
+                print(f"Tentativa {tentativa + 1}/{self.maximo_de_tentativas} falhou: {erro}")
+                if tentativa + 1 < self.maximo_de_tentativas:
+                    time.sleep(min(self.espera_maxima, self.espera_inicial * 2 ** tentativa))
+        raise ConnectionError(f"Não foi possível enviar para {self.host}:{self.port} "
+                              f"após {self.maximo_de_tentativas} tentativas.")
+
+    def _conexao_da_thread(self):
+        # cada thread usa sempre a mesma conexão (distribuídas em rodízio),
+        # para as mensagens dela não se ultrapassarem em conexões diferentes
+        conexao = getattr(self._local, 'conexao', None)
+        if conexao is None:
+            conexao = self._local.conexao = next(self._proxima)
+        return conexao
+
+    def _conecta(self):
+        sock = socket.create_connection((self.host, self.port))
+        # a junção das escritas pequenas já é feita aqui (sendmsg), sem esperar o Nagle
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        return sock
+
+
+# ==========================================================
+# TRANSMISSOR POR MEMÓRIA COMPARTILHADA
+# Mesma interface do Transmitter, para transmissor e receptor na mesma
+# máquina: cada quadro (com o cabeçalho do Protocolo) é copiado direto no
+# anel compartilhado criado pelo receptor (Receptor.ReceiverMemoria), sem
+# socket nem chamadas ao kernel por quadro.
+# ==========================================================
+
+class TransmitterMemoria(_InterfaceEnvio):
+    def __init__(self, nome, timeout=None):
+        """
+        'nome' é o nome do anel (ReceiverMemoria.nome). Com o anel cheio o envio
+        espera o receptor; 'timeout' limita essa espera (TimeoutError).
+        O anel tem um único produtor: envios de várias threads deste objeto
+        são serializados por uma trava (como no Transmitter); outro
+        transmissor no mesmo anel não pode ser usado ao mesmo tempo.
+        """
+        self.anel = AnelCompartilhado(nome, criar=False)
+        self.timeout = timeout
+        self._trava = threading.Lock()
+
+    def fechar(self):
+        with self._trava:
+            self.anel.fechar()
+
+    def envia_quadros(self, quadros):
+        with self._trava:
+            for tipo, corpo in quadros:
+                self.anel.escreve(protocolo.mensagem(tipo, corpo), self.timeout)
+
+
+# nome -> classe do transmissor (todas com envia, envia_varios, envia_amostras,
+# envia_amostras_brutas, fechar)
+TRANSPORTES = {
+    "TCP": Transmitter,
+    "Memória compartilhada": TransmitterMemoria,
+}
+
+
+def cria_transmissor(transporte="TCP", **opcoes):
+    """
+    Transmissor do transporte escolhido; 'opcoes' vão para o construtor
+    (host/port para TCP, nome do anel para memória compartilhada).
+    """
+    if transporte not in TRANSPORTES:
+        raise ValueError(f"Transporte desconhecido: {transporte!r}. Opções: {', '.join(TRANSPORTES)}")
+    return TRANSPORTES[transporte](**opcoes)
@@ -0,0 +1,540 @@
+# Benchmarks de desempenho do simulador
+# Uso: python3 ./benchmark.py [nome_do_benchmark ...]
+# Sem argumentos, roda todos os benchmarks registrados em BENCHMARKS.
+
+import contextlib
+import io
+import multiprocessing
+import os
+import sys
+import threading
+import time
+import tracemalloc
+
+import numpy as np
+
+import CamadaEnlace as enlace
+import decode_CamadaEnlace as d_enlace
+import Segmentacao as segmentacao
+import Camadafisica as fisica
+import Protocolo as protocolo
+import Receptor as receptor
+import Transmissor as transmissor
+import decode_Camadafisica as d_fisica
+
+
+def medir(funcao, *args, repeticoes=5):
+    """
+    Executa a função algumas vezes e devolve o melhor tempo (em segundos).
+    O melhor tempo é o menos afetado por ruído do sistema operacional.
+    """
+    melhor = float('inf')
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        funcao(*args)
+        melhor = min(melhor, time.perf_counter() - inicio)
+    return melhor
+
+
+def imprimir_comparacao(nome, unidade, quantidade, tempo_antes, tempo_depois):
+    """
+    Imprime a vazão antes/depois e o ganho obtido.
+    """
+    print(f"{nome:<24} antes: {quantidade / tempo_antes:>14,.0f} {unidade}/s"
+          f"   depois: {quantidade / tempo_depois:>14,.0f} {unidade}/s"
+          f"   ganho: {tempo_antes / tempo_depois:6.1f}x")
+
+
+# ==========================================================
+# Implementações antigas (laço amostra a amostra), para comparação
+# ==========================================================
+
+def _ask_modulate_laco(bits):
+    sinal = []
+    dt = 1 / fisica.TAXA_DE_AMOSTRAGEM
+    fase = 0.0
+    for b in bits:
+        for _ in range(fisica.AMOSTRAS_POR_BIT):
+            fase += 2 * np.pi * fisica.FREEQUENCIA_PORTADORA * dt
+            if b == 1:
+                sinal.append(np.sin(fase))
+            else:
+                sinal.append(0.0)
+    return np.array(sinal)
+
+
+def _fsk_modulate_laco(bits):
+    sinal = []
+    frequencia_desvio = 2000
+    dt = 1 / fisica.TAXA_DE_AMOSTRAGEM
+    fase = 0.0
+    for b in bits:
+        if b == 1:
+            f = fisica.FREEQUENCIA_PORTADORA + frequencia_desvio
+        else:
+            f = fisica.FREEQUENCIA_PORTADORA - frequencia_desvio
+        for _ in range(fisica.AMOSTRAS_POR_BIT):
+            fase += 2 * np.pi * f * dt
+            sinal.append(np.sin(fase))
+    return np.array(sinal)
+
+
+def _calculate_crc_remainder_bit_a_bit(data_with_padding):
+    temp = data_with_padding.copy()
+    for i in range(len(temp) - enlace.CRC32_DEGREE):
+        if temp[i] == 1:
+            for j in range(len(enlace.CRC32_POLY)):
+                temp[i+j] ^= enlace.CRC32_POLY[j]
+    return temp[-enlace.CRC32_DEGREE:]
+
+
+def _hamming_dinamico_laco(bit_stream):
+    encoded = []
+    idx = 0
+    L = len(bit_stream)
+    while idx < L:
+        n, k, p = next((c for c in enlace.HAMMING_CONFIGS if c[1] <= L - idx), (7, 4, 3))
+        data_bits = bit_stream[idx : idx + k]
+        idx += len(data_bits)
+        data_bits = data_bits + [0] * (k - len(data_bits))
+        block = [None] * (n + 1)
+        parity_positions = [2 ** i for i in range(p)]
+        data_idx = 0
+        for pos in range(1, n + 1):
+            if pos not in parity_positions:
+                block[pos] = data_bits[data_idx]
+                data_idx += 1
+        for parity_pos in parity_positions:
+            xor_sum = 0
+            for pos in range(1, n + 1):
+                if pos & parity_pos and block[pos] is not None:
+                    xor_sum ^= block[pos]
+            block[parity_pos] = xor_sum
+        encoded.extend(block[1:])
+    return encoded
+
+
+def _bit_insertion_laco(bit_stream):
+    stuffed = []
+    ones = 0
+    for bit in bit_stream:
+        stuffed.append(bit)
+        if bit == 1:
+            ones += 1
+            if ones == 5:
+                stuffed.append(0)
+                ones = 0
+        else:
+            ones = 0
+    return enlace.FLAG_SEQUENCE + stuffed + enlace.FLAG_SEQUENCE
+
+
+def _remove_bit_insertion_laco(bits):
+    res = []
+    ones = 0
+    for b in bits[8:len(bits)-8]:
+        if b == 1:
+            res.append(1)
+            ones += 1
+        else:
+            if ones == 5:
+                ones = 0
+                continue
+            res.append(0)
+            ones = 0
+    return res
+
+
+def _byte_insertion_laco(bit_stream):
+    stuffed = []
+    for i in range(0, len(bit_stream), 8):
+        byte = bit_stream[i:i+8]
+        if len(byte) < 8:
+            byte += [0] * (8 - len(byte))
+        if byte == enlace.FLAG_SEQUENCE or byte == enlace.ESCAPE_CHAR:
+            stuffed += enlace.ESCAPE_CHAR + byte
+        else:
+            stuffed += byte
+    return enlace.FLAG_SEQUENCE + stuffed + enlace.FLAG_SEQUENCE
+
+
+def _demodulate_qam_16_laco(sinal_com_ruido):
+    # templates e mapas refeitos a cada símbolo e decisão por laço de distâncias
+    bits = []
+    amostras_por_simbolo = int(4 * d_fisica.AMOSTRAS_POR_BIT)
+    tempo_simbolo = 4 * d_fisica.TEMPO_BIT
+    t = np.linspace(0, tempo_simbolo, amostras_por_simbolo)
+    QAM_16_MAP = {
+        '0000': (-3, -3), '0001': (-3, -1), '0100': (-1, -3), '0101': (-1, -1),
+        '0010': (-3,  3), '0011': (-3,  1), '0110': (-1,  3), '0111': (-1,  1),
+        '1000': ( 3, -3), '1001': ( 3, -1), '1100': ( 1, -3), '1101': ( 1, -1),
+        '1010': ( 3,  3), '1011': ( 3,  1), '1110': ( 1,  3), '1111': ( 1,  1),
+    }
+    REVERSE_MAP = {valor: chave for chave, valor in QAM_16_MAP.items()}
+    IDEAL_LEVELS = [-3, -1, 1, 3]
+
+    def achar_valor(valor, levels):
+        match = None
+        diff_minima = float('inf')
+        for level in levels:
+            diff = abs(valor - level)
+            if diff < diff_minima:
+                diff_minima = diff
+                match = level
+        return match
+
+    for i in range(0, len(sinal_com_ruido), amostras_por_simbolo):
+        chunk = sinal_com_ruido[i : i + amostras_por_simbolo]
+        if len(chunk) < amostras_por_simbolo:
+            break
+        template_I = np.cos(2 * np.pi * d_fisica.FREEQUENCIA_PORTADORA * t)
+        template_Q = -np.sin(2 * np.pi * d_fisica.FREEQUENCIA_PORTADORA * t)
+        energia_referencia = np.sum(template_I ** 2)
+        valor_I = np.sum(chunk * template_I) / energia_referencia * d_fisica.NORM_QAM
+        valor_Q = np.sum(chunk * template_Q) / energia_referencia * d_fisica.NORM_QAM
+        bits_string = REVERSE_MAP.get((achar_valor(valor_I, IDEAL_LEVELS), achar_valor(valor_Q, IDEAL_LEVELS)), '0000')
+        bits.extend(int(b) for b in bits_string)
+    return np.array(bits)
+
+
+# ==========================================================
+# Benchmarks
+# ==========================================================
+
+def bench_ask_fsk(n_bits=2000):
+    """
+    Modulação ASK/FSK: laço com np.sin por amostra vs. fase acumulada vetorizada.
+    """
+    bits = np.random.default_rng(0).integers(0, 2, n_bits).tolist()
+    n_amostras = n_bits * fisica.AMOSTRAS_POR_BIT
+
+    for nome, antes, depois in (("ASK", _ask_modulate_laco, fisica.ask_modulate),
+                                ("FSK", _fsk_modulate_laco, fisica.fsk_modulate)):
+        assert np.array_equal(antes(bits), depois(bits))
+        tempo_antes = medir(antes, bits, repeticoes=1)
+        tempo_depois = medir(depois, bits)
+        imprimir_comparacao(nome, "amostras", n_amostras, tempo_antes, tempo_depois)
+
+
+def bench_qam(n_simbolos=10_000, sigma=0.3):
+    """
+    Demodulação 16-QAM (com ruído): laço por símbolo vs. correlação em matriz e slicer vetorizado.
+    """
+    rng = np.random.default_rng(0)
+    bits = rng.integers(0, 2, 4 * n_simbolos, dtype=np.uint8)
+    sinal = fisica.add_ruido(fisica.qam_16(bits), sigma, rng)
+
+    assert np.array_equal(_demodulate_qam_16_laco(sinal), d_fisica.demodulate_qam_16(sinal))
+    tempo_antes = medir(_demodulate_qam_16_laco, sinal, repeticoes=1)
+    tempo_depois = medir(d_fisica.demodulate_qam_16, sinal, repeticoes=20)
+    imprimir_comparacao("16-QAM (RX)", "símbolos", n_simbolos, tempo_antes, tempo_depois)
+
+
+def bench_crc(n_bits=200_000):
+    """
+    CRC-32: divisão polinomial bit a bit vs. tabelas (slicing-by-8).
+    """
+    bits = np.random.default_rng(0).integers(0, 2, n_bits).tolist()
+    quadro = bits + [0] * enlace.CRC32_DEGREE
+
+    assert _calculate_crc_remainder_bit_a_bit(quadro) == enlace.calculate_crc_remainder(quadro)
+    tempo_antes = medir(_calculate_crc_remainder_bit_a_bit, quadro, repeticoes=1)
+    tempo_depois = medir(enlace.calculate_crc_remainder, quadro)
+    imprimir_comparacao("CRC-32", "bits", n_bits, tempo_antes, tempo_depois)
+
+
+def bench_hamming(n_bits=100_000):
+    """
+    Hamming: bloco a bloco com listas vs. corridas de blocos com matrizes G/H.
+    """
+    bits = np.random.default_rng(0).integers(0, 2, n_bits).tolist()
+    codificado = enlace.hamming_dinamico(bits)
+
+    assert _hamming_dinamico_laco(bits) == codificado
+    tempo_antes = medir(_hamming_dinamico_laco, bits, repeticoes=1)
+    tempo_depois = medir(enlace.hamming_dinamico, bits)
+    imprimir_comparacao("Hamming (TX)", "bits", n_bits, tempo_antes, tempo_depois)
+
+    empacotado = enlace.para_bitarray(np.array(codificado))
+    tempo = medir(enlace.corrige_hamming, empacotado)
+    print(f"{'Hamming (RX)':<24} {len(codificado) / tempo:>14,.0f} bits/s")
+
+
+def bench_bit_stuffing(n_bits=1_000_000):
+    """
+    Bit stuffing: contador bit a bit vs. varredura vetorizada das corridas de uns.
+    """
+    # bits com muitos uns, para que haja bastante stuffing
+    bits = (np.random.default_rng(0).random(n_bits) < 0.8).astype(np.uint8)
+    lista = bits.tolist()
+    empacotado = enlace.para_bitarray(bits)
+    quadro = enlace.bit_insertion(empacotado)
+
+    assert _bit_insertion_laco(lista) == quadro.tolist()
+    assert _remove_bit_insertion_laco(quadro.tolist()) == d_enlace.remove_bit_insertion(quadro).tolist()
+    tempo_antes = medir(_bit_insertion_laco, lista, repeticoes=1)
+    tempo_depois = medir(enlace.bit_insertion, empacotado)
+    imprimir_comparacao("Bit stuffing", "bits", n_bits, tempo_antes, tempo_depois)
+
+    lista_quadro = quadro.tolist()
+    tempo_antes = medir(_remove_bit_insertion_laco, lista_quadro, repeticoes=1)
+    tempo_depois = medir(d_enlace.remove_bit_insertion, quadro)
+    imprimir_comparacao("Bit destuffing", "bits", len(quadro), tempo_antes, tempo_depois)
+
+
+def bench_byte_stuffing(n_bytes=1_000_000):
+    """
+    Byte stuffing: fatias de 8 bits comparadas com listas vs. operações sobre bytes.
+    """
+    dados = np.random.default_rng(0).integers(0, 256, n_bytes, dtype=np.uint8).tobytes()
+    quadro = enlace.enquadra_bytes(dados)
+    assert d_enlace.desescapa_bytes(quadro[1:-1]) == dados
+
+    lista = np.unpackbits(np.frombuffer(dados[:n_bytes // 20], dtype=np.uint8)).tolist()
+    assert _byte_insertion_laco(lista) == enlace.byte_insertion(lista)
+    tempo_antes = medir(_byte_insertion_laco, lista, repeticoes=1)
+    tempo_depois = medir(enlace.byte_insertion, lista)
+    imprimir_comparacao("Byte stuffing (listas)", "bytes", len(lista) // 8, tempo_antes, tempo_depois)
+
+    for nome, funcao, entrada in (("escapa_bytes", enlace.escapa_bytes, dados),
+                                  ("desescapa_bytes", d_enlace.desescapa_bytes, quadro[1:-1])):
+        tempo = medir(funcao, entrada)
+        print(f"{nome:<24} {len(entrada) / tempo / 1e6:>10,.0f} MB/s")
+
+
+def bench_checksum(n_bytes=4_000_000):
+    """
+    Detecção de erros em volume: CRC-32 (tabelas) vs. checksum de 16 bits (numpy).
+    """
+    dados = np.random.default_rng(0).integers(0, 256, n_bytes, dtype=np.uint8).tobytes()
+    tempo_antes = medir(enlace.crc32_bytes, dados, repeticoes=1)
+    tempo_depois = medir(enlace.checksum_bytes, dados)
+    imprimir_comparacao("CRC-32 -> Checksum", "bytes", n_bytes, tempo_antes, tempo_depois)
+
+
+def _ida_e_volta_segmentada(bits, processos):
+    quadros = segmentacao.codifica_quadros(bits, "FLAG + Inserção de bits", "CRC-32",
+                                           tamanho_quadro=8192, processos=processos)
+    return segmentacao.decodifica_quadros(quadros, "FLAG + Inserção de bits", "CRC-32",
+                                          tamanho_quadro=8192, processos=processos)[0]
+
+
+def bench_segmentacao(n_bits=4_000_000):
+    """
+    Segmentação em quadros (bit stuffing + CRC-32): 1 processo vs. um por núcleo.
+    """
+    bits = enlace.para_bitarray(np.random.default_rng(0).integers(0, 2, n_bits, dtype=np.uint8))
+    processos = os.cpu_count()
+
+    assert _ida_e_volta_segmentada(bits, processos) == bits
+    tempo_antes = medir(_ida_e_volta_segmentada, bits, 1, repeticoes=1)
+    tempo_depois = medir(_ida_e_volta_segmentada, bits, processos, repeticoes=1)
+    imprimir_comparacao(f"Segmentação ({processos} proc.)", "bits", n_bits, tempo_antes, tempo_depois)
+
+
+def pico_memoria(funcao, *args):
+    """
+    Pico de memória alocada (em bytes) durante uma chamada da função.
+    """
+    tracemalloc.start()
+    try:
+        funcao(*args)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def _enlace_tx(texto, empacotado):
+    # texto -> bits -> contagem de caracteres -> CRC-32, como no transmissor da GUI
+    bits = enlace.convert_to_bitarray(texto) if empacotado else enlace.convert_to_bytes(texto)
+    return enlace.prepara_CRC_para_transmissao(enlace.character_count(bits, header_bits=32))
+
+
+def bench_bits_empacotados(n_caracteres=200_000):
+    """
+    Camada de enlace (TX) com lista de ints vs. bitarray: tempo e pico de memória.
+    """
+    texto = "".join(np.random.default_rng(0).choice(list("abcdefgh"), n_caracteres))
+    n_bits = 8 * n_caracteres
+
+    assert _enlace_tx(texto, False) == _enlace_tx(texto, True).tolist()
+    tempo_antes = medir(_enlace_tx, texto, False, repeticoes=3)
+    tempo_depois = medir(_enlace_tx, texto, True)
+    imprimir_comparacao("Enlace TX", "bits", n_bits, tempo_antes, tempo_depois)
+
+    memoria_antes = pico_memoria(_enlace_tx, texto, False)
+    memoria_depois = pico_memoria(_enlace_tx, texto, True)
+    print(f"{'Memória (pico)':<24} antes: {memoria_antes / n_bits:>10.2f} bytes/bit"
+          f"   depois: {memoria_depois / n_bits:>10.2f} bytes/bit"
+          f"   ganho: {memoria_antes / memoria_depois:6.1f}x")
+
+
+def _fsk_por_mensagem(mensagens, config):
+    return [d_fisica.decode_fsk_modulate(fisica.fsk_modulate(m, config), config) for m in mensagens]
+
+
+def _fsk_em_lote(mensagens, config):
+    return d_fisica.decode_fsk_modulate_lote(fisica.fsk_modulate_lote(mensagens, config=config), config=config)
+
+
+def bench_lote(n_mensagens=5000, n_bits=32):
+    """
+    Muitas mensagens curtas (FSK ida e volta): laço por mensagem vs. uma matriz de lote.
+    """
+    config = fisica.ModemConfig(frequencia_portadora=2000, taxa_amostragem=8000, desvio_fsk=1000)
+    mensagens = np.random.default_rng(0).integers(0, 2, (n_mensagens, n_bits), dtype=np.uint8)
+
+    assert np.array_equal(np.array(_fsk_por_mensagem(mensagens, config)), _fsk_em_lote(mensagens, config))
+    tempo_antes = medir(_fsk_por_mensagem, mensagens, config, repeticoes=1)
+    tempo_depois = medir(_fsk_em_lote, mensagens, config)
+    imprimir_comparacao("FSK em lote", "mensagens", n_mensagens, tempo_antes, tempo_depois)
+
+
+def _envia_e_espera(servidor, envio, n_mensagens):
+    # o tempo conta até o receptor ter decodificado todas as mensagens
+    inicial = servidor.quadros_recebidos
+    envio()
+    while servidor.quadros_recebidos < inicial + n_mensagens:
+        time.sleep(0.001)
+
+
+def bench_transmissor(n_mensagens=2000, n_bits=256, porta=12421):
+    """
+    Loopback TCP: uma conexão por mensagem (startServer) vs. conexões persistentes
+    (Transmitter), mensagem a mensagem e em lotes com sendmsg.
+    """
+    rng = np.random.default_rng(0)
+    mensagens = [enlace.para_bitarray(rng.integers(0, 2, n_bits, dtype=np.uint8)) for _ in range(n_mensagens)]
+    servidor = receptor.ReceiverAsync(tratar=lambda endereco, bits: None)
+    threading.Thread(target=servidor.TCPServer, kwargs=dict(port=porta), daemon=True).start()
+    servidor.pronto.wait()
+    if servidor.erro is not None:
+        raise servidor.erro
+
+    tx = transmissor.Transmitter(port=porta)
+
+    def uma_conexao_por_mensagem():
+        for m in mensagens:
+            transmissor.startServer(m, port=porta)
+
+    def conexao_persistente():
+        for m in mensagens:
+            tx.envia(m)
+
+    def persistente_em_lote():
+        tx.envia_varios(mensagens)
+
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            tempo_antes = medir(_envia_e_espera, servidor, uma_conexao_por_mensagem, n_mensagens, repeticoes=1)
+            tempo_persistente = medir(_envia_e_espera, servidor, conexao_persistente, n_mensagens, repeticoes=3)
+            tempo_lote = medir(_envia_e_espera, servidor, persistente_em_lote, n_mensagens, repeticoes=3)
+    finally:
+        tx.fechar()
+        servidor.encerrar()
+
+    imprimir_comparacao("Conexão persistente", "mensagens", n_mensagens, tempo_antes, tempo_persistente)
+    imprimir_comparacao("Persistente + sendmsg", "mensagens", n_mensagens, tempo_antes, tempo_lote)
+
+
+def bench_forma_de_onda(n_bits=20_000, sigma=1.5):
+    """
+    Forma de onda FSK no fio: float64 vs. quantizada em int16/int8 (bytes por amostra e BER),
+    e o registro bruto sem quantização.
+    """
+    rng = np.random.default_rng(0)
+    bits = rng.integers(0, 2, n_bits, dtype=np.uint8)
+    sinal = fisica.add_ruido(fisica.fsk_modulate(bits), sigma, rng)
+    ber = np.mean(d_fisica.decode_fsk_modulate(sinal)[:n_bits] != bits)
+    print(f"{'float64':<24} {sinal.nbytes / len(sinal):>6.2f} bytes/amostra   BER: {ber:.4f}")
+
+    for bits_quantizacao in (16, 8):
+        tipo, partes = protocolo.partes_amostras(sinal, "FSK", n_bits, bits_quantizacao)
+        corpo = b"".join(partes)
+        recebidos = receptor.decodifica_quadro(tipo, corpo)
+        ber = np.mean(np.frombuffer(recebidos.unpack(), dtype=np.uint8) != bits)
+        print(f"{f'int{bits_quantizacao}':<24} {len(corpo) / len(sinal):>6.2f} bytes/amostra   BER: {ber:.4f}"
+              f"   ({sinal.nbytes / len(corpo):.1f}x menos bytes)")
+
+    # registro bruto (memória compartilhada): as mesmas amostras, sem perda
+    tipo, partes = protocolo.partes_amostras_brutas(sinal, "FSK", n_bits)
+    corpo = b"".join(partes)
+    recebidos = receptor.decodifica_quadro(tipo, corpo)
+    ber = np.mean(np.frombuffer(recebidos.unpack(), dtype=np.uint8) != bits)
+    print(f"{'float64 (bruto)':<24} {len(corpo) / len(sinal):>6.2f} bytes/amostra   BER: {ber:.4f}")
+
+
+def _produtor_quadros(transporte, opcoes, n_quadros, n_bits):
+    # roda em outro processo: envia os quadros pelo transporte escolhido
+    bits = enlace.para_bitarray(np.random.default_rng(0).integers(0, 2, n_bits, dtype=np.uint8))
+    with contextlib.redirect_stdout(io.StringIO()), transmissor.cria_transmissor(transporte, **opcoes) as tx:
+        for _ in range(n_quadros):
+            tx.envia(bits)
+
+
+def _tempo_recepcao(rx, transporte, opcoes, n_quadros, n_bits):
+    """
+    Tempo para receber e decodificar 'n_quadros' quadros de outro processo,
+    contado a partir do primeiro quadro (sem a criação do processo).
+    """
+    produtor = multiprocessing.Process(target=_produtor_quadros,
+                                       args=(transporte, opcoes, n_quadros + 1, n_bits))
+    produtor.start()
+    rx.recebe(timeout=30)
+    inicio = time.perf_counter()
+    for _ in range(n_quadros):
+        rx.recebe(timeout=30)
+    tempo = time.perf_counter() - inicio
+    produtor.join()
+    return tempo
+
+
+def bench_memoria_compartilhada(porta=12422):
+    """
+    Quadros de um processo TX para um processo RX na mesma máquina:
+    TCP em loopback vs. anel em memória compartilhada.
+    """
+    tcp = receptor.Receiver(tamanho_fila=256)
+    threading.Thread(target=tcp.TCPServer, kwargs=dict(port=porta), daemon=True).start()
+    anel = receptor.ReceiverMemoria(capacidade=16 * 1024 * 1024)
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            time.sleep(0.2)   # espera o servidor TCP começar a escutar
+            tempos = []
+            for n_bytes, n_quadros in ((256, 50_000), (8192, 4000), (131072, 2000)):
+                tempo_antes = _tempo_recepcao(tcp, "TCP", dict(port=porta), n_quadros, 8 * n_bytes)
+                tempo_depois = _tempo_recepcao(anel, "Memória compartilhada", dict(nome=anel.nome),
+                                               n_quadros, 8 * n_bytes)
+                tempos.append((n_bytes, n_quadros, tempo_antes, tempo_depois))
+    finally:
+        tcp.encerrar()
+        anel.encerrar()
+    for n_bytes, n_quadros, tempo_antes, tempo_depois in tempos:
+        imprimir_comparacao(f"Anel ({n_bytes} B/quadro)", "quadros", n_quadros, tempo_antes, tempo_depois)
+
+
+BENCHMARKS = {
+    'ask_fsk': bench_ask_fsk,
+    'qam': bench_qam,
+    'crc': bench_crc,
+    'hamming': bench_hamming,
+    'bit_stuffing': bench_bit_stuffing,
+    'byte_stuffing': bench_byte_stuffing,
+    'segmentacao': bench_segmentacao,
+    'checksum': bench_checksum,
+    'bits_empacotados': bench_bits_empacotados,
+    'lote': bench_lote,
+    'transmissor': bench_transmissor,
+    'forma_de_onda': bench_forma_de_onda,
+    'memoria_compartilhada': bench_memoria_compartilhada,
+}
+
+
+def main(nomes):
+    for nome in nomes or BENCHMARKS:
+        print(f"--- {nome} ---")
+        BENCHMARKS[nome]()
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
@@ -1,10 +1,17 @@
+import numpy as np
 import CamadaEnlace as ce
 from bitarray import bitarray
+from bitarray.util import ba2int
 
 # Constantes usadas no desenquadramento
 FLAG_SEQUENCE = [0,1,1,1,1,1,1,0]
 ESCAPE_CHAR   = [0,0,0,1,1,0,1,1]
 CRC32_DEGREE = 32
+CHECKSUM_BITS = 16
+FLAG_BYTE   = b'\x7e'
+ESCAPE_BYTE = b'\x1b'
+
+_FLAG_BITS = bitarray(FLAG_SEQUENCE)
 
 
 
@@ -26,11 +33,10 @@ def is_valid_utf8(bts: bytes):
 
 def bit_list_to_text(bits: list[int]):
     """
-    Converte uma lista de bits novamente para texto.
+    Converte uma lista de bits (ou bitarray) novamente para texto.
     Caso não seja UTF-8 válido, devolve uma mensagem de erro amigável.
     """
-    arr = bitarray(bits)
-    data = arr.tobytes()
+    data = ce.para_bitarray(bits).tobytes()
 
     if is_valid_utf8(data):
         return data.decode('utf-8','surrogatepass')
@@ -43,13 +49,58 @@ def bit_list_to_text(bits: list[int]):
 # DESENQUADRAMENTO (RX)
 # ==========================================================
 
+def remove_charactere_count(bits: list[int], header_size=8) -> list[int]:
+    """
+    Remove o cabeçalho inserido pelo método de contagem de caracteres,
+    devolvendo os bits do payload (no mesmo tipo da entrada).
+    Basta descartar os primeiros 'header_size' bits.
+    """
+    return bits[header_size:]
+
+
 def decode_charactere_count(bits: list[int], header_size=8):
     """
     Remove o cabeçalho inserido pelo método de contagem de caracteres.
     Basta descartar os primeiros 'header_size' bits.
     """
-    payload = bits[header_size:]
-    return bit_list_to_text(payload)
+    return bit_list_to_text(remove_charactere_count(bits, header_size))
+
+
+def desescapa_bytes(dados) -> bytes:
+    """
+    Desfaz o byte stuffing sobre bytes (bytes, bytearray ou memoryview):
+    cada ESC é descartado e o byte seguinte é mantido como dado, mesmo que
+    seja outro ESC. Um ESC solto no final é descartado.
+    Numa sequência de ESCs seguidos, os das posições pares (0, 2, 4, ...)
+    são os de escape; assim todos são achados de uma vez, sem laço por byte.
+    """
+    arr = np.frombuffer(dados, dtype=np.uint8)
+    esc = np.flatnonzero(arr == ESCAPE_BYTE[0])
+    if len(esc) == 0:
+        return arr.tobytes()
+
+    inicio = np.diff(esc, prepend=-2) != 1
+    inicio_da_sequencia = esc[inicio][np.cumsum(inicio) - 1]
+    de_escape = esc[(esc - inicio_da_sequencia) % 2 == 0]
+    return np.delete(arr, de_escape).tobytes()
+
+
+def remove_byte_insertion(bits: list[int]) -> list[int]:
+    """
+    Remove as FLAGS e desfaz o byte stuffing, devolvendo os bits do payload
+    (no mesmo tipo da entrada). Bits que não completam um byte no final
+    do payload são mantidos como estão.
+    """
+    bits_ba = ce.para_bitarray(bits)
+    return ce.mesmo_tipo(_desfaz_byte_stuffing(bits_ba[8:len(bits_ba)-8]), bits)
+
+
+def _desfaz_byte_stuffing(payload: bitarray) -> bitarray:
+    inteiros = len(payload) - len(payload) % 8
+    res = bitarray()
+    res.frombytes(desescapa_bytes(payload[:inteiros].tobytes()))
+    res += payload[inteiros:]
+    return res
 
 
 def decode_byte_insertion(bits: list[int]):
@@ -57,24 +108,25 @@ def decode_byte_insertion(bits: list[int]):
     Realiza o processo inverso do byte stuffing.
     Remove as FLAGS de início/fim e interpreta ESC + byte como dados originais.
     """
-    # remove FLAG inicial e final
-    payload = bits[8:len(bits)-8]
-    res = []
-    i = 0
+    return bit_list_to_text(remove_byte_insertion(bits))
 
-    while i < len(payload):
-        byte = payload[i:i+8]
 
-        # se encontrou ESC, significa que o próximo byte é literal
-        if byte == ESCAPE_CHAR:
-            i += 8
-            res += payload[i:i+8]
-        else:
-            res += byte
+def remove_bit_insertion(bits: list[int]) -> list[int]:
+    """
+    Remove as FLAGS e desfaz o bit stuffing, devolvendo os bits do payload
+    (no mesmo tipo da entrada).
+    Um zero é descartado quando os bits imediatamente anteriores a ele
+    (desde o zero anterior) são exatamente cinco '1's.
+    """
+    bits_ba = ce.para_bitarray(bits)
+    return ce.mesmo_tipo(_desfaz_bit_stuffing(bits_ba[8:len(bits_ba)-8]), bits)
 
-        i += 8
 
-    return bit_list_to_text(res)
+def _desfaz_bit_stuffing(payload: bitarray) -> bitarray:
+    b = ce.bits_para_uint8(payload)
+    zeros, comprimentos = ce.corridas_de_uns(b)
+    stuffing = zeros[comprimentos[:-1] == 5]
+    return ce.para_bitarray(np.delete(b, stuffing))
 
 
 def decode_bit_insertion(bits: list[int]):
@@ -82,23 +134,150 @@ def decode_bit_insertion(bits: list[int]):
     Processo inverso do bit stuffing.
     Sempre que encontrar um zero após cinco '1's, descarta esse zero.
     """
-    payload = bits[8:len(bits)-8]
-    res = []
-    ones = 0
+    return bit_list_to_text(remove_bit_insertion(bits))
+
+
+
+# ==========================================================
+# DESENQUADRAMENTO EM FLUXO (RX)
+# ==========================================================
+#
+# Os quadros chegam um atrás do outro no enlace, em pedaços de qualquer
+# tamanho. Cada desenquadrador recebe esses pedaços com feed(bloco) e devolve
+# a lista de payloads (bitarray) completados por eles. Só o trecho ainda não
+# resolvido (o quadro incompleto, ou os últimos bits que podem ser o começo
+# de uma FLAG) fica guardado em 'pendentes', então a memória não cresce com
+# o tamanho do fluxo, apenas com o tamanho de um quadro.
+
+class DesenquadradorContagem:
+    """
+    Quadros gerados por character_count: cabeçalho de 'header_size' bits com
+    o tamanho do payload em bits, seguido do payload.
+    O cabeçalho precisa ter tamanho fixo: payloads que não cabem em
+    'header_size' bits (cabeçalho estendido por character_count) não são aceitos.
+    """
+
+    def __init__(self, header_size=8):
+        if header_size <= 0:
+            raise ValueError("header_size precisa ser positivo.")
+        self.header_size = header_size
+        self.pendentes = bitarray()
+
+    def feed(self, bloco) -> list[bitarray]:
+        self.pendentes += ce.para_bitarray(bloco)
+        payloads = []
+        inicio = 0
+        while len(self.pendentes) - inicio >= self.header_size:
+            tamanho = ba2int(self.pendentes[inicio : inicio + self.header_size])
+            fim = inicio + self.header_size + tamanho
+            if fim > len(self.pendentes):
+                break
+            payloads.append(self.pendentes[inicio + self.header_size : fim])
+            inicio = fim
+        del self.pendentes[:inicio]
+        return payloads
 
-    for b in payload:
-        if b == 1:
-            res.append(1)
-            ones += 1
-        else:
-            # se encontrou 0 após cinco 1s, esse zero é stuffing e deve ser removido
-            if ones == 5:
-                ones = 0
-                continue
-            res.append(0)
-            ones = 0
 
-    return bit_list_to_text(res)
+class DesenquadradorBits:
+    """
+    Quadros gerados por bit_insertion: FLAG, payload com bit stuffing, FLAG.
+    Dentro do payload nunca há seis '1's seguidos, então a próxima FLAG
+    encontrada depois da abertura é sempre a de fechamento.
+    """
+
+    def __init__(self):
+        self.pendentes = bitarray()
+        self.no_quadro = False   # se True, pendentes começa pela FLAG de abertura
+        self._busca = 0          # posição a partir da qual a FLAG ainda não foi procurada
+
+    def feed(self, bloco) -> list[bitarray]:
+        self.pendentes += ce.para_bitarray(bloco)
+        payloads = []
+        inicio = 0
+        posicao = self._busca
+        while (achou := self.pendentes.find(_FLAG_BITS, posicao)) >= 0:
+            if self.no_quadro:
+                payloads.append(_desfaz_bit_stuffing(self.pendentes[inicio + 8 : achou]))
+            else:
+                inicio = achou
+            self.no_quadro = not self.no_quadro
+            posicao = achou + 8
+
+        # os últimos 7 bits podem ser o começo de uma FLAG: são procurados de novo
+        busca = max(posicao, len(self.pendentes) - 7)
+        corte = inicio if self.no_quadro else busca
+        del self.pendentes[:corte]
+        self._busca = busca - corte
+        return payloads
+
+
+class DesenquadradorBytes:
+    """
+    Quadros gerados por byte_insertion: FLAG, payload com byte stuffing, FLAG.
+    A FLAG de abertura é procurada bit a bit (sincronização); a partir dela o
+    quadro é lido em bytes e termina na primeira FLAG que não esteja escapada,
+    isto é, que não venha depois de uma quantidade ímpar de ESCs seguidos.
+    """
+
+    def __init__(self):
+        self.pendentes = bitarray()   # bits ainda não organizados em bytes
+        self.corpo = None             # bytes do quadro atual (None = fora de quadro)
+        self._busca = 0
+
+    def _procura_fechamento(self):
+        while (achou := self.corpo.find(FLAG_BYTE, self._busca)) >= 0:
+            escapes = 0
+            while escapes < achou and self.corpo[achou - escapes - 1] == ESCAPE_BYTE[0]:
+                escapes += 1
+            if escapes % 2 == 0:
+                return achou
+            self._busca = achou + 1
+        self._busca = len(self.corpo)
+        return -1
+
+    def feed(self, bloco) -> list[bitarray]:
+        self.pendentes += ce.para_bitarray(bloco)
+        payloads = []
+        while True:
+            if self.corpo is None:
+                achou = self.pendentes.find(_FLAG_BITS, self._busca)
+                if achou < 0:
+                    # os últimos 7 bits podem ser o começo de uma FLAG
+                    corte = max(self._busca, len(self.pendentes) - 7)
+                    del self.pendentes[:corte]
+                    self._busca = 0
+                    return payloads
+                del self.pendentes[:achou + 8]
+                self.corpo = bytearray()
+                self._busca = 0
+
+            # passa os bytes completos para o corpo do quadro
+            inteiros = len(self.pendentes) - len(self.pendentes) % 8
+            self.corpo += self.pendentes[:inteiros].tobytes()
+            del self.pendentes[:inteiros]
+
+            fim = self._procura_fechamento()
+            if fim < 0:
+                return payloads
+            payload = bitarray()
+            payload.frombytes(desescapa_bytes(memoryview(self.corpo)[:fim]))
+            payloads.append(payload)
+
+            # o que veio depois da FLAG de fechamento volta a ser procurado bit a bit
+            resto = bitarray()
+            resto.frombytes(bytes(self.corpo[fim + 1:]))
+            self.pendentes = resto + self.pendentes
+            self.corpo = None
+            self._busca = 0
+
+
+def desenquadra_stream(desenquadrador, blocos):
+    """
+    Alimenta o desenquadrador com os blocos (iterável de pedaços de bits)
+    e gera cada payload assim que o quadro dele termina.
+    """
+    for bloco in blocos:
+        yield from desenquadrador.feed(bloco)
 
 
 
@@ -111,7 +290,7 @@ def verifica_bit_parity(bits: list[int]):
     Verifica paridade par: se a soma for ímpar, há erro.
     Remove o bit de paridade antes de retornar.
     """
-    if sum(bits) % 2 != 0:
+    if ce.para_bitarray(bits).count(1) % 2 != 0:
         return "Erro detectado - Bit de Paridade", bits[:-1]
     return "OK", bits[:-1]
 
@@ -121,15 +300,28 @@ def verifica_crc(bits: list[int]):
     Recalcula o CRC do quadro recebido.
     Se o resto não for todo zero, houve erro na transmissão.
     """
-    rem = ce.calculate_crc_remainder(bits)
     data = bits[:-CRC32_DEGREE]
 
-    if not all(b == 0 for b in rem):
+    if not ce.CRC32(bits).verify():
         return "Erro detectado - CRC", data
     
     return "OK", data
 
 
+def verifica_checksum(bits: list[int]):
+    """
+    Recalcula o checksum dos dados recebidos e compara com os 16 bits finais.
+    Se forem diferentes, houve erro na transmissão.
+    """
+    data = bits[:-CHECKSUM_BITS]
+    recebido = ce.para_bitarray(bits)[-CHECKSUM_BITS:]
+
+    if len(bits) < CHECKSUM_BITS or ce.calcula_checksum(ce.para_bitarray(data)) != recebido:
+        return "Erro detectado - Checksum", data
+
+    return "OK", data
+
+
 
 # ==========================================================
 # CORREÇÃO DE HAMMING DINÂMICO (RX)
@@ -139,63 +331,7 @@ def corr_hamming_dinamico(bits: list[int]) -> list[int]:
     """
     Decodifica e corrige blocos Hamming.
     Usa blocos de tamanho padrão: 7, 15, 31, 63
+    A síndrome de cada bloco indica a posição do bit errado (0 = sem erro);
+    o cálculo é feito em lote por ce.corrige_hamming.
     """
-    out = []
-    i = 0
-    L = len(bits)
-
-    # Configurações Hamming: (tamanho_total, bits_paridade)
-    hamming_configs = [
-        (63, 6),
-        (31, 5),
-        (15, 4),
-        (7, 3),
-    ]
-
-    while i < L:
-        # Identifica qual bloco usar baseado nos bits restantes
-        bits_restantes = L - i
-        n, p = None, None
-        
-        for config in hamming_configs:
-            if config[0] <= bits_restantes:
-                n, p = config
-                break
-        
-        # Se não couber nenhum bloco padrão, tenta o menor
-        if n is None:
-            if bits_restantes >= 7:
-                n, p = 7, 3
-            else:
-                # Não há bits suficientes para um bloco válido
-                break
-        
-        # Extrai o bloco
-        chunk = bits[i:i+n]
-        if len(chunk) < n:
-            break
-        i += n
-
-        # Posições de paridade: 1, 2, 4, 8, 16, 32
-        parity_positions = [2 ** j for j in range(p)]
-
-        # 2. calcular síndrome
-        syndrome = 0
-        for pp in parity_positions:
-            xor_sum = 0
-            for pos in range(1, n + 1):
-                if pos & pp:
-                    xor_sum ^= chunk[pos - 1]
-            if xor_sum == 1:
-                syndrome += pp
-
-        # 3. corrige caso haja erro em uma posição válida
-        if syndrome != 0 and syndrome <= n:
-            chunk[syndrome - 1] ^= 1
-
-        # 4. extrai bits de dados (não-paridade)
-        for pos in range(1, n + 1):
-            if pos not in parity_positions:
-                out.append(chunk[pos - 1])
-
-    return out
+    return ce.corrige_hamming(bits)
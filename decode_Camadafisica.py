@@ -1,218 +1,341 @@
+from functools import lru_cache
+
 import numpy as np
 import matplotlib.pyplot as plt
 
+import Camadafisica as fisica
+from Camadafisica import CONFIG_PADRAO
+
 V_POSITIVO = 1.0  
 V_NEGATIVO = -1.0 
 V_ZERO = 0.0      
 
-# Fator de normalização para o 16-QAM ter a mesma energia média do QPSK
-# QPSK amplitude 1 -> Energia 1. QAM níveis 1,3 -> Energia média 10.
-# Fator de escala = sqrt(10)
-NORM_QAM = np.sqrt(10) 
-BIT_RATE = 1000 
-TEMPO_BIT = 1/BIT_RATE
-FREEQUENCIA_PORTADORA = 5000  # CORRIGIDO: deve ser igual ao da modulação
-TAXA_DE_AMOSTRAGEM = 10 * FREEQUENCIA_PORTADORA 
-AMOSTRAS_POR_BIT = int(TAXA_DE_AMOSTRAGEM / BIT_RATE)
-
-def decode_nrz_polar(sinal):
-    bits = []
-    amostras = AMOSTRAS_POR_BIT
+# Os parâmetros vêm da mesma ModemConfig usada na modulação,
+# então transmissor e receptor não precisam mais ser editados juntos.
+NORM_QAM = fisica.NORM_QAM
+BIT_RATE = CONFIG_PADRAO.bit_rate
+TEMPO_BIT = CONFIG_PADRAO.tempo_bit
+FREEQUENCIA_PORTADORA = CONFIG_PADRAO.frequencia_portadora
+TAXA_DE_AMOSTRAGEM = CONFIG_PADRAO.taxa_amostragem
+AMOSTRAS_POR_BIT = CONFIG_PADRAO.amostras_por_bit
+
+def _config(config):
+    # Sem configuração explícita usa a padrão
+    return CONFIG_PADRAO if config is None else config
+
+def _em_simbolos(sinal, amostras_por_simbolo):
+    """
+    Reorganiza o sinal em uma matriz (n_simbolos, amostras_por_simbolo).
+    Um símbolo final incompleto é descartado, como antes.
+    Em um lote (2-D, uma mensagem por linha) sai (n_mensagens, n_simbolos, amostras_por_simbolo).
+    """
+    sinal = np.asarray(sinal)
+    n_simbolos = sinal.shape[-1] // amostras_por_simbolo
+    return sinal[..., :n_simbolos * amostras_por_simbolo].reshape(
+        *sinal.shape[:-1], n_simbolos, amostras_por_simbolo)
+
+def _decisao_para_bits(decisao):
+    """
+    Converte as decisões booleanas (uma por bit) em array de inteiros 0/1.
+    """
+    return decisao.astype(int)
+
+@lru_cache(maxsize=None)
+def _templates_portadora(frequencias, tempo_simbolo, amostras_por_simbolo, funcao):
+    """
+    Matriz (len(frequencias), amostras_por_simbolo) com um template por linha.
+    'funcao' é 'sin' ou 'cos'. Fica em cache entre chamadas.
+    """
+    t = np.linspace(0, tempo_simbolo, amostras_por_simbolo)
+    onda = np.sin if funcao == 'sin' else np.cos
+    templates = np.stack([onda(2*np.pi*f*t) for f in frequencias])
+    templates.flags.writeable = False
+    return templates
+
+def decode_nrz_polar(sinal, config=None):
+    config = _config(config)
+    simbolos = _em_simbolos(sinal, config.amostras_por_bit)
     # Limiar baseado na soma do sinal
     # Se sinal é +1, soma é +100. Se -1, soma é -100. Limiar é 0.
     limiar = 0.0 
     
-    for i in range(0, len(sinal), amostras):
-        chunk = sinal[i : i+amostras]
-        if len(chunk) < amostras: break
-        
-        soma = np.sum(chunk)
-        
-        if soma > limiar:
-            bits.append(1)
-        else:
-            bits.append(0)
-    return np.array(bits)
-
-def decode_manchester(sinal):
-    bits = []
-    amostras = AMOSTRAS_POR_BIT
-    meio = amostras // 2
+    soma = np.sum(simbolos, axis=-1)
+    return _decisao_para_bits(soma > limiar)
+
+def decode_manchester(sinal, config=None):
+    config = _config(config)
+    simbolos = _em_simbolos(sinal, config.amostras_por_bit)
+    meio = config.amostras_por_bit // 2
+    
+    # Divide cada símbolo em duas metades
+    parte1 = simbolos[..., :meio]
+    parte2 = simbolos[..., meio:]
     
-    for i in range(0, len(sinal), amostras):
-        chunk = sinal[i : i+amostras]
-        if len(chunk) < amostras: break
-        
-        # Divide o símbolo em duas metades
-        parte1 = chunk[:meio]
-        parte2 = chunk[meio:]
-        
-        # Correlaciona: (Parte2 - Parte1)
-        # Se Bit 1 (-V, +V): (+V) - (-V) = +2V (Resultado Positivo)
-        # Se Bit 0 (+V, -V): (-V) - (+V) = -2V (Resultado Negativo)
-        valor_decisao = np.sum(parte2) - np.sum(parte1)
-        
-        if valor_decisao > 0:
-            bits.append(1)
-        else:
-            bits.append(0)
-    return np.array(bits)
-
-
-def decode_bipolar(sinal):
-    bits = []
-    amostras = AMOSTRAS_POR_BIT
+    # Correlaciona: (Parte2 - Parte1)
+    # Se Bit 1 (-V, +V): (+V) - (-V) = +2V (Resultado Positivo)
+    # Se Bit 0 (+V, -V): (-V) - (+V) = -2V (Resultado Negativo)
+    valor_decisao = np.sum(parte2, axis=-1) - np.sum(parte1, axis=-1)
+    return _decisao_para_bits(valor_decisao > 0)
+
+
+def decode_bipolar(sinal, config=None):
+    config = _config(config)
+    simbolos = _em_simbolos(sinal, config.amostras_por_bit)
     
     # Limiar de Energia: Metade da energia esperada de um bit 1
     # Amplitude 1, N amostras -> Energia N. Limiar N/2.
-    limiar_energia = (AMOSTRAS_POR_BIT * (V_POSITIVO**2)) / 4 
+    limiar_energia = (config.amostras_por_bit * (V_POSITIVO**2)) / 4 
     #  0.5V de amplitude média
     
-    for i in range(0, len(sinal), amostras):
-        chunk = sinal[i : i+amostras]
-        if len(chunk) < amostras: break
-        
-        # Bipolar: 1 tem energia, 0 não tem
-        energia = np.sum(chunk**2)
-        
-        if energia > limiar_energia:
-            bits.append(1)
-        else:
-            bits.append(0)
-    return np.array(bits)
-
-
-def decode_ask_modulate(sinal_com_ruido):
-    bits = []
-    t = np.linspace(0, TEMPO_BIT, AMOSTRAS_POR_BIT)
-    
-    # Cálculo dinâmico do limiar baseado na energia teórica
-    template_1 = 1.0 * np.sin(2*np.pi*FREEQUENCIA_PORTADORA*t)
+    # Bipolar: 1 tem energia, 0 não tem
+    energia = np.sum(simbolos**2, axis=-1)
+    return _decisao_para_bits(energia > limiar_energia)
+
+
+# ----------------------------------------------------------
+# Receptores com portadora: templates (filtro casado) + decisão.
+# As partes ficam separadas para que a simulação no domínio dos
+# símbolos (SimulacaoSimbolos) use exatamente as mesmas regras.
+# ----------------------------------------------------------
+
+@lru_cache(maxsize=None)
+def limiar_ask(config=None):
+    """
+    Limiar de energia do ASK: metade da energia teórica de um bit '1'.
+    Calculado uma vez por configuração.
+    """
+    config = _config(config)
+    template_1 = _templates_portadora((config.frequencia_portadora,), config.tempo_bit, config.amostras_por_bit, 'sin')[0]
     energia_bit_1 = np.sum(template_1 ** 2)    
-    limiar = energia_bit_1 / 2
-    
-    amostras_por_simbolo = AMOSTRAS_POR_BIT
-    for i in range(0, len(sinal_com_ruido), amostras_por_simbolo):
-        chunk = sinal_com_ruido[i : i+amostras_por_simbolo]
-        if len(chunk) < amostras_por_simbolo:
-            break
-            
-        energia = np.sum(chunk ** 2)
-
-        if energia > limiar:
-            bits.append(1)
-        else:
-            bits.append(0)
-    return np.array(bits)
-
-def decode_fsk_modulate(sinal_com_ruido):
-    bits = []
-    amostras_por_simbolo = AMOSTRAS_POR_BIT
-    frequencia_desvio = 2000  # CORRIGIDO: deve ser igual ao da modulação
-    t = np.linspace(0, TEMPO_BIT, AMOSTRAS_POR_BIT)
-    
-    template_0 = 1.0 * np.sin(2*np.pi*(FREEQUENCIA_PORTADORA + frequencia_desvio) * t)
-    template_1 = 1.0 * np.sin(2*np.pi*(FREEQUENCIA_PORTADORA - frequencia_desvio) * t)
-    
-    for i in range(0, len(sinal_com_ruido), amostras_por_simbolo):
-        chunk = sinal_com_ruido[i : i+amostras_por_simbolo]
-        if len(chunk) < amostras_por_simbolo:
-            break
-            
-        correlacao_0 = np.sum(chunk * template_0)
-        correlacao_1 = np.sum(chunk * template_1)
-        
-        if correlacao_0 > correlacao_1:
-            bits.append(1)
-        else:
-            bits.append(0)
-    return np.array(bits)
-
-def demodulate_psk_modulate(sinal_com_ruido):
-    bits = []
-    tempo_simbolo = 2 * TEMPO_BIT
-    amostras_por_simbolo = 2 * AMOSTRAS_POR_BIT
-    t = np.linspace(0, tempo_simbolo, 2 * AMOSTRAS_POR_BIT)
-
-    for i in range(0, len(sinal_com_ruido), amostras_por_simbolo):
-        chunk = sinal_com_ruido[i : i+amostras_por_simbolo]
-        if len(chunk) < amostras_por_simbolo:
-            break
-
-        template_I = np.cos(2*np.pi*FREEQUENCIA_PORTADORA * t)
-        template_Q = np.sin(2*np.pi*FREEQUENCIA_PORTADORA * t)
-
-        valor_I = np.sum(chunk * template_I)
-        valor_Q = np.sum(chunk * template_Q)
-        
-        bits_simbolo = []
-        if abs(valor_I) > abs(valor_Q):
-            if valor_I > 0:
-                bits_simbolo = [0, 1] 
-            else:
-                bits_simbolo = [1, 0] 
-        else:
-            if valor_Q > 0:
-                bits_simbolo = [0, 0] 
-            else:
-                bits_simbolo = [1, 1] 
-
-        bits.extend(bits_simbolo)
-    return np.array(bits)
-
-def demodulate_qam_16(sinal_com_ruido):
-    bits = []
-    amostras_por_simbolo = int(4 * AMOSTRAS_POR_BIT) 
-    tempo_simbolo = 4 * TEMPO_BIT
-    t = np.linspace(0, tempo_simbolo, amostras_por_simbolo)
+    return energia_bit_1 / 2
+
+def decisao_ask(energia, config=None):
+    return _decisao_para_bits(energia > limiar_ask(config))
+
+def decode_ask_modulate(sinal_com_ruido, config=None):
+    config = _config(config)
+    simbolos = _em_simbolos(sinal_com_ruido, config.amostras_por_bit)
+    energia = np.sum(simbolos ** 2, axis=-1)
+    return decisao_ask(energia, config)
+
+def templates_fsk(config=None):
+    """
+    Templates do FSK, (2, amostras_por_bit): linha 0 = bit 1 / linha 1 = bit 0.
+    """
+    config = _config(config)
+    frequencia_desvio = config.desvio_fsk  # o mesmo desvio da modulação
+    return _templates_portadora(
+        (config.frequencia_portadora + frequencia_desvio, config.frequencia_portadora - frequencia_desvio),
+        config.tempo_bit, config.amostras_por_bit, 'sin')
+
+def decisao_fsk(correlacoes, config=None):
+    # 'config' só existe para todas as decisões terem a mesma assinatura
+    return _decisao_para_bits(correlacoes[..., 0] > correlacoes[..., 1])
+
+def decode_fsk_modulate(sinal_com_ruido, config=None):
+    config = _config(config)
+    simbolos = _em_simbolos(sinal_com_ruido, config.amostras_por_bit)
+    # Todas as correlações de uma vez: (n_simbolos, 2), ou (n_mensagens, n_simbolos, 2) em lote
+    correlacoes = simbolos @ templates_fsk(config).T
+    return decisao_fsk(correlacoes)
+
+# Bits decididos pelo QPSK, indexados por [|I| > |Q|, valor > 0]
+_BITS_PSK = np.array([
+    [[1, 1], [0, 0]],   # Q domina: Q <= 0 -> 11 / Q > 0 -> 00
+    [[1, 0], [0, 1]],   # I domina: I <= 0 -> 10 / I > 0 -> 01
+])
+
+@lru_cache(maxsize=None)
+def templates_psk(config=None):
+    """
+    Templates do QPSK, (2, 2*amostras_por_bit): linha 0 = I (cos) / linha 1 = Q (sin).
+    """
+    config = _config(config)
+    tempo_simbolo = 2 * config.tempo_bit
+    amostras_por_simbolo = 2 * config.amostras_por_bit
+    template_I = _templates_portadora((config.frequencia_portadora,), tempo_simbolo, amostras_por_simbolo, 'cos')
+    template_Q = _templates_portadora((config.frequencia_portadora,), tempo_simbolo, amostras_por_simbolo, 'sin')
+    templates = np.concatenate([template_I, template_Q])
+    templates.flags.writeable = False
+    return templates
+
+def decisao_psk(valores, config=None):
+    # 'config' só existe para todas as decisões terem a mesma assinatura
+    valor_I = valores[..., 0]
+    valor_Q = valores[..., 1]
+
+    i_domina = np.abs(valor_I) > np.abs(valor_Q)
+    positivo = np.where(i_domina, valor_I, valor_Q) > 0
+    return _BITS_PSK[i_domina.astype(int), positivo.astype(int)].reshape(*i_domina.shape[:-1], -1)
+
+def demodulate_psk_modulate(sinal_com_ruido, config=None):
+    config = _config(config)
+    simbolos = _em_simbolos(sinal_com_ruido, 2 * config.amostras_por_bit)
+    valores = simbolos @ templates_psk(config).T
+    return decisao_psk(valores)
+
+@lru_cache(maxsize=None)
+def _tabela_bits_qam(niveis_por_eixo):
+    """
+    Tabela (niveis_por_eixo, niveis_por_eixo, bits_por_simbolo) em uint8:
+    para cada par (índice do nível I, índice do nível Q) guarda os bits do símbolo.
+    Cada eixo usa código Gray (ex.: 16-QAM: -3 -> 00, -1 -> 01, 1 -> 11, 3 -> 10),
+    com os bits de I antes dos de Q, igual ao mapa usado na modulação.
+    """
+    bits_por_eixo = int(np.log2(niveis_por_eixo))
+    indices = np.arange(niveis_por_eixo)
+    gray = indices ^ (indices >> 1)
+    pesos = 1 << np.arange(bits_por_eixo - 1, -1, -1)
+    bits_eixo = ((gray[:, np.newaxis] & pesos) > 0).astype(np.uint8)
+
+    tabela = np.concatenate([
+        np.broadcast_to(bits_eixo[:, np.newaxis, :], (niveis_por_eixo, niveis_por_eixo, bits_por_eixo)),
+        np.broadcast_to(bits_eixo[np.newaxis, :, :], (niveis_por_eixo, niveis_por_eixo, bits_por_eixo)),
+    ], axis=2)
+    tabela.flags.writeable = False
+    return tabela
+
+def _quantiza_nivel(valores, niveis_por_eixo):
+    """
+    Índice do nível ímpar mais próximo (-(L-1), ..., -1, 1, ..., L-1) de cada valor.
+    Em caso de empate fica com o nível menor. Valores fora da faixa são saturados.
+    """
+    posicao = (valores + (niveis_por_eixo - 1)) / 2
+    indices = np.ceil(posicao - 0.5)
+    return np.clip(indices, 0, niveis_por_eixo - 1).astype(np.intp)
+
+def fatiar_qam(valores_I, valores_Q, ordem=16):
+    """
+    Decisor (slicer) de QAM quadrado: quantiza todos os valores I/Q de uma vez
+    (já na escala inteira dos níveis) e devolve uma matriz (n_simbolos, bits_por_simbolo).
+    Serve para qualquer ordem quadrada: 4, 16, 64, 256...
+    """
+    niveis_por_eixo = int(round(np.sqrt(ordem)))
+    tabela = _tabela_bits_qam(niveis_por_eixo)
+    return tabela[_quantiza_nivel(valores_I, niveis_por_eixo), _quantiza_nivel(valores_Q, niveis_por_eixo)]
+
+@lru_cache(maxsize=None)
+def templates_qam_16(config=None):
+    """
+    Templates do 16-QAM, (2, 4*amostras_por_bit): linha 0 = I (cos) / linha 1 = Q (-sin).
+    """
+    config = _config(config)
+    tempo_simbolo = 4 * config.tempo_bit
+    amostras_por_simbolo = int(4 * config.amostras_por_bit) 
+    template_I = _templates_portadora((config.frequencia_portadora,), tempo_simbolo, amostras_por_simbolo, 'cos')
+    template_Q = -_templates_portadora((config.frequencia_portadora,), tempo_simbolo, amostras_por_simbolo, 'sin')
+    templates = np.concatenate([template_I, template_Q])
+    templates.flags.writeable = False
+    return templates
+
+@lru_cache(maxsize=None)
+def _energia_referencia_qam_16(config=None):
+    return np.sum(templates_qam_16(config)[0] ** 2) 
+
+def decisao_qam_16(valores_brutos, config=None):
+    energia_referencia = _energia_referencia_qam_16(config)
+
+    # O valor normalizado aqui sai pequeno (ex: 0.94) por causa da redução na transmissão
+    valores_norm = valores_brutos / energia_referencia
+
+    # --- DESNORMALIZAÇÃO PARA DECISÃO ---
+    # Multiplicamos por sqrt(10) para trazer de volta à escala de inteiros (-3, -1, 1, 3)
+    valores_escala_inteira = valores_norm * NORM_QAM
+
+    bits = fatiar_qam(valores_escala_inteira[..., 0], valores_escala_inteira[..., 1], 16)
+    return bits.reshape(*valores_brutos.shape[:-2], -1)
+
+@lru_cache(maxsize=None)
+def _templates_decisao_qam_16(config):
+    """
+    Templates I e Q já multiplicados por NORM_QAM / energia de referência:
+    a correlação sai direto na escala inteira dos níveis, sem outra passada
+    sobre os valores. Cada um é um vetor contíguo (produto matriz-vetor).
+    """
+    escala = NORM_QAM / _energia_referencia_qam_16(config)
+    template_I, template_Q = (np.ascontiguousarray(linha * escala) for linha in templates_qam_16(config))
+    template_I.flags.writeable = False
+    template_Q.flags.writeable = False
+    return template_I, template_Q
+
+def demodulate_qam_16(sinal_com_ruido, config=None):
+    config = _config(config)
+    simbolos = _em_simbolos(sinal_com_ruido, int(4 * config.amostras_por_bit))
+    template_I, template_Q = _templates_decisao_qam_16(config)
+    bits = fatiar_qam(simbolos @ template_I, simbolos @ template_Q, 16)
+    return bits.reshape(*simbolos.shape[:-2], -1)
+
+
+# ==========================================================
+# DEMODULAÇÃO EM FLUXO (STREAMING)
+# Recebem as amostras em blocos de qualquer tamanho e devolvem os bits
+# bloco a bloco. As amostras de um símbolo incompleto ficam guardadas
+# até o próximo bloco; no fim, um símbolo incompleto é descartado,
+# como na versão de uma vez.
+# ==========================================================
+
+def _stream_por_simbolo(demodulador, blocos, amostras_por_simbolo, config):
+    grupos = fisica.reagrupar_blocos(map(np.asarray, blocos), amostras_por_simbolo, descartar_resto=True)
+    for grupo in grupos:
+        yield demodulador(grupo, config)
+
+def decode_nrz_polar_stream(blocos, config=None):
+    return _stream_por_simbolo(decode_nrz_polar, blocos, _config(config).amostras_por_bit, config)
+
+def decode_manchester_stream(blocos, config=None):
+    return _stream_por_simbolo(decode_manchester, blocos, _config(config).amostras_por_bit, config)
+
+def decode_bipolar_stream(blocos, config=None):
+    return _stream_por_simbolo(decode_bipolar, blocos, _config(config).amostras_por_bit, config)
+
+def decode_ask_modulate_stream(blocos, config=None):
+    return _stream_por_simbolo(decode_ask_modulate, blocos, _config(config).amostras_por_bit, config)
+
+def decode_fsk_modulate_stream(blocos, config=None):
+    return _stream_por_simbolo(decode_fsk_modulate, blocos, _config(config).amostras_por_bit, config)
+
+def demodulate_psk_modulate_stream(blocos, config=None):
+    return _stream_por_simbolo(demodulate_psk_modulate, blocos, 2 * _config(config).amostras_por_bit, config)
+
+def demodulate_qam_16_stream(blocos, config=None):
+    return _stream_por_simbolo(demodulate_qam_16, blocos, 4 * _config(config).amostras_por_bit, config)
+
+
+# ==========================================================
+# DEMODULAÇÃO EM LOTE (BATCH)
+# Recebem uma matriz (n_mensagens, n_amostras), um sinal por linha, e
+# devolvem uma matriz (n_mensagens, n_bits) com uma única sequência de
+# chamadas numpy para o lote inteiro. Com 'comprimentos' (em bits), os
+# bits depois do fim de cada mensagem saem zerados; desempilha_bits
+# (Camadafisica) corta cada linha no seu tamanho.
+# ==========================================================
+
+def _lote(demodulador, sinais, comprimentos, config):
+    sinais = np.asarray(sinais)
+    if sinais.ndim != 2:
+        raise ValueError(f"O lote precisa ser uma matriz (n_mensagens, n_amostras); recebido shape {sinais.shape}.")
+    bits = demodulador(sinais, config)
+    if comprimentos is not None:
+        bits[fisica.mascara_depois_do_fim(comprimentos, *bits.shape)] = 0
+    return bits
+
+def decode_nrz_polar_lote(sinais, comprimentos=None, config=None):
+    return _lote(decode_nrz_polar, sinais, comprimentos, config)
+
+def decode_manchester_lote(sinais, comprimentos=None, config=None):
+    return _lote(decode_manchester, sinais, comprimentos, config)
+
+def decode_bipolar_lote(sinais, comprimentos=None, config=None):
+    return _lote(decode_bipolar, sinais, comprimentos, config)
+
+def decode_ask_modulate_lote(sinais, comprimentos=None, config=None):
+    return _lote(decode_ask_modulate, sinais, comprimentos, config)
+
+def decode_fsk_modulate_lote(sinais, comprimentos=None, config=None):
+    return _lote(decode_fsk_modulate, sinais, comprimentos, config)
+
+def demodulate_psk_modulate_lote(sinais, comprimentos=None, config=None):
+    return _lote(demodulate_psk_modulate, sinais, comprimentos, config)
 
-    QAM_16_MAP = {
-        '0000': (-3, -3), '0001': (-3, -1), '0100': (-1, -3), '0101': (-1, -1),
-        '0010': (-3,  3), '0011': (-3,  1), '0110': (-1,  3), '0111': (-1,  1),
-        '1000': ( 3, -3), '1001': ( 3, -1), '1100': ( 1, -3), '1101': ( 1, -1),
-        '1010': ( 3,  3), '1011': ( 3,  1), '1110': ( 1,  3), '1111': ( 1,  1),
-    }
-    REVERSE_MAP = {valor: chave for chave, valor in QAM_16_MAP.items()}
-    IDEAL_LEVELS = [-3, -1, 1, 3]
-
-    for i in range(0, len(sinal_com_ruido), amostras_por_simbolo):
-        chunk = sinal_com_ruido[i : i + amostras_por_simbolo]
-        if len(chunk) < amostras_por_simbolo:
-            break
-        
-        template_I = np.cos(2 * np.pi * FREEQUENCIA_PORTADORA * t)
-        template_Q = -np.sin(2 * np.pi * FREEQUENCIA_PORTADORA * t) 
-        
-        valor_I_bruto = np.sum(chunk * template_I)
-        valor_Q_bruto = np.sum(chunk * template_Q)
-        
-        energia_referencia = np.sum(template_I ** 2) 
-        
-        # O valor normalizado aqui sai pequeno (ex: 0.94) por causa da redução na transmissão
-        valor_I_norm = valor_I_bruto / energia_referencia
-        valor_Q_norm = valor_Q_bruto / energia_referencia
-        
-        # --- DESNORMALIZAÇÃO PARA DECISÃO ---
-        # Multiplicamos por sqrt(10) para trazer de volta à escala de inteiros (-3, -1, 1, 3)
-        valor_I_escala_inteira = valor_I_norm * NORM_QAM
-        valor_Q_escala_inteira = valor_Q_norm * NORM_QAM
-        
-        I_final = achar_valor(valor_I_escala_inteira, IDEAL_LEVELS)
-        Q_final = achar_valor(valor_Q_escala_inteira, IDEAL_LEVELS)
-        
-        chave_encontrada = (I_final, Q_final)
-        bits_string = REVERSE_MAP.get(chave_encontrada, '0000') 
-        bits_simbolo = [int(b) for b in bits_string]
-        bits.extend(bits_simbolo)
-
-    return np.array(bits)
-
-def achar_valor(valor, levels):
-    match = None
-    diff_minima = float('inf')
-    for level in levels:
-        diff = abs(valor - level)
-        if diff < diff_minima:
-            diff_minima = diff
-            match = level
-    return match
+def demodulate_qam_16_lote(sinais, comprimentos=None, config=None):
+    return _lote(demodulate_qam_16, sinais, comprimentos, config)
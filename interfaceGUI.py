@@ -14,11 +14,11 @@ import time
 
 # Importação dos módulos do trabalho
 import Camadafisica as fisica
-import decode_Camadafisica as d_fisica
 import CamadaEnlace as enlace
 import decode_CamadaEnlace as d_enlace
 import Transmissor as tm
 import Receptor as rc
+from Pipeline import ConfiguracaoPipeline, bits_para_log, obter_pipeline
 
 # ---------------------------------------------------------------------------------------------------------------------------
 # RESPONSABILIDADES
@@ -149,6 +149,7 @@ class MainWindow(Gtk.Window):
         self.error_combo.append_text("Nenhum")
         self.error_combo.append_text("Bit de paridade")
         self.error_combo.append_text("CRC-32")
+        self.error_combo.append_text("Checksum")
         self.error_combo.append_text("Hamming")
         self.error_combo.set_active(0)
         self.params_grid.attach(self.error_combo, 1, 4, 2, 1)
@@ -231,232 +232,85 @@ class MainWindow(Gtk.Window):
             GObject.idle_add(self.log, "Erro: Camada de Enlace ou Camada Fisica não foram encontradas.")
             return
 
-        # PASSO 3: CONVERSÃO PARA BITS (Camada de enlace)
+        # PASSO 3: MONTA O PIPELINE (os estágios são escolhidos uma vez, pelo nome)
         try:
-            binary_sequence = enlace.convert_to_bytes(message)
-        except Exception as e:
-            GObject.idle_add(self.log, f"Erro convert_to_bytes: {e}")
+            pipeline = obter_pipeline(ConfiguracaoPipeline(
+                enquadramento=framing_method, deteccao=error_method,
+                codificacao_linha=digital_mod, modulacao=analog_mod,
+                sigma=sigma, aplicar_canal=do_decode))
+        except ValueError as e:
+            GObject.idle_add(self.log, f"Erro na configuração: {e}")
             return
 
-        GObject.idle_add(self.log, f"Mensagem original: {message}")
-        GObject.idle_add(self.log, f"Sequência binária original (len = {len(binary_sequence)}): {binary_sequence}")
-
-        # PASSO 4: APLICA ENQUADRAMENTO ESCOLHIDO
-        framed = binary_sequence
+        # PASSO 4: CONVERSÃO PARA BITS (Camada de enlace)
         try:
-            if framing_method == "Contagem de caracteres":
-                framed = enlace.character_count(binary_sequence)
-            elif framing_method == "FLAG + Inserção de bytes":
-                framed = enlace.byte_insertion(binary_sequence)
-            elif framing_method == "FLAG + Inserção de bits":
-                framed = enlace.bit_insertion(binary_sequence)
+            binary_sequence = enlace.convert_to_bitarray(message)
         except Exception as e:
-            GObject.idle_add(self.log, f"Erro no enquadramento: {e}")
+            GObject.idle_add(self.log, f"Erro na conversão do texto para bits: {e}")
             return
 
-        GObject.idle_add(self.log, f"Sequência com enquadramento (len = {len(framed)}): {framed}")
+        GObject.idle_add(self.log, f"Mensagem original: {message}")
+        GObject.idle_add(self.log, f"Sequência binária original (len = {len(binary_sequence)}): {bits_para_log(binary_sequence)}")
 
-        # PASSO 5: APLICA DETECÇÃO/CORREÇÃO DE ERROS ANTES DE ENVIAR
-        processed = framed
+        # PASSO 5: ENQUADRAMENTO E DETECÇÃO/CORREÇÃO DE ERROS ANTES DE ENVIAR
         try:
-            if error_method == "Bit de paridade":
-                processed = enlace.bit_parity(framed)
-            elif error_method == "CRC-32":
-                processed = enlace.prepara_CRC_para_transmissao(framed)
-            elif error_method == "Hamming":
-                processed = enlace.hamming_dinamico(framed)
+            framed, processed = pipeline.transmite(binary_sequence)
         except Exception as e:
-            GObject.idle_add(self.log, f"Erro na codificação de erro: {e}")
+            GObject.idle_add(self.log, f"Erro no enquadramento/codificação de erro: {e}")
             return
 
-        GObject.idle_add(self.log, f"Sequência enviada ao meio (len = {len(processed)}): {processed}")
+        GObject.idle_add(self.log, f"Sequência com enquadramento (len = {len(framed)}): {bits_para_log(framed)}")
+        GObject.idle_add(self.log, f"Sequência enviada ao meio (len = {len(processed)}): {bits_para_log(processed)}")
 
         # PASSO 6: SIMULAÇÃO DA CAMADA FÍSICA (MODULAÇÃO + RUÍDO + DEMODULAÇÃO)
-        # Aqui simulamos o canal de comunicação
-        received_bits = processed.copy()  # Por padrão, assume transmissão perfeita
-        
-        # Se checkbox de demodulação está ativo, simula o canal físico completo
-        if do_decode and d_fisica is not None:
-            try:
-                # Modula o sinal analógico
-                analog_signal = None
-                if analog_mod == "ASK" and hasattr(fisica, 'ask_modulate'):
-                    analog_signal = fisica.ask_modulate(processed)
-                elif analog_mod == "FSK" and hasattr(fisica, 'fsk_modulate'):
-                    analog_signal = fisica.fsk_modulate(processed)
-                elif analog_mod == "PSK (QPSK)" and hasattr(fisica, 'psk_modulate'):
-                    analog_signal = fisica.psk_modulate(processed)
-                elif analog_mod == "16-QAM" and hasattr(fisica, 'qam_16'):
-                    analog_signal = fisica.qam_16(processed)
-                
-                if analog_signal is not None:
-                    GObject.idle_add(self.log, f"\n--- SIMULAÇÃO DO CANAL FÍSICO ---")
-                    GObject.idle_add(self.log, f"Sinal modulado ({analog_mod}): {len(analog_signal)} amostras")
-                    
-                    # Adiciona ruído ao sinal
-                    if sigma > 0 and hasattr(fisica, 'add_ruido'):
-                        analog_signal = fisica.add_ruido(analog_signal, sigma)
-                        GObject.idle_add(self.log, f"Ruído AWGN adicionado (sigma={sigma})")
-                    
-                    # Demodula o sinal com ruído
-                    bits_demodulados = None
-                    if analog_mod == "ASK" and hasattr(d_fisica, 'decode_ask_modulate'):
-                        bits_demodulados = d_fisica.decode_ask_modulate(analog_signal)
-                        GObject.idle_add(self.log, f"Bits demodulados (ASK): {bits_demodulados}")
-                    elif analog_mod == "FSK" and hasattr(d_fisica, 'decode_fsk_modulate'):
-                        bits_demodulados = d_fisica.decode_fsk_modulate(analog_signal)
-                        GObject.idle_add(self.log, f"Bits demodulados (FSK): {bits_demodulados}")
-                    elif analog_mod == "PSK (QPSK)" and hasattr(d_fisica, 'demodulate_psk_modulate'):
-                        bits_demodulados = d_fisica.demodulate_psk_modulate(analog_signal)
-                        GObject.idle_add(self.log, f"Bits demodulados (PSK/QPSK): {bits_demodulados}")
-                    elif analog_mod == "16-QAM" and hasattr(d_fisica, 'demodulate_qam_16'):
-                        bits_demodulados = d_fisica.demodulate_qam_16(analog_signal)
-                        GObject.idle_add(self.log, f"Bits demodulados (16-QAM): {bits_demodulados}")
-                    
-                    # USA OS BITS DEMODULADOS como received_bits
-                    if bits_demodulados is not None:
-                        received_bits = bits_demodulados
-                        GObject.idle_add(self.log, f"*** USANDO BITS DEMODULADOS PARA RECONSTRUÇÃO ***")
-                    
-            except Exception as e:
-                GObject.idle_add(self.log, f"Erro na simulação do canal físico: {e}")
-                import traceback
-                GObject.idle_add(self.log, traceback.format_exc())
-        
-        GObject.idle_add(self.log, f"Sequência recebida (len = {len(received_bits)}): {received_bits}")
-
-        # PASSO 7: VERIFICAÇÃO E CORREÇÃO DE ERROS NO RECEPTOR
-        error_report = "Não verificado"
-        corrected = received_bits
+        # Com "Ativação dos erros" desmarcada o sinal ainda é gerado (para o gráfico),
+        # mas o receptor recebe os bits enviados sem erros
+        received_bits = processed
+        analog_signal = None
         try:
-            if error_method == "Bit de paridade":
-                error_report, corrected = d_enlace.verifica_bit_parity(received_bits)
-            elif error_method == "CRC-32":
-                error_report, corrected = d_enlace.verifica_crc(received_bits)
-            elif error_method == "Hamming":
-                corrected = d_enlace.corr_hamming_dinamico(received_bits)
-                error_report = "Hamming aplicado"
+            analog_signal, received_signal, received_bits = pipeline.camada_fisica(processed)
+            if analog_signal is not None:
+                GObject.idle_add(self.log, f"\n--- SIMULAÇÃO DO CANAL FÍSICO ---")
+                GObject.idle_add(self.log, f"Sinal modulado ({analog_mod}): {len(analog_signal)} amostras")
+                if sigma > 0:
+                    GObject.idle_add(self.log, f"Ruído AWGN adicionado (sigma={sigma})")
+                if do_decode:
+                    GObject.idle_add(self.log, f"Bits demodulados ({analog_mod}): {received_bits}")
+                    GObject.idle_add(self.log, f"*** USANDO BITS DEMODULADOS PARA RECONSTRUÇÃO ***")
         except Exception as e:
-            GObject.idle_add(self.log, f"Erro na verificação de erros: {e}")
+            GObject.idle_add(self.log, f"Erro na simulação do canal físico: {e}")
+            import traceback
+            GObject.idle_add(self.log, traceback.format_exc())
 
-        GObject.idle_add(self.log, f"Relatório de erro: {error_report}")
-        GObject.idle_add(self.log, f"Sequência após verificação/correção (len = {len(corrected)}): {corrected}")
+        received_bits = enlace.para_bitarray(received_bits)
+        GObject.idle_add(self.log, f"Sequência recebida (len = {len(received_bits)}): {bits_para_log(received_bits)}")
 
-        # PASSO 8: DESENQUADRAMENTO E OBTENÇÃO DO TEXTO DECODIFICADO
+        # PASSO 7: VERIFICAÇÃO/CORREÇÃO DE ERROS E DESENQUADRAMENTO NO RECEPTOR
         decoded_text = ""
         try:
-            # Converte corrected para lista Python se for numpy array
-            import numpy as np
-            if isinstance(corrected, np.ndarray):
-                corrected = corrected.tolist()
-            
-            # 1) funções de desenquadramento específicas (se existirem)
-            if framing_method == "Contagem de caracteres" and hasattr(d_enlace, 'decode_charactere_count'):
-                decoded_text = d_enlace.decode_charactere_count(corrected)
-            elif framing_method == "FLAG + Inserção de bytes" and hasattr(d_enlace, 'decode_byte_insertion'):
-                decoded_text = d_enlace.decode_byte_insertion(corrected)
-            elif framing_method == "FLAG + Inserção de bits" and hasattr(d_enlace, 'decode_bit_insertion'):
-                decoded_text = d_enlace.decode_bit_insertion(corrected)
-            elif framing_method == "Nenhum":
-                # Sem enquadramento, converte bits diretamente para texto
-                if hasattr(d_enlace, 'bit_list_to_text'):
-                    decoded_text = d_enlace.bit_list_to_text(corrected)
-                else:
-                    # Fallback: converte manualmente
-                    from bitarray import bitarray as _bitarray
-                    arr = _bitarray(corrected)
-                    decoded_text = arr.tobytes().decode('utf-8', errors='replace')
-            else:
-                # 2) tenta funções genéricas do módulo enlace (nomes comuns)
-                tried = False
-                for fn_name in ('convert_from_bytes', 'bytes_to_string', 'convert_bytes_to_message', 'bits_to_bytes'):
-                    if hasattr(enlace, fn_name):
-                        try:
-                            result = getattr(enlace, fn_name)(corrected)
-                            # se a função retornar bytes, transforma em string
-                            if isinstance(result, (bytes, bytearray)):
-                                decoded_text = result.decode('utf-8', errors='replace')
-                            else:
-                                decoded_text = str(result)
-                            tried = True
-                            break
-                        except Exception:
-                            # continua para o próximo nome possível
-                            pass
-
-                # 3) fallback manual: trata corrected como bitarray / bytes / lista de bits
-                if not tried:
-                    try:
-                        from bitarray import bitarray as _bitarray
-                        if isinstance(corrected, _bitarray):
-                            b = corrected.tobytes()
-                            decoded_text = b.decode('utf-8', errors='replace')
-                        elif isinstance(corrected, (bytes, bytearray)):
-                            decoded_text = bytes(corrected).decode('utf-8', errors='replace')
-                        elif isinstance(corrected, (list, tuple)):
-                            # agrupa bits em octetos (descarta o último octeto incompleto)
-                            bits = ''.join('1' if int(x) else '0' for x in corrected)
-                            octets = [bits[i:i+8] for i in range(0, len(bits), 8)]
-                            byts = bytes(int(o, 2) for o in octets if len(o) == 8)
-                            decoded_text = byts.decode('utf-8', errors='replace')
-                        else:
-                            # última tentativa genérica
-                            decoded_text = str(corrected)
-                    except Exception as e:
-                        GObject.idle_add(self.log, f"Erro no desenquadramento/manual decode: {e}")
-
+            error_report, corrected, payload = pipeline.recebe(received_bits)
+            GObject.idle_add(self.log, f"Relatório de erro: {error_report}")
+            GObject.idle_add(self.log, f"Sequência após verificação/correção (len = {len(corrected)}): {bits_para_log(corrected)}")
+            decoded_text = d_enlace.bit_list_to_text(payload)
         except Exception as e:
-            GObject.idle_add(self.log, f"Erro no desenquadramento: {e}")
+            GObject.idle_add(self.log, f"Erro na verificação/desenquadramento: {e}")
 
         # Se ainda estiver vazio, mostra um aviso (mas mostra sempre alguma coisa)
-        if isinstance(decoded_text, (bytes, bytearray)):
-            decoded_text = decoded_text.decode('utf-8', errors='replace')
         if not decoded_text:
             decoded_text = "<(não foi possível decodificar o texto)>"
 
         GObject.idle_add(self.log, f"Mensagem decodificada: {decoded_text}")
 
-        # PASSO 9: GERA GRÁFICOS DOS SINAIS (apenas para visualização)
+        # PASSO 8: GERA GRÁFICOS DOS SINAIS (apenas para visualização)
         try:
-            # Gráfico do sinal digital
-            signal = None
-            if digital_mod == "NRZ-Polar":
-                if hasattr(fisica, 'code_nrz_polar'):
-                    signal = fisica.code_nrz_polar(processed)
-            elif digital_mod == "Manchester":
-                if hasattr(fisica, 'code_manchester'):
-                    signal = fisica.code_manchester(processed)
-            elif digital_mod == "Bipolar":
-                if hasattr(fisica, 'code_bipolar'):
-                    signal = fisica.code_bipolar(processed)
-
-            if signal is not None:
-                GObject.idle_add(self.plot_digital_signal, signal, digital_mod)
-
+            if pipeline.codificar_linha is not None:
+                GObject.idle_add(self.plot_digital_signal, pipeline.codificar_linha(processed), digital_mod)
         except Exception as e:
             GObject.idle_add(self.log, f"Erro ao gerar gráfico digital: {e}")
 
-        # PASSO 10: GERA GRÁFICO DO SINAL ANALÓGICO (para visualização)
-        try:
-            analog_signal_plot = None
-            if analog_mod == "ASK" and hasattr(fisica, 'ask_modulate'):
-                analog_signal_plot = fisica.ask_modulate(processed)
-            elif analog_mod == "FSK" and hasattr(fisica, 'fsk_modulate'):
-                analog_signal_plot = fisica.fsk_modulate(processed)
-            elif analog_mod == "PSK (QPSK)" and hasattr(fisica, 'psk_modulate'):
-                analog_signal_plot = fisica.psk_modulate(processed)
-            elif analog_mod == "16-QAM" and hasattr(fisica, 'qam_16'):
-                analog_signal_plot = fisica.qam_16(processed)
-
-            if analog_signal_plot is not None:
-                # Adiciona ruído para visualização
-                if sigma > 0 and hasattr(fisica, 'add_ruido'):
-                    analog_signal_plot = fisica.add_ruido(analog_signal_plot, sigma)
-
-                GObject.idle_add(self.plot_analog_signal, analog_signal_plot, analog_mod)
-
-        except Exception as e:
-            GObject.idle_add(self.log, f"Erro ao gerar gráfico analógico: {e}")
+        # O gráfico analógico mostra o sinal com o ruído do canal
+        if analog_signal is not None:
+            GObject.idle_add(self.plot_analog_signal, received_signal, analog_mod)
 
         GObject.idle_add(self.log, "\n\nSimulação concluída com sucesso.")
 